@@ -1,13 +1,30 @@
 """Aplicación FastAPI principal"""
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import os
+import sys
 
 # Importar routers
 from .routes import health, leagues, pipeline_routes, fixtures
+from .response_cache import ResponseCacheMiddleware
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from src.database.connection import get_db, close_connection
+from src.database.async_repositories import run_in_db_pool, shutdown_executor
+
+@asynccontextmanager
+async def lifespan(app):
+    """Conecta a MongoDB al arrancar (fuera del event loop) y libera recursos al parar"""
+    await run_in_db_pool(get_db)
+    yield
+    shutdown_executor()
+    close_connection()
 
 # Crear app
 app = FastAPI(
+    lifespan=lifespan,
     title="LUCY Sports API",
     description="API REST para consultar y gestionar datos deportivos",
     version="1.0.0",
@@ -15,6 +32,9 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Caché de respuestas de lectura (ETag / 304); CORS se aplica por fuera
+app.add_middleware(ResponseCacheMiddleware)
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -24,6 +44,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Comprimir respuestas si el cliente acepta gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Incluir routers
 app.include_router(health.router, prefix="/api", tags=["Health"])
 app.include_router(leagues.router, prefix="/api", tags=["Leagues"])
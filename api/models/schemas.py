@@ -1,6 +1,6 @@
 """Schemas Pydantic para validación y serialización"""
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 # Response Models
@@ -36,6 +36,7 @@ class PaginatedResponse(BaseModel):
     page: int = Field(..., description="Página actual")
     limit: int = Field(..., description="Registros por página")
     data: List[LeagueResponse] = Field(..., description="Datos")
+    next_cursor: Optional[str] = Field(None, description="Cursor de la página siguiente (None si es la última)")
 
 class StatsResponse(BaseModel):
     """Schema para estadísticas"""
@@ -50,6 +51,7 @@ class HealthResponse(BaseModel):
     timestamp: datetime
     mongodb_available: bool
     total_leagues: int
+    mongodb: Optional[Dict[str, Any]] = Field(None, description="Estado de la conexión a MongoDB")
 
 class PipelineResponse(BaseModel):
     """Schema para respuesta de pipeline"""
@@ -107,6 +109,7 @@ class PaginatedFixturesResponse(BaseModel):
     page: int
     limit: int
     data: List[FixtureResponse]
+    next_cursor: Optional[str] = None
 
 class FixturesStatsResponse(BaseModel):
     """Schema para estadísticas de fixtures"""
@@ -114,3 +117,4 @@ class FixturesStatsResponse(BaseModel):
     total_ligas: int
     estados: List[str]
     ligas: List[int]
+    fixtures_por_liga: Dict[str, int] = Field(default_factory=dict, description="Fixtures por liga (id como string)")
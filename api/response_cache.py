@@ -0,0 +1,199 @@
+"""Caché en memoria de respuestas de la API con ETag ligada a la versión del dataset"""
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from src.database.repositories import DatasetVersionRepository, invalidate_count_cache
+from src.database.async_repositories import run_in_db_pool
+
+# Vida máxima de una respuesta cacheada (seg)
+API_CACHE_TTL = int(os.getenv('API_CACHE_TTL', 300))
+
+# Número máximo de respuestas en memoria (LRU)
+API_CACHE_MAX_ENTRIES = int(os.getenv('API_CACHE_MAX_ENTRIES', 1000))
+
+# Cada cuánto se consulta la versión del dataset en MongoDB (seg)
+DATASET_VERSION_CHECK_INTERVAL = float(os.getenv('DATASET_VERSION_CHECK_INTERVAL', 5))
+
+# Endpoints de solo lectura cuyos datos cambian únicamente con el pipeline
+CACHEABLE_PREFIXES = ("/api/leagues", "/api/fixtures", "/api/stats")
+
+
+class DatasetVersion:
+    """
+    Versión del dataset vista por este proceso.
+
+    La versión vive en MongoDB (la incrementa save_clean, también desde
+    otros procesos) y se relee como mucho cada DATASET_VERSION_CHECK_INTERVAL
+    segundos. Cuando cambia, las respuestas cacheadas dejan de ser válidas.
+    """
+
+    def __init__(self, check_interval=DATASET_VERSION_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self.version = 0
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def _update(self, version):
+        with self._lock:
+            self._checked_at = time.monotonic()
+            if version is not None and version != self.version:
+                self.version = version
+                # Los totales cacheados tampoco valen para el dataset nuevo
+                invalidate_count_cache()
+
+    def refresh(self):
+        """Relee la versión desde MongoDB (bloqueante)"""
+        self._update(DatasetVersionRepository().get_version())
+        return self.version
+
+    async def current(self):
+        """Versión actual, releyéndola fuera del event loop si caducó"""
+        checked_at = self._checked_at
+        if checked_at is None or time.monotonic() - checked_at >= self.check_interval:
+            await run_in_db_pool(self.refresh)
+        return self.version
+
+    def bump(self, source=""):
+        """Incrementa la versión (en MongoDB si está disponible) tras cargar datos"""
+        version = DatasetVersionRepository().bump(source)
+        with self._lock:
+            self._checked_at = time.monotonic()
+            self.version = version if version is not None else self.version + 1
+        invalidate_count_cache()
+        return self.version
+
+
+class APIResponseCache:
+    """Respuestas por ruta + query, con TTL y eviction LRU"""
+
+    def __init__(self, ttl=API_CACHE_TTL, max_entries=API_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(path, query_params):
+        """Clave de caché: ruta más parámetros ordenados"""
+        return path + "?" + "&".join(f"{k}={v}" for k, v in sorted(query_params.multi_items()))
+
+    def get(self, key, version):
+        """
+        Obtiene una respuesta vigente para la versión indicada.
+
+        Returns:
+            dict | None: {'body', 'headers', 'etag'} o None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["version"] != version or entry["expires_at"] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, version, body, headers):
+        """Guarda una respuesta y devuelve la entrada (con su ETag)"""
+        digest = hashlib.sha1(body).hexdigest()[:20]
+        entry = {
+            "version": version,
+            "body": body,
+            "headers": headers,
+            "etag": f'"{version}-{digest}"',
+            "expires_at": time.monotonic() + self.ttl,
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        """Elimina todas las respuestas"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Obtiene contadores de uso de la caché.
+
+        Returns:
+            dict: entries, hits, misses y porcentaje de aciertos
+        """
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(100 * self.hits / total, 1) if total else 0.0,
+        }
+
+
+dataset_version = DatasetVersion()
+response_cache = APIResponseCache()
+
+
+def invalidate_api_cache(source=""):
+    """Incrementa la versión del dataset y vacía la caché de respuestas"""
+    version = dataset_version.bump(source)
+    response_cache.clear()
+    return version
+
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Sirve desde caché los GET de endpoints de lectura y añade ETag.
+
+    Si el cliente envía If-None-Match con el ETag vigente responde 304 sin
+    cuerpo. Solo se cachean respuestas 200.
+    """
+
+    async def dispatch(self, request, call_next):
+        path = request.url.path
+        if request.method != "GET" or not path.startswith(CACHEABLE_PREFIXES):
+            return await call_next(request)
+
+        version = await dataset_version.current()
+        key = APIResponseCache.make_key(path, request.query_params)
+        entry = response_cache.get(key, version)
+        status = "HIT"
+
+        if entry is None:
+            response = await call_next(request)
+            if response.status_code != 200:
+                return response
+
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            headers = {
+                k: v for k, v in response.headers.items()
+                if k.lower() not in ("content-length", "etag")
+            }
+            entry = response_cache.set(key, version, body, headers)
+            status = "MISS"
+
+        cache_headers = {"ETag": entry["etag"], "Cache-Control": "no-cache", "X-Cache": status}
+
+        if _etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+            return Response(status_code=304, headers=cache_headers)
+
+        return Response(content=entry["body"], status_code=200, headers={**entry["headers"], **cache_headers})
@@ -1,11 +1,12 @@
 """Endpoints para consultar fixtures/partidos"""
 from fastapi import APIRouter, HTTPException, Query
-from typing import List
+from typing import List, Optional
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
-from src.database.repositories import FixturesRepository
+from src.database.async_repositories import AsyncFixturesRepository
+from api.serialization import paginated_response, response_fields
 from api.models.schemas import FixtureResponse, PaginatedFixturesResponse, FixturesStatsResponse
 
 router = APIRouter()
@@ -13,10 +14,11 @@ router = APIRouter()
 @router.get("/fixtures", response_model=PaginatedFixturesResponse)
 async def get_fixtures(
     page: int = Query(1, ge=1, description="Número de página"),
-    limit: int = Query(50, ge=1, le=100, description="Registros por página (máx 100)")
+    limit: int = Query(50, ge=1, le=100, description="Registros por página (máx 100)"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco (next_cursor de la página anterior)")
 ):
     """Obtiene todos los fixtures con paginación"""
-    repo = FixturesRepository()
+    repo = await AsyncFixturesRepository.create()
     
     if not repo.is_available():
         raise HTTPException(
@@ -25,116 +27,108 @@ async def get_fixtures(
         )
     
     # Obtener fixtures más recientes
-    fixtures = repo.get_fixtures_by_date_range('2000-01-01', '2099-12-31', page=page, limit=limit)
-    total = repo.count_fixtures()
-    
-    return PaginatedFixturesResponse(
-        total=total,
-        page=page,
-        limit=limit,
-        data=[FixtureResponse(**fixture) for fixture in fixtures]
-    )
+    try:
+        fixtures, total, next_cursor = await repo.get_fixtures_page(
+            page=page, limit=limit, cursor=cursor, fields=response_fields(FixtureResponse)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return paginated_response(FixtureResponse, fixtures, total, page, limit, next_cursor)
 
 @router.get("/fixtures/league/{league_id}", response_model=PaginatedFixturesResponse)
 async def get_fixtures_by_league(
     league_id: int,
     page: int = Query(1, ge=1),
-    limit: int = Query(50, ge=1, le=100)
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None)
 ):
     """Filtra fixtures por liga"""
-    repo = FixturesRepository()
+    repo = await AsyncFixturesRepository.create()
     
     if not repo.is_available():
         raise HTTPException(status_code=503, detail="MongoDB no disponible")
     
-    fixtures = repo.get_fixtures_by_league(league_id, page=page, limit=limit)
+    try:
+        fixtures, total, next_cursor = await repo.get_fixtures_page(
+            league_id=league_id, page=page, limit=limit, cursor=cursor, fields=response_fields(FixtureResponse)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if not fixtures:
+    if not fixtures and cursor is None and page == 1:
         raise HTTPException(
             status_code=404,
             detail=f"No se encontraron fixtures para la liga: {league_id}"
         )
     
-    # Contar total para esta liga
-    all_league_fixtures = repo.get_fixtures_by_league(league_id, page=1, limit=10000)
-    total = len(all_league_fixtures)
-    
-    return PaginatedFixturesResponse(
-        total=total,
-        page=page,
-        limit=limit,
-        data=[FixtureResponse(**fixture) for fixture in fixtures]
-    )
+    return paginated_response(FixtureResponse, fixtures, total, page, limit, next_cursor)
 
 @router.get("/fixtures/team/{team_id}", response_model=PaginatedFixturesResponse)
 async def get_fixtures_by_team(
     team_id: int,
     page: int = Query(1, ge=1),
-    limit: int = Query(50, ge=1, le=100)
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None)
 ):
     """Filtra fixtures por equipo (local o visitante)"""
-    repo = FixturesRepository()
+    repo = await AsyncFixturesRepository.create()
     
     if not repo.is_available():
         raise HTTPException(status_code=503, detail="MongoDB no disponible")
     
-    fixtures = repo.get_fixtures_by_team(team_id, page=page, limit=limit)
+    try:
+        fixtures, total, next_cursor = await repo.get_fixtures_page(
+            team_id=team_id, page=page, limit=limit, cursor=cursor, fields=response_fields(FixtureResponse)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if not fixtures:
+    if not fixtures and cursor is None and page == 1:
         raise HTTPException(
             status_code=404,
             detail=f"No se encontraron fixtures para el equipo: {team_id}"
         )
     
-    all_team_fixtures = repo.get_fixtures_by_team(team_id, page=1, limit=10000)
-    total = len(all_team_fixtures)
-    
-    return PaginatedFixturesResponse(
-        total=total,
-        page=page,
-        limit=limit,
-        data=[FixtureResponse(**fixture) for fixture in fixtures]
-    )
+    return paginated_response(FixtureResponse, fixtures, total, page, limit, next_cursor)
 
 @router.get("/fixtures/date-range", response_model=PaginatedFixturesResponse)
 async def get_fixtures_by_date_range(
     start_date: str = Query(..., description="Fecha inicio (YYYY-MM-DD)"),
     end_date: str = Query(..., description="Fecha fin (YYYY-MM-DD)"),
     page: int = Query(1, ge=1),
-    limit: int = Query(50, ge=1, le=100)
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None)
 ):
     """Filtra fixtures por rango de fechas"""
-    repo = FixturesRepository()
+    repo = await AsyncFixturesRepository.create()
     
     if not repo.is_available():
         raise HTTPException(status_code=503, detail="MongoDB no disponible")
     
-    fixtures = repo.get_fixtures_by_date_range(start_date, end_date, page=page, limit=limit)
+    try:
+        fixtures, total, next_cursor = await repo.get_fixtures_page(
+            start_date=start_date, end_date=end_date, page=page, limit=limit, cursor=cursor, fields=response_fields(FixtureResponse)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if not fixtures:
+    if not fixtures and cursor is None and page == 1:
         raise HTTPException(
             status_code=404,
             detail=f"No se encontraron fixtures entre {start_date} y {end_date}"
         )
     
-    all_fixtures = repo.get_fixtures_by_date_range(start_date, end_date, page=1, limit=10000)
-    total = len(all_fixtures)
-    
-    return PaginatedFixturesResponse(
-        total=total,
-        page=page,
-        limit=limit,
-        data=[FixtureResponse(**fixture) for fixture in fixtures]
-    )
+    return paginated_response(FixtureResponse, fixtures, total, page, limit, next_cursor)
 
 @router.get("/fixtures/stats", response_model=FixturesStatsResponse)
 async def get_fixtures_stats():
     """Obtiene estadísticas de fixtures"""
-    repo = FixturesRepository()
+    repo = await AsyncFixturesRepository.create()
     
     if not repo.is_available():
         raise HTTPException(status_code=503, detail="MongoDB no disponible")
     
-    stats = repo.get_fixtures_stats()
+    stats = await repo.get_fixtures_stats()
     
     return FixturesStatsResponse(**stats)
@@ -5,7 +5,8 @@ import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
-from src.database.repositories import LeagueRepository
+from src.database.async_repositories import AsyncLeagueRepository
+from src.database.connection import get_connection_state
 from api.models.schemas import HealthResponse
 
 router = APIRouter()
@@ -13,11 +14,12 @@ router = APIRouter()
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Verifica el estado del sistema"""
-    repo = LeagueRepository()
+    repo = await AsyncLeagueRepository.create()
     
     return HealthResponse(
         status="healthy",
         timestamp=datetime.utcnow(),
         mongodb_available=repo.is_available(),
-        total_leagues=repo.count_leagues() if repo.is_available() else 0
+        total_leagues=await repo.count_leagues() if repo.is_available() else 0,
+        mongodb=get_connection_state()
     )
@@ -5,7 +5,8 @@ import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
-from src.database.repositories import LeagueRepository
+from src.database.async_repositories import AsyncLeagueRepository
+from api.serialization import paginated_response, response_fields
 from api.models.schemas import LeagueResponse, PaginatedResponse, StatsResponse, ErrorResponse
 
 router = APIRouter()
@@ -13,10 +14,11 @@ router = APIRouter()
 @router.get("/leagues", response_model=PaginatedResponse)
 async def get_leagues(
     page: int = Query(1, ge=1, description="Número de página"),
-    limit: int = Query(50, ge=1, le=100, description="Registros por página (máx 100)")
+    limit: int = Query(50, ge=1, le=100, description="Registros por página (máx 100)"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco (next_cursor de la página anterior)")
 ):
     """Obtiene todas las ligas con paginación"""
-    repo = LeagueRepository()
+    repo = await AsyncLeagueRepository.create()
     
     if not repo.is_available():
         raise HTTPException(
@@ -24,85 +26,79 @@ async def get_leagues(
             detail="MongoDB no disponible. Use archivos CSV en data/clean/"
         )
     
-    leagues = repo.get_all_leagues(page=page, limit=limit)
-    total = repo.count_leagues()
+    try:
+        leagues, total, next_cursor = await repo.get_leagues_page(
+            page=page, limit=limit, cursor=cursor, fields=response_fields(LeagueResponse)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return PaginatedResponse(
-        total=total,
-        page=page,
-        limit=limit,
-        data=[LeagueResponse(**league) for league in leagues]
-    )
+    return paginated_response(LeagueResponse, leagues, total, page, limit, next_cursor)
 
 @router.get("/leagues/country/{country}", response_model=PaginatedResponse)
 async def get_leagues_by_country(
     country: str,
     page: int = Query(1, ge=1),
-    limit: int = Query(50, ge=1, le=100)
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None)
 ):
     """Filtra ligas por país"""
-    repo = LeagueRepository()
+    repo = await AsyncLeagueRepository.create()
     
     if not repo.is_available():
         raise HTTPException(status_code=503, detail="MongoDB no disponible")
     
-    leagues = repo.get_by_country(country, page=page, limit=limit)
+    try:
+        leagues, total, next_cursor = await repo.get_leagues_page(
+            country=country, page=page, limit=limit, cursor=cursor, fields=response_fields(LeagueResponse)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if not leagues:
+    if not leagues and cursor is None and page == 1:
         raise HTTPException(
             status_code=404,
             detail=f"No se encontraron ligas para el país: {country}"
         )
     
-    # Contar total para este país
-    all_country_leagues = repo.get_by_country(country, page=1, limit=10000)
-    total = len(all_country_leagues)
-    
-    return PaginatedResponse(
-        total=total,
-        page=page,
-        limit=limit,
-        data=[LeagueResponse(**league) for league in leagues]
-    )
+    return paginated_response(LeagueResponse, leagues, total, page, limit, next_cursor)
 
 @router.get("/leagues/season/{season}", response_model=PaginatedResponse)
 async def get_leagues_by_season(
     season: int,
     page: int = Query(1, ge=1),
-    limit: int = Query(50, ge=1, le=100)
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None)
 ):
     """Filtra ligas por temporada"""
-    repo = LeagueRepository()
+    repo = await AsyncLeagueRepository.create()
     
     if not repo.is_available():
         raise HTTPException(status_code=503, detail="MongoDB no disponible")
     
-    leagues = repo.get_by_season(season, page=page, limit=limit)
+    try:
+        leagues, total, next_cursor = await repo.get_leagues_page(
+            season=season, page=page, limit=limit, cursor=cursor, fields=response_fields(LeagueResponse)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if not leagues:
+    if not leagues and cursor is None and page == 1:
         raise HTTPException(
             status_code=404,
             detail=f"No se encontraron ligas para la temporada: {season}"
         )
     
-    all_season_leagues = repo.get_by_season(season, page=1, limit=10000)
-    total = len(all_season_leagues)
-    
-    return PaginatedResponse(
-        total=total,
-        page=page,
-        limit=limit,
-        data=[LeagueResponse(**league) for league in leagues]
-    )
+    return paginated_response(LeagueResponse, leagues, total, page, limit, next_cursor)
 
 @router.get("/stats", response_model=StatsResponse)
 async def get_stats():
     """Obtiene estadísticas generales"""
-    repo = LeagueRepository()
+    repo = await AsyncLeagueRepository.create()
     
     if not repo.is_available():
         raise HTTPException(status_code=503, detail="MongoDB no disponible")
     
-    stats = repo.get_stats()
+    stats = await repo.get_stats()
     
     return StatsResponse(**stats)
@@ -40,6 +40,10 @@ def run_pipeline_task():
         if not cleaner_success:
             raise Exception("Cleaner falló")
         
+        # Invalidar respuestas cacheadas de la API
+        from api.response_cache import invalidate_api_cache
+        invalidate_api_cache("pipeline")
+        
         duration = time.time() - start_time
         
         pipeline_status["last_execution"] = datetime.utcnow().isoformat()
@@ -0,0 +1,70 @@
+"""Serialización rápida de respuestas paginadas"""
+import json
+import os
+from typing import List
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # Dependencia opcional
+    orjson = None
+
+# Validar cada página contra su schema antes de responder (más lento)
+API_VALIDATE_RESPONSES = os.getenv('API_VALIDATE_RESPONSES', 'false').lower() == 'true'
+
+_adapters = {}
+
+
+def response_fields(model):
+    """Campos del schema de respuesta (para proyectar en MongoDB)"""
+    return list(model.model_fields)
+
+
+def _validate_page(model, items):
+    """Valida la página completa de una sola vez (un TypeAdapter por schema)"""
+    adapter = _adapters.get(model)
+    if adapter is None:
+        adapter = _adapters[model] = TypeAdapter(List[model])
+    return adapter.dump_python(adapter.validate_python(items), mode="json")
+
+
+def dumps(payload):
+    """Codifica a JSON (orjson si está instalado)"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def paginated_response(model, items, total, page, limit, next_cursor=None):
+    """
+    Construye la respuesta paginada sin crear un modelo Pydantic por fila.
+
+    Los documentos ya vienen proyectados a los campos de `model`; los que
+    falten se devuelven como null, igual que con response_model.
+
+    Args:
+        model: Schema de cada elemento (LeagueResponse, FixtureResponse)
+        items: Documentos de la página
+        total: Total de registros
+        page: Página actual
+        limit: Registros por página
+        next_cursor: Cursor de la página siguiente
+
+    Returns:
+        Response: JSON ya codificado
+    """
+    fields = response_fields(model)
+    data = [{field: item.get(field) for field in fields} for item in items]
+
+    if API_VALIDATE_RESPONSES:
+        data = _validate_page(model, data)
+
+    payload = {
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "data": data,
+        "next_cursor": next_cursor,
+    }
+    return Response(content=dumps(payload), media_type="application/json")
@@ -0,0 +1,103 @@
+"""Script para cargar históricos de fixtures (liga × temporada) con reanudación"""
+import sys
+import argparse
+from src.fetcher.backfill import build_units, plan_backfill, run_backfill
+from src.fetcher.http_client import get_client, log_cache_stats
+from src.fetcher.logger import get_logger
+from src.database.repositories import BackfillCheckpointRepository
+from src.common.retry import reset_retry_budget
+
+logger = get_logger("backfill")
+
+def parse_int_list(value):
+    """
+    Interpreta listas y rangos de enteros: "39,140" o "2015-2024".
+
+    Returns:
+        list: Lista de enteros
+    """
+    values = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            values.extend(range(int(start), int(end) + 1))
+        else:
+            values.append(int(part))
+    return values
+
+def show_plan(units):
+    """Muestra el coste estimado y el reparto por días sin ejecutar nada"""
+    plan = plan_backfill(units, BackfillCheckpointRepository().get_completed(), get_client().cache)
+
+    print("\n" + "="*70)
+    print("📋 PLAN DE BACKFILL")
+    print("="*70)
+    print(f"Unidades totales:    {plan['total']}")
+    print(f"Ya completadas:      {plan['completed']}")
+    print(f"Pendientes:          {len(plan['pending'])} ({plan['cached']} en caché)")
+    print(f"Coste estimado:      {plan['cost']} requests")
+    print(f"Cuota por día:       {plan['daily_budget']} requests")
+    print(f"Días estimados:      {plan['estimated_days']}")
+
+    for day, day_units in enumerate(plan["days"], 1):
+        preview = ", ".join(f"{l}:{s}" for l, s in day_units[:6])
+        more = f" ... (+{len(day_units) - 6})" if len(day_units) > 6 else ""
+        print(f"  Día {day}: {len(day_units)} unidades - {preview}{more}")
+    print("="*70 + "\n")
+    return True
+
+def run_backfill_command(units, concurrency=None, max_units=None):
+    """
+    Ejecuta la porción de hoy del backfill.
+
+    Returns:
+        bool: True si no hubo unidades fallidas
+    """
+    reset_retry_budget()
+
+    try:
+        logger.info("="*60)
+        logger.info("INICIANDO BACKFILL DE FIXTURES")
+        logger.info("="*60)
+
+        summary = run_backfill(units, concurrency=concurrency, max_units=max_units)
+
+        if summary["remaining"] > 0:
+            logger.info(f"Quedan {summary['remaining']} unidades - vuelve a ejecutar el comando para reanudar")
+
+        return summary["failed"] == 0
+
+    except Exception as e:
+        logger.error(f"Error inesperado: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return False
+
+    finally:
+        log_cache_stats(logger)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill de fixtures históricos")
+    parser.add_argument("--leagues", required=True, help="IDs de liga, ej: 39,140,135")
+    parser.add_argument("--seasons", required=True, help="Temporadas, ej: 2015-2024 o 2021,2022")
+    parser.add_argument("--plan", action="store_true", help="Solo mostrar coste estimado y plan por días")
+    parser.add_argument("--concurrency", type=int, default=None, help="Unidades simultáneas")
+    parser.add_argument("--max-units", type=int, default=None, help="Máximo de unidades en esta ejecución")
+    parser.add_argument("--clean", action="store_true", help="Ejecutar la limpieza de fixtures al terminar")
+    args = parser.parse_args()
+
+    units = build_units(parse_int_list(args.leagues), parse_int_list(args.seasons))
+
+    if args.plan:
+        success = show_plan(units)
+    else:
+        success = run_backfill_command(units, args.concurrency, args.max_units)
+
+        if args.clean:
+            from main_fixtures_cleaner import run_fixtures_cleaner
+            success = run_fixtures_cleaner() and success
+
+    sys.exit(0 if success else 1)
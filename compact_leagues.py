@@ -0,0 +1,52 @@
+"""Script para eliminar ligas duplicadas de clean_leagues (operación única)"""
+import sys
+import argparse
+from src.database.repositories import LeagueRepository, DatasetVersionRepository
+from src.cleaner.logger import get_logger
+
+logger = get_logger("compact_leagues")
+
+def run_compaction(dry_run=False):
+    """
+    Deja una sola liga por (league_id, season) y crea el índice único.
+
+    Args:
+        dry_run: Solo mostrar cuántos documentos se eliminarían
+
+    Returns:
+        bool: True si fue exitoso
+    """
+    try:
+        logger.info("="*60)
+        logger.info("COMPACTANDO CLEAN_LEAGUES" + (" (DRY RUN)" if dry_run else ""))
+        logger.info("="*60)
+
+        repo = LeagueRepository()
+        if not repo.is_available():
+            logger.error("MongoDB no disponible")
+            return False
+
+        summary = repo.compact_duplicates(dry_run=dry_run)
+
+        if not dry_run and summary["removed"]:
+            repo.refresh_stats()
+            DatasetVersionRepository().bump("compact_leagues")
+
+        logger.info(f"Claves duplicadas:     {summary['duplicated_keys']}")
+        logger.info(f"Documentos eliminados: {summary['removed']}")
+        logger.info(f"Documentos restantes:  {summary['remaining']}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error inesperado: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Elimina ligas duplicadas de clean_leagues")
+    parser.add_argument("--dry-run", action="store_true", help="Solo contar duplicados, sin borrar")
+    args = parser.parse_args()
+
+    success = run_compaction(dry_run=args.dry_run)
+    sys.exit(0 if success else 1)
@@ -1,18 +1,32 @@
+import os
 import sys
+import argparse
 import pandas as pd
-from src.cleaner.loader import load_raw_files
+from src.cleaner.loader import list_raw_files, iter_raw_files
 from src.cleaner.normalizer import normalize_leagues
 from src.cleaner.validator import validate_dataframe
 from src.cleaner.save_clean import save_clean
+from src.cleaner.manifest import load_manifest, save_manifest, plan_run, merge_clean, retry_pending_load
+from src.cleaner.polars_engine import resolve_engine, run_polars_cleaner, ENGINES
 from src.cleaner.logger import get_logger
 from src.common.exceptions import DataValidationError, FileProcessingError
 
 logger = get_logger("main_cleaner")
 
-def run_cleaner():
+CLEAN_NAME = "clean_leagues"
+
+def run_cleaner(engine=None, full=False):
     """
     Ejecuta el proceso de limpieza y normalización de datos.
     
+    Solo normaliza los archivos raw nuevos o modificados desde la última
+    ejecución (ver src/cleaner/manifest.py) y los fusiona con el CSV limpio
+    anterior por (league_id, season).
+    
+    Args:
+        engine: Motor de limpieza ('pandas' o 'polars'; por defecto CLEANER_ENGINE)
+        full: Reprocesar todos los archivos raw
+        
     Returns:
         bool: True si fue exitoso, False en caso contrario
     """
@@ -21,24 +35,37 @@ def run_cleaner():
         logger.info("INICIANDO LIMPIEZA DE DATOS")
         logger.info("=" * 60)
         
-        # Cargar archivos raw
-        raw_files = load_raw_files()
+        if resolve_engine(engine) == "polars":
+            return run_polars_cleaner("leagues")
         
-        if not raw_files:
-            logger.error("No hay archivos para procesar")
-            return False
+        # Archivos raw pendientes según el manifiesto
+        manifest = load_manifest(CLEAN_NAME)
+        run = plan_run(list_raw_files(), manifest, full=full)
+        raw_paths = run["paths"]
+        
+        if not raw_paths:
+            logger.info("Sin archivos raw nuevos - el dataset limpio está al día")
+            pending = retry_pending_load(manifest, CLEAN_NAME, "leagues")
+            save_manifest(CLEAN_NAME, run, manifest["clean_file"], mongo_pending=pending)
+            return True
+        
+        logger.info(
+            f"Limpieza {'completa' if run['full'] else 'incremental'}: "
+            f"{len(raw_paths)} de {len(run['files'])} archivos raw"
+        )
 
         all_dfs = []
+        # Archivos sin normalizar (error de lectura o de normalización)
+        failed_paths = set(raw_paths)
         
-        # Procesar cada archivo
-        for idx, raw_data in enumerate(raw_files, 1):
-            logger.info(f"\nProcesando archivo {idx}/{len(raw_files)}")
+        # Procesar cada archivo (se parsean y normalizan en paralelo; del
+        # pool solo vuelve el DataFrame normalizado)
+        for idx, (path, df) in enumerate(iter_raw_files(raw_paths, transform=normalize_leagues), 1):
+            logger.info(f"\nProcesando archivo {idx}/{len(raw_paths)}: {os.path.basename(path)}")
             
             try:
-                # Normalizar
-                df = normalize_leagues(raw_data)
-                
                 if df.empty:
+                    failed_paths.discard(path)
                     logger.warning(f"Archivo {idx} no generó datos - omitiendo")
                     continue
                 
@@ -46,6 +73,7 @@ def run_cleaner():
                 df = validate_dataframe(df)
                 
                 all_dfs.append(df)
+                failed_paths.discard(path)
                 
             except DataValidationError as e:
                 logger.error(f"Error de validación en archivo {idx}: {str(e)}")
@@ -55,12 +83,18 @@ def run_cleaner():
                 continue
 
         if not all_dfs:
+            if not run["full"]:
+                logger.info("Los archivos nuevos no contienen ligas - el dataset limpio está al día")
+                pending = retry_pending_load(manifest, CLEAN_NAME, "leagues")
+                save_manifest(CLEAN_NAME, run, manifest["clean_file"], failed_paths, pending)
+                return True
             logger.error("No se procesó ningún archivo exitosamente")
             return False
 
-        # Concatenar resultados de todos los archivos RAW
+        # Concatenar resultados y fusionar con la limpieza anterior
         logger.info("\nConsolidando datos...")
-        final_df = pd.concat(all_dfs, ignore_index=True)
+        new_df = pd.concat(all_dfs, ignore_index=True)
+        final_df = merge_clean(None if run["full"] else manifest["clean_file"], new_df, "leagues")
         
         # Estadísticas finales
         logger.info(f"\nEstadísticas finales:")
@@ -69,8 +103,11 @@ def run_cleaner():
         logger.info(f"  Países: {final_df['country'].nunique()}")
         logger.info(f"  Temporadas: {sorted(final_df['season'].unique())}")
 
-        # Guardar
-        save_clean(final_df)
+        # Guardar (en MongoDB solo las filas nuevas, o todo si quedó una
+        # carga pendiente)
+        mongo_df = final_df if manifest["mongo_pending"] else new_df
+        filename, counts = save_clean(final_df, name=CLEAN_NAME, mongo_df=mongo_df)
+        save_manifest(CLEAN_NAME, run, filename, failed_paths, mongo_pending=counts is None)
         
         logger.info("=" * 60)
         logger.info("✓ LIMPIEZA COMPLETADA EXITOSAMENTE")
@@ -89,5 +126,12 @@ def run_cleaner():
         return False
 
 if __name__ == "__main__":
-    success = run_cleaner()
+    parser = argparse.ArgumentParser(description="Limpia y normaliza ligas")
+    parser.add_argument("--engine", choices=ENGINES, default=None,
+                        help="Motor de limpieza (por defecto CLEANER_ENGINE o pandas)")
+    parser.add_argument("--full", action="store_true",
+                        help="Reprocesar todos los archivos raw (ignora el manifiesto)")
+    args = parser.parse_args()
+
+    success = run_cleaner(engine=args.engine, full=args.full)
     sys.exit(0 if success else 1)
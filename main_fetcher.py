@@ -1,9 +1,11 @@
 import sys
 from src.fetcher.rapidapi_client import fetch_leagues
 from src.fetcher.save_raw import save_raw
+from src.fetcher.http_client import log_cache_stats
 from src.fetcher.config import DEFAULT_COUNTRY, DEFAULT_SEASON
 from src.fetcher.logger import get_logger
 from src.common.exceptions import APIConnectionError, APIResponseError
+from src.common.retry import reset_retry_budget
 
 logger = get_logger("main_fetcher")
 
@@ -14,6 +16,8 @@ def run_fetcher():
     Returns:
         bool: True si fue exitoso, False en caso contrario
     """
+    reset_retry_budget()
+    
     try:
         logger.info("=" * 60)
         logger.info("INICIANDO EXTRACCIÓN DE DATOS")
@@ -52,6 +56,9 @@ def run_fetcher():
         import traceback
         logger.error(traceback.format_exc())
         return False
+    
+    finally:
+        log_cache_stats(logger)
 
 if __name__ == "__main__":
     success = run_fetcher()
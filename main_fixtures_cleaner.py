@@ -1,51 +1,32 @@
 """Script para limpiar y normalizar fixtures"""
 import sys
+import argparse
 import pandas as pd
-from src.cleaner.loader import load_raw_files
+from src.cleaner.loader import list_raw_files, iter_raw_files
 from src.cleaner.fixtures_normalizer import normalize_fixtures
 from src.cleaner.save_clean import save_clean
+from src.cleaner.manifest import load_manifest, save_manifest, plan_run, merge_clean, retry_pending_load
+from src.cleaner.polars_engine import resolve_engine, run_polars_cleaner, ENGINES
 from src.cleaner.logger import get_logger
 from src.common.exceptions import DataValidationError
 import os
-import json
 
 logger = get_logger("fixtures_cleaner")
 
-def load_fixtures_raw_files(pattern="fixtures_"):
-    """Carga archivos raw de fixtures"""
-    RAW_DIR = "data/raw"
-    
-    if not os.path.exists(RAW_DIR):
-        logger.error(f"Directorio {RAW_DIR} no existe")
-        raise FileNotFoundError(f"Directorio {RAW_DIR} no encontrado")
-    
-    files = [f for f in os.listdir(RAW_DIR) if f.endswith(".json") and pattern in f]
-    
-    if not files:
-        logger.warning(f"No se encontraron archivos de fixtures en {RAW_DIR}")
-        raise FileNotFoundError(f"No hay archivos de fixtures para procesar")
-    
-    logger.info(f"Encontrados {len(files)} archivos de fixtures")
-    
-    datasets = []
-    for file in files:
-        path = os.path.join(RAW_DIR, file)
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                datasets.append(data)
-                logger.info(f"✓ Cargado: {file}")
-        except Exception as e:
-            logger.error(f"✗ Error al cargar {file}: {str(e)}")
-            continue
-    
-    logger.info(f"Total datasets de fixtures cargados: {len(datasets)}")
-    return datasets
+CLEAN_NAME = "fixtures_clean"
 
-def run_fixtures_cleaner():
+def run_fixtures_cleaner(engine=None, full=False):
     """
     Ejecuta limpieza y normalización de fixtures.
     
+    Solo normaliza los archivos raw nuevos o modificados desde la última
+    ejecución (ver src/cleaner/manifest.py) y los fusiona con el CSV limpio
+    anterior por id_partido.
+    
+    Args:
+        engine: Motor de limpieza ('pandas' o 'polars'; por defecto CLEANER_ENGINE)
+        full: Reprocesar todos los archivos raw
+        
     Returns:
         bool: True si fue exitoso
     """
@@ -54,49 +35,71 @@ def run_fixtures_cleaner():
         logger.info("INICIANDO LIMPIEZA DE FIXTURES")
         logger.info("="*60)
         
-        # Cargar archivos raw de fixtures
-        raw_files = load_fixtures_raw_files()
+        if resolve_engine(engine) == "polars":
+            return run_polars_cleaner("fixtures")
         
-        if not raw_files:
-            logger.error("No hay archivos para procesar")
-            return False
+        # Archivos raw de fixtures pendientes según el manifiesto
+        manifest = load_manifest(CLEAN_NAME)
+        run = plan_run(list_raw_files(pattern="fixtures_"), manifest, full=full)
+        raw_paths = run["paths"]
+        
+        if not raw_paths:
+            logger.info("Sin archivos raw nuevos - el dataset limpio está al día")
+            pending = retry_pending_load(manifest, CLEAN_NAME, "fixtures")
+            save_manifest(CLEAN_NAME, run, manifest["clean_file"], mongo_pending=pending)
+            return True
+        
+        logger.info(
+            f"Limpieza {'completa' if run['full'] else 'incremental'}: "
+            f"{len(raw_paths)} de {len(run['files'])} archivos raw"
+        )
 
         all_dfs = []
+        # Archivos sin normalizar (error de lectura o de normalización)
+        failed_paths = set(raw_paths)
         
-        # Procesar cada archivo
-        for idx, raw_data in enumerate(raw_files, 1):
-            logger.info(f"\nProcesando archivo {idx}/{len(raw_files)}")
+        # Procesar cada archivo (se parsean y normalizan en paralelo; del
+        # pool solo vuelve el DataFrame normalizado)
+        for idx, (path, df) in enumerate(iter_raw_files(raw_paths, transform=normalize_fixtures), 1):
+            logger.info(f"\nProcesando archivo {idx}/{len(raw_paths)}: {os.path.basename(path)}")
             
             try:
-                # Normalizar
-                df = normalize_fixtures(raw_data)
-                
                 if df.empty:
+                    failed_paths.discard(path)
                     logger.warning(f"Archivo {idx} no generó datos")
                     continue
                 
                 all_dfs.append(df)
+                failed_paths.discard(path)
                 
             except Exception as e:
                 logger.error(f"Error en archivo {idx}: {str(e)}")
                 continue
 
         if not all_dfs:
+            if not run["full"]:
+                logger.info("Los archivos nuevos no contienen fixtures - el dataset limpio está al día")
+                pending = retry_pending_load(manifest, CLEAN_NAME, "fixtures")
+                save_manifest(CLEAN_NAME, run, manifest["clean_file"], failed_paths, pending)
+                return True
             logger.error("No se procesó ningún archivo exitosamente")
             return False
 
         # Consolidar
         logger.info("\nConsolidando fixtures...")
-        final_df = pd.concat(all_dfs, ignore_index=True)
+        new_df = pd.concat(all_dfs, ignore_index=True)
         
-        # Eliminar duplicados
-        initial_count = len(final_df)
-        final_df = final_df.drop_duplicates(subset=['id_partido'], keep='last')
-        duplicates_removed = initial_count - len(final_df)
+        # Eliminar duplicados (gana la descarga más reciente)
+        initial_count = len(new_df)
+        new_df = new_df.drop_duplicates(subset=['id_partido'], keep='last')
+        duplicates_removed = initial_count - len(new_df)
         
         if duplicates_removed > 0:
             logger.info(f"Duplicados eliminados: {duplicates_removed}")
         
+        # Fusionar con la limpieza anterior
+        final_df = merge_clean(None if run["full"] else manifest["clean_file"], new_df, "fixtures")
+        
         # Estadísticas
         logger.info(f"\nEstadísticas finales:")
         logger.info(f"  Total fixtures: {len(final_df)}")
@@ -104,8 +107,11 @@ def run_fixtures_cleaner():
         logger.info(f"  Estados: {final_df['estado_del_partido'].unique().tolist()}")
         logger.info(f"  Rango de fechas: {final_df['fecha'].min()} a {final_df['fecha'].max()}")
 
-        # Guardar
-        save_clean(final_df, name="fixtures_clean")
+        # Guardar (en MongoDB solo las filas nuevas, o todo si quedó una
+        # carga pendiente)
+        mongo_df = final_df if manifest["mongo_pending"] else new_df
+        filename, counts = save_clean(final_df, name=CLEAN_NAME, mongo_df=mongo_df)
+        save_manifest(CLEAN_NAME, run, filename, failed_paths, mongo_pending=counts is None)
         
         logger.info("="*60)
         logger.info("✓ LIMPIEZA DE FIXTURES COMPLETADA")
@@ -124,5 +130,12 @@ def run_fixtures_cleaner():
         return False
 
 if __name__ == "__main__":
-    success = run_fixtures_cleaner()
+    parser = argparse.ArgumentParser(description="Limpia y normaliza fixtures")
+    parser.add_argument("--engine", choices=ENGINES, default=None,
+                        help="Motor de limpieza (por defecto CLEANER_ENGINE o pandas)")
+    parser.add_argument("--full", action="store_true",
+                        help="Reprocesar todos los archivos raw (ignora el manifiesto)")
+    args = parser.parse_args()
+
+    success = run_fixtures_cleaner(engine=args.engine, full=args.full)
     sys.exit(0 if success else 1)
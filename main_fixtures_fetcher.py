@@ -1,24 +1,33 @@
 """Script para extraer fixtures de una liga específica"""
 import sys
 import os
+import argparse
 from src.fetcher.fixtures_client import fetch_fixtures
+from src.fetcher.async_fixtures import fetch_fixtures_many
+from src.fetcher.delta_sync import fetch_fixtures_delta, commit_watermark
 from src.fetcher.save_raw import save_raw
+from src.fetcher.http_client import log_cache_stats
 from src.fetcher.logger import get_logger
 from src.common.exceptions import APIConnectionError, APIResponseError
+from src.common.retry import reset_retry_budget
 
 logger = get_logger("fixtures_fetcher")
 
-def run_fixtures_fetcher(league_id, season):
+def run_fixtures_fetcher(league_id, season, delta=False):
     """
     Ejecuta extracción de fixtures.
     
     Args:
         league_id: ID de la liga
         season: Temporada
+        delta: Si True, solo descarga los fixtures que pueden haber cambiado
+            desde la última sincronización (ver src/fetcher/delta_sync.py)
         
     Returns:
         bool: True si fue exitoso
     """
+    reset_retry_budget()
+    
     try:
         logger.info("="*60)
         logger.info("INICIANDO EXTRACCIÓN DE FIXTURES")
@@ -26,16 +35,26 @@ def run_fixtures_fetcher(league_id, season):
         logger.info(f"Liga: {league_id}, Temporada: {season}")
         
         # Extraer datos
-        data = fetch_fixtures(league_id, season)
+        watermark = None
+        if delta:
+            data, watermark = fetch_fixtures_delta(league_id, season)
+        else:
+            data = fetch_fixtures(league_id, season)
         
         if data is None:
             logger.error("No se obtuvieron datos")
             return False
         
+        if delta and not data.get('response'):
+            commit_watermark(league_id, season, watermark)
+            logger.info("✓ Sin cambios desde la última sincronización")
+            return True
+        
         # Guardar datos raw
         filename = save_raw(data, f"fixtures_{league_id}_{season}", country=f"league_{league_id}", season=season)
         
         if filename:
+            commit_watermark(league_id, season, watermark)
             logger.info("="*60)
             logger.info("✓ EXTRACCIÓN DE FIXTURES COMPLETADA")
             logger.info("="*60)
@@ -57,18 +76,131 @@ def run_fixtures_fetcher(league_id, season):
         import traceback
         logger.error(traceback.format_exc())
         return False
+    
+    finally:
+        log_cache_stats(logger)
+
+def run_fixtures_fetcher_many(pairs, concurrency=None, delta=False):
+    """
+    Ejecuta extracción concurrente de fixtures para varias ligas/temporadas.
+    
+    Args:
+        pairs: Lista de tuplas (league_id, season)
+        concurrency: Máximo de requests simultáneos (opcional)
+        delta: Si True, usa sincronización incremental por liga
+        
+    Returns:
+        bool: True si todas las ligas se extrajeron correctamente
+    """
+    reset_retry_budget()
+    
+    try:
+        logger.info("="*60)
+        logger.info("INICIANDO EXTRACCIÓN CONCURRENTE DE FIXTURES")
+        logger.info("="*60)
+        
+        results = fetch_fixtures_many(pairs, concurrency=concurrency, delta=delta)
+        failed = [r for r in results if r["error"] is not None]
+        
+        for r in failed:
+            logger.error(f"✗ Liga {r['league_id']}, temporada {r['season']}: {r['error']}")
+        
+        if failed:
+            logger.error(f"{len(failed)}/{len(results)} ligas fallaron")
+            return False
+        
+        logger.info("="*60)
+        logger.info(f"✓ EXTRACCIÓN DE FIXTURES COMPLETADA ({len(results)} ligas)")
+        logger.info("="*60)
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error inesperado: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return False
+    
+    finally:
+        log_cache_stats(logger)
+
+def parse_league_season_args(args):
+    """
+    Interpreta argumentos de línea de comandos como pares liga/temporada.
+    
+    Acepta tanto el formato clásico `<league_id> <season>` como una lista
+    de pares `<league_id>:<season>` (ej: `39:2023 140:2023`). Las opciones
+    que empiezan por `--` se ignoran.
+    
+    Returns:
+        list: Lista de tuplas (league_id, season)
+        
+    Raises:
+        ValueError: Si los argumentos mezclan formatos o no son números
+    """
+    args = [arg for arg in args if not arg.startswith("--")]
+    
+    if any(":" in arg for arg in args):
+        loose = [arg for arg in args if ":" not in arg]
+        if loose:
+            raise ValueError(
+                f"no se pueden mezclar pares <league_id>:<season> con argumentos sueltos: {' '.join(loose)}"
+            )
+        pairs = []
+        for arg in args:
+            league_id, season = arg.split(":", 1)
+            if not (league_id.isdigit() and season.isdigit()):
+                raise ValueError(f"par liga:temporada inválido: '{arg}'")
+            pairs.append((int(league_id), int(season)))
+        return pairs
+    
+    if not args:
+        return []
+    
+    if len(args) != 2 or not all(arg.isdigit() for arg in args):
+        raise ValueError(f"se esperaba <league_id> <season>, se recibió: {' '.join(args)}")
+    return [(int(args[0]), int(args[1]))]
+
+def parse_cli_args(argv=None, description="Extrae fixtures de una o varias ligas"):
+    """
+    Interpreta la línea de comandos de los scripts de fixtures.
+    
+    Las opciones desconocidas y los pares liga/temporada mal formados
+    terminan con el error de uso de argparse (código de salida 2).
+    
+    Args:
+        argv: Argumentos (por defecto sys.argv[1:])
+        description: Descripción mostrada en --help
+        
+    Returns:
+        tuple: (lista de pares (league_id, season), delta)
+    """
+    parser = argparse.ArgumentParser(
+        description=description,
+        usage="%(prog)s <league_id> <season> | <league_id>:<season> [...] [--delta]"
+    )
+    parser.add_argument("targets", nargs="*", help="<league_id> <season> o pares <league_id>:<season>")
+    parser.add_argument("--delta", action="store_true", help="Sincronización incremental")
+    args = parser.parse_args(argv)
+    
+    try:
+        pairs = parse_league_season_args(args.targets)
+    except ValueError as e:
+        parser.error(str(e))
+    return pairs, args.delta
 
 if __name__ == "__main__":
-    # Ejemplo: Liga 131 (Primera B Metropolitana Argentina), Temporada 2023
-    if len(sys.argv) >= 3:
-        league_id = int(sys.argv[1])
-        season = int(sys.argv[2])
-    else:
-        # Por defecto: Primera B Metropolitana
-        league_id = 131
-        season = 2023
-        print(f"\nUsando valores por defecto: Liga {league_id}, Temporada {season}")
-        print("Uso: python main_fixtures_fetcher.py <league_id> <season>\n")
+    pairs, delta = parse_cli_args()
+    
+    if not pairs:
+        # Por defecto: Liga 131 (Primera B Metropolitana Argentina), Temporada 2023
+        pairs = [(131, 2023)]
+        print("\nUsando valores por defecto: Liga 131, Temporada 2023")
+        print("Uso: python main_fixtures_fetcher.py <league_id> <season>")
+        print("     python main_fixtures_fetcher.py <league_id>:<season> [<league_id>:<season> ...]")
+        print("     Añadir --delta para sincronización incremental\n")
     
-    success = run_fixtures_fetcher(league_id, season)
+    if len(pairs) == 1:
+        success = run_fixtures_fetcher(*pairs[0], delta=delta)
+    else:
+        success = run_fixtures_fetcher_many(pairs, delta=delta)
     sys.exit(0 if success else 1)
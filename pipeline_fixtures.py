@@ -2,7 +2,7 @@
 import sys
 import logging
 from datetime import datetime
-from main_fixtures_fetcher import run_fixtures_fetcher
+from main_fixtures_fetcher import run_fixtures_fetcher, run_fixtures_fetcher_many, parse_cli_args
 from main_fixtures_cleaner import run_fixtures_cleaner
 
 logging.basicConfig(
@@ -11,13 +11,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger("pipeline_fixtures")
 
-def run_fixtures_pipeline(league_id=131, season=2023):
+def run_fixtures_pipeline(league_id=131, season=2023, pairs=None, delta=False):
     """
     Ejecuta pipeline completo de fixtures.
     
     Args:
         league_id: ID de la liga
         season: Temporada
+        pairs: Lista opcional de tuplas (league_id, season). Si se indica,
+            todas las ligas se extraen de forma concurrente y se limpian
+            en una sola pasada.
+        delta: Si True, la extracción es incremental (solo fixtures cambiados)
         
     Returns:
         bool: True si fue exitoso
@@ -25,7 +29,10 @@ def run_fixtures_pipeline(league_id=131, season=2023):
     start_time = datetime.now()
     
     print("\n" + "="*70)
-    print(f"🏆 LUCY FIXTURES PIPELINE - Liga {league_id}, Temporada {season}")
+    if pairs:
+        print(f"🏆 LUCY FIXTURES PIPELINE - {len(pairs)} ligas/temporadas")
+    else:
+        print(f"🏆 LUCY FIXTURES PIPELINE - Liga {league_id}, Temporada {season}")
     print("="*70)
     print(f"Inicio: {start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
 
@@ -35,7 +42,10 @@ def run_fixtures_pipeline(league_id=131, season=2023):
         print("📊 [1/2] PASO 1: EXTRACCIÓN DE FIXTURES")
         print("-"*70)
         
-        fetcher_success = run_fixtures_fetcher(league_id, season)
+        if pairs:
+            fetcher_success = run_fixtures_fetcher_many(pairs, delta=delta)
+        else:
+            fetcher_success = run_fixtures_fetcher(league_id, season, delta=delta)
         
         if not fetcher_success:
             logger.error("❌ Extracción falló")
@@ -81,15 +91,18 @@ def run_fixtures_pipeline(league_id=131, season=2023):
 
 if __name__ == "__main__":
     # Obtener parámetros de línea de comandos
-    if len(sys.argv) >= 3:
-        league_id = int(sys.argv[1])
-        season = int(sys.argv[2])
-    else:
+    pairs, delta = parse_cli_args(description="Pipeline de fixtures: extracción y limpieza")
+    
+    if not pairs:
         # Por defecto: Primera B Metropolitana Argentina
-        league_id = 131
-        season = 2023
-        print(f"\nUsando valores por defecto: Liga {league_id}, Temporada {season}")
-        print("Uso: python pipeline_fixtures.py <league_id> <season>\n")
+        pairs = [(131, 2023)]
+        print("\nUsando valores por defecto: Liga 131, Temporada 2023")
+        print("Uso: python pipeline_fixtures.py <league_id> <season>")
+        print("     python pipeline_fixtures.py <league_id>:<season> [<league_id>:<season> ...]")
+        print("     Añadir --delta para sincronización incremental\n")
     
-    success = run_fixtures_pipeline(league_id, season)
+    if len(pairs) == 1:
+        success = run_fixtures_pipeline(*pairs[0], delta=delta)
+    else:
+        success = run_fixtures_pipeline(pairs=pairs, delta=delta)
     sys.exit(0 if success else 1)
@@ -1,10 +1,96 @@
 """Normalizador de fixtures al formato requerido para pronósticos"""
+import numpy as np
 import pandas as pd
 from .logger import get_logger
-from datetime import datetime
 
 logger = get_logger()
 
+# Estados de la API -> estados en español (los no listados se conservan)
+ESTADO_MAP = {
+    'Match Finished': 'Partido Finalizado',
+    'Not Started': 'No Iniciado',
+    'First Half': 'Primer Tiempo',
+    'Halftime': 'Medio Tiempo',
+    'Second Half': 'Segundo Tiempo',
+    'Extra Time': 'Tiempo Extra',
+    'Penalty In Progress': 'Penales',
+    'Match Postponed': 'Pospuesto',
+    'Match Cancelled': 'Cancelado',
+    'Match Suspended': 'Suspendido',
+    'Match Abandoned': 'Abandonado'
+}
+
+# Orden de columnas del DataFrame normalizado
+FIXTURE_COLUMNS = [
+    "equipo_local", "equipo_visitante", "estado_del_partido", "fecha",
+    "goles_local_1MT", "goles_local_TR", "goles_visitante_1MT", "goles_visitante_TR",
+    "hora", "id_equipo_local", "id_equipo_visitante", "id_partido",
+    "liga_id", "liga_nombre", "ronda"
+]
+
+# Campos extraídos de cada fixture (en el orden de flatten_fixture)
+RAW_FIXTURE_FIELDS = [
+    "id_partido", "date", "status_long", "liga_id", "liga_nombre", "ronda",
+    "id_equipo_local", "equipo_local", "id_equipo_visitante", "equipo_visitante",
+    "goals_home", "goals_away", "halftime_home", "halftime_away"
+]
+
+def flatten_fixture(fixture_data):
+    """Extrae los campos de un fixture de la API como tupla plana"""
+    fixture = fixture_data.get('fixture', {})
+    league = fixture_data.get('league', {})
+    teams = fixture_data.get('teams', {})
+    goals = fixture_data.get('goals', {})
+    halftime = fixture_data.get('score', {}).get('halftime', {})
+    home_team = teams.get('home', {})
+    away_team = teams.get('away', {})
+
+    return (
+        fixture.get('id', 0),
+        fixture.get('date', ''),
+        fixture.get('status', {}).get('long', 'Desconocido'),
+        league.get('id', 0),
+        league.get('name', 'Desconocida'),
+        league.get('round', 'N/A'),
+        home_team.get('id', 0),
+        home_team.get('name', 'Desconocido'),
+        away_team.get('id', 0),
+        away_team.get('name', 'Desconocido'),
+        goals.get('home', 0),
+        goals.get('away', 0),
+        halftime.get('home', 0),
+        halftime.get('away', 0),
+    )
+
+def _goals_column(values):
+    """Goles como texto; los valores vacíos (None, 0) se convierten en '0'"""
+    values = np.asarray(values, dtype=object)
+    values[~values.astype(bool)] = 0
+    return np.asarray(values, dtype=str).tolist()
+
+def _fecha_hora_columns(parsed):
+    """
+    Formatea fecha (YYYY-MM-DD) y hora (HH:MM:SS.ffffff) de una columna datetime.
+
+    Se formatea una sola vez en C (ISO con microsegundos, ancho fijo) y se
+    parte el texto por posición; NaT queda como None.
+    """
+    iso = np.datetime_as_string(parsed.to_numpy(dtype='datetime64[us]'), unit='us')
+    chars = iso.astype('<U26').view('<U1').reshape(-1, 26)
+    fecha = np.ascontiguousarray(chars[:, :10]).view('<U10').ravel().astype(object)
+    hora = np.ascontiguousarray(chars[:, 11:]).view('<U15').ravel().astype(object)
+
+    missing = parsed.isna().to_numpy()
+    fecha[missing] = None
+    hora[missing] = None
+    return fecha.tolist(), hora.tolist()
+
+def _estado_column(values):
+    """Traduce los estados consultando el mapa una vez por estado distinto"""
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=False)
+    translated = np.array([ESTADO_MAP.get(u, u) for u in uniques], dtype=object)
+    return translated[codes].tolist()
+
 def normalize_fixtures(raw_data):
     """
     Normaliza fixtures de la API al formato requerido.
@@ -34,88 +120,56 @@ def normalize_fixtures(raw_data):
     Returns:
         DataFrame: Fixtures normalizados
     """
-    records = []
-
     response_data = raw_data.get("response", [])
     logger.info(f"Normalizando {len(response_data)} fixtures...")
 
+    # Una sola pasada para aplanar; el resto se calcula por columnas
+    rows = []
     for fixture_data in response_data:
         try:
-            # Extraer información del fixture
-            fixture = fixture_data.get('fixture', {})
-            league = fixture_data.get('league', {})
-            teams = fixture_data.get('teams', {})
-            goals = fixture_data.get('goals', {})
-            score = fixture_data.get('score', {})
-            
-            # Fecha y hora
-            fixture_date = fixture.get('date', '')
-            if fixture_date:
-                dt = datetime.fromisoformat(fixture_date.replace('Z', '+00:00'))
-                fecha = dt.strftime('%Y-%m-%d')
-                hora = dt.strftime('%H:%M:%S.%f')
-            else:
-                fecha = None
-                hora = None
-            
-            # Estado del partido
-            status = fixture.get('status', {})
-            status_long = status.get('long', 'Desconocido')
-            
-            # Mapear estados
-            estado_map = {
-                'Match Finished': 'Partido Finalizado',
-                'Not Started': 'No Iniciado',
-                'First Half': 'Primer Tiempo',
-                'Halftime': 'Medio Tiempo',
-                'Second Half': 'Segundo Tiempo',
-                'Extra Time': 'Tiempo Extra',
-                'Penalty In Progress': 'Penales',
-                'Match Postponed': 'Pospuesto',
-                'Match Cancelled': 'Cancelado',
-                'Match Suspended': 'Suspendido',
-                'Match Abandoned': 'Abandonado'
-            }
-            estado_del_partido = estado_map.get(status_long, status_long)
-            
-            # Equipos
-            home_team = teams.get('home', {})
-            away_team = teams.get('away', {})
-            
-            # Goles totales (tiempo reglamentario)
-            goles_local_TR = str(goals.get('home', 0) or 0)
-            goles_visitante_TR = str(goals.get('away', 0) or 0)
-            
-            # Goles medio tiempo
-            halftime = score.get('halftime', {})
-            goles_local_1MT = str(halftime.get('home', 0) or 0)
-            goles_visitante_1MT = str(halftime.get('away', 0) or 0)
-            
-            record = {
-                "equipo_local": home_team.get('name', 'Desconocido'),
-                "equipo_visitante": away_team.get('name', 'Desconocido'),
-                "estado_del_partido": estado_del_partido,
-                "fecha": fecha,
-                "goles_local_1MT": goles_local_1MT,
-                "goles_local_TR": goles_local_TR,
-                "goles_visitante_1MT": goles_visitante_1MT,
-                "goles_visitante_TR": goles_visitante_TR,
-                "hora": hora,
-                "id_equipo_local": home_team.get('id', 0),
-                "id_equipo_visitante": away_team.get('id', 0),
-                "id_partido": fixture.get('id', 0),
-                "liga_id": league.get('id', 0),
-                "liga_nombre": league.get('name', 'Desconocida'),
-                "ronda": league.get('round', 'N/A')
-            }
-            
-            records.append(record)
-            
+            rows.append(flatten_fixture(fixture_data))
         except Exception as e:
             logger.warning(f"Error procesando fixture: {str(e)}")
-            continue
 
-    df = pd.DataFrame(records)
+    if not rows:
+        logger.info("✓ Normalización completada: 0 fixtures")
+        return pd.DataFrame()
+
+    raw = dict(zip(RAW_FIXTURE_FIELDS, zip(*rows)))
+
+    # Fecha y hora: se conserva la hora local del offset de la API
+    dates = pd.Series(raw["date"], dtype=object)
+    has_date = dates.astype(bool)
+    parsed = pd.to_datetime(
+        dates.where(has_date).str.replace(r'(Z|[+-]\d{2}:?\d{2})$', '', regex=True),
+        format='ISO8601', errors='coerce'
+    )
+    fecha, hora = _fecha_hora_columns(parsed)
+
+    df = pd.DataFrame({
+        "equipo_local": raw["equipo_local"],
+        "equipo_visitante": raw["equipo_visitante"],
+        "estado_del_partido": _estado_column(raw["status_long"]),
+        "fecha": fecha,
+        "goles_local_1MT": _goals_column(raw["halftime_home"]),
+        "goles_local_TR": _goals_column(raw["goals_home"]),
+        "goles_visitante_1MT": _goals_column(raw["halftime_away"]),
+        "goles_visitante_TR": _goals_column(raw["goals_away"]),
+        "hora": hora,
+        "id_equipo_local": raw["id_equipo_local"],
+        "id_equipo_visitante": raw["id_equipo_visitante"],
+        "id_partido": raw["id_partido"],
+        "liga_id": raw["liga_id"],
+        "liga_nombre": raw["liga_nombre"],
+        "ronda": raw["ronda"],
+    }, columns=FIXTURE_COLUMNS)
+
+    # Fechas con formato inválido: se descarta el fixture
+    invalid = has_date & parsed.isna()
+    if invalid.any():
+        logger.warning(f"Error procesando fixture: {int(invalid.sum())} fechas inválidas")
+        df = df[~invalid.to_numpy()].reset_index(drop=True)
+
     logger.info(f"✓ Normalización completada: {len(df)} fixtures")
-    
+
     return df
@@ -1,17 +1,86 @@
+import gzip
 import json
 import os
+import re
+from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from .logger import get_logger
 
+try:
+    import zstandard
+except ImportError:  # Dependencia opcional
+    zstandard = None
+
 logger = get_logger()
 
 RAW_DIR = "data/raw"
 
-def load_raw_files():
+# Procesos que parsean y normalizan archivos raw en paralelo (1 = en el proceso actual)
+RAW_LOADER_WORKERS = int(os.getenv('RAW_LOADER_WORKERS', min(os.cpu_count() or 1, 4)))
+
+# Archivos parseados por adelantado como máximo (acota la memoria)
+RAW_LOADER_PREFETCH = int(os.getenv('RAW_LOADER_PREFETCH', 4))
+
+# Extensiones de archivos raw (sin comprimir, gzip y zstd)
+RAW_EXTENSIONS = (".json", ".json.gz", ".json.zst")
+
+def is_raw_file(filename):
+    """Indica si un nombre de archivo corresponde a un snapshot raw"""
+    return filename.endswith(RAW_EXTENSIONS)
+
+def read_raw_file(path):
+    """
+    Lee un archivo raw, descomprimiéndolo según su extensión.
+
+    Args:
+        path: Ruta a un archivo .json, .json.gz o .json.zst
+
+    Returns:
+        dict: Datos JSON
+    """
+    if path.endswith(".json.gz"):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    if path.endswith(".json.zst"):
+        if zstandard is None:
+            raise ImportError(f"zstandard no instalado: no se puede leer {path}")
+        with open(path, "rb") as raw:
+            with zstandard.ZstdDecompressor().stream_reader(raw) as reader:
+                return json.load(reader)
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# Marca de tiempo que save_raw agrega al nombre: {name}_YYYYmmdd_HHMMSS.json[.gz|.zst]
+_FETCH_TIMESTAMP = re.compile(r"_(\d{8}_\d{6})\.json")
+
+def fetch_timestamp(path):
     """
-    Carga todos los archivos JSON del directorio raw.
+    Momento de descarga de un archivo raw ('YYYYmmdd_HHMMSS', ordenable).
+
+    Se toma del nombre del archivo; si no lo tiene, de su fecha de modificación.
+    """
+    match = _FETCH_TIMESTAMP.search(os.path.basename(path))
+    if match:
+        return match.group(1)
+    return datetime.fromtimestamp(os.path.getmtime(path)).strftime('%Y%m%d_%H%M%S')
+
+def list_raw_files(pattern=None):
+    """
+    Lista las rutas de los archivos raw (comprimidos o no), de la descarga
+    más antigua a la más reciente.
+    
+    Con RAW_DEDUP_MODE=link un snapshot repetido es un hard link del
+    original: de cada inode solo se lista el primer nombre, para no volver
+    a limpiar el mismo contenido.
     
+    Args:
+        pattern: Texto que debe contener el nombre (ej: 'fixtures_')
+        
     Returns:
-        list: Lista de datasets cargados
+        list: Rutas de los archivos
         
     Raises:
         FileNotFoundError: Si no existe el directorio o no hay archivos
@@ -20,29 +89,122 @@ def load_raw_files():
         logger.error(f"Directorio {RAW_DIR} no existe")
         raise FileNotFoundError(f"Directorio {RAW_DIR} no encontrado. Ejecuta primero main_fetcher.py")
     
-    files = [f for f in os.listdir(RAW_DIR) if f.endswith(".json")]
+    files = [f for f in os.listdir(RAW_DIR) if is_raw_file(f) and (not pattern or pattern in f)]
     
     if not files:
         logger.warning(f"No se encontraron archivos JSON en {RAW_DIR}")
         raise FileNotFoundError(f"No hay archivos para procesar en {RAW_DIR}")
     
     logger.info(f"Encontrados {len(files)} archivos para procesar")
+    paths = [os.path.join(RAW_DIR, f) for f in files]
+    paths.sort(key=lambda path: (fetch_timestamp(path), os.path.basename(path)))
+    
+    unique = []
+    inodes = set()
+    for path in paths:
+        stat = os.stat(path)
+        if stat.st_nlink > 1:
+            inode = (stat.st_dev, stat.st_ino)
+            if inode in inodes:
+                continue
+            inodes.add(inode)
+        unique.append(path)
+    return unique
+
+def _load_raw_file(path, transform=None):
+    """Lee un archivo raw y, si se indica, lo transforma en el mismo proceso"""
+    data = read_raw_file(path)
+    return data if transform is None else transform(data)
+
+def iter_raw_files(paths=None, pattern=None, workers=RAW_LOADER_WORKERS, prefetch=RAW_LOADER_PREFETCH,
+                   transform=None):
+    """
+    Genera los datasets raw de uno en uno, en el orden de los archivos.
+    
+    Los archivos se parsean en un pool de procesos mientras el llamador
+    procesa el anterior. Nunca hay más de `prefetch` archivos parseados
+    o en curso: si el llamador va más lento, el pool espera.
+    
+    Devolver el JSON completo desde el pool cuesta más (pickle de miles de
+    dicts anidados) que parsearlo, así que con workers > 1 conviene pasar
+    `transform` (ej: normalize_fixtures): se ejecuta en el proceso hijo y
+    solo viaja su resultado compacto.
+    
+    Args:
+        paths: Rutas a cargar (por defecto list_raw_files(pattern))
+        pattern: Texto que debe contener el nombre del archivo
+        workers: Procesos del pool (1 = sin pool)
+        prefetch: Archivos cargados por adelantado como máximo
+        transform: Función de nivel de módulo aplicada a cada dataset
+            (los errores se tratan como archivos ilegibles)
+        
+    Yields:
+        tuple: (ruta, datos JSON o resultado de transform); los archivos
+            ilegibles se omiten
+    """
+    if paths is None:
+        paths = list_raw_files(pattern)
+    
+    if workers <= 1:
+        for path in paths:
+            try:
+                data = _load_raw_file(path, transform)
+            except Exception as e:
+                _log_load_error(path, e)
+                continue
+            logger.info(f"✓ Cargado: {os.path.basename(path)}")
+            yield path, data
+        return
+    
+    pending_paths = iter(paths)
+    in_flight = deque()
+    pool = ProcessPoolExecutor(max_workers=workers)
+    
+    def submit_next():
+        path = next(pending_paths, None)
+        if path is not None:
+            in_flight.append((path, pool.submit(_load_raw_file, path, transform)))
     
-    datasets = []
-
-    for file in files:
-        path = os.path.join(RAW_DIR, file)
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                datasets.append(data)
-                logger.info(f"✓ Cargado: {file}")
-        except json.JSONDecodeError as e:
-            logger.error(f"✗ Error al decodificar {file}: {str(e)}")
-            continue
-        except Exception as e:
-            logger.error(f"✗ Error al cargar {file}: {str(e)}")
-            continue
+    try:
+        for _ in range(max(prefetch, 1)):
+            submit_next()
+        
+        while in_flight:
+            path, future = in_flight.popleft()
+            try:
+                data = future.result()
+            except Exception as e:
+                _log_load_error(path, e)
+                submit_next()
+                continue
+            
+            # El hueco liberado se llena antes de ceder el dataset
+            submit_next()
+            logger.info(f"✓ Cargado: {os.path.basename(path)}")
+            yield path, data
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def _log_load_error(path, error):
+    file = os.path.basename(path)
+    if isinstance(error, json.JSONDecodeError):
+        logger.error(f"✗ Error al decodificar {file}: {str(error)}")
+    else:
+        logger.error(f"✗ Error al cargar {file}: {str(error)}")
+
+def load_raw_files(pattern=None):
+    """
+    Carga todos los archivos JSON del directorio raw (comprimidos o no).
+    
+    Mantiene todos los datasets en memoria; para procesar muchos archivos
+    usar iter_raw_files.
     
+    Returns:
+        list: Lista de datasets cargados
+        
+    Raises:
+        FileNotFoundError: Si no existe el directorio o no hay archivos
+    """
+    datasets = [data for _, data in iter_raw_files(pattern=pattern)]
     logger.info(f"Total datasets cargados exitosamente: {len(datasets)}")
     return datasets
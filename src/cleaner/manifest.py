@@ -0,0 +1,193 @@
+"""Manifiesto de archivos raw ya procesados (limpieza incremental)"""
+import hashlib
+import json
+import os
+import pandas as pd
+from .logger import get_logger
+from .loader import fetch_timestamp
+from .save_clean import CLEAN_DIR, read_clean_csv, reload_to_mongo
+
+logger = get_logger()
+
+# Un manifiesto JSON por dataset limpio: {name}.json
+MANIFEST_DIR = os.path.join(CLEAN_DIR, ".manifest")
+
+# Clave natural de cada dataset al fusionar con la limpieza anterior
+MERGE_KEYS = {
+    "fixtures": ["id_partido"],
+    "leagues": ["league_id", "season"],
+}
+
+
+def _manifest_path(name):
+    return os.path.join(MANIFEST_DIR, f"{name}.json")
+
+
+def file_hash(path):
+    """Hash sha256 del contenido de un archivo (leído por bloques)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(name):
+    """
+    Lee el manifiesto de un dataset.
+
+    Returns:
+        dict: files ({ruta: firma}), failed (archivos que no se pudieron
+            normalizar), clean_file, last_fetch y mongo_pending
+    """
+    manifest = {"files": {}, "failed": {}, "clean_file": None, "last_fetch": None, "mongo_pending": False}
+    try:
+        with open(_manifest_path(name), "r", encoding="utf-8") as f:
+            manifest.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+    return manifest
+
+
+def save_manifest(name, run, clean_file, failed_paths=(), mongo_pending=False):
+    """
+    Guarda el manifiesto tras una limpieza (escritura atómica).
+
+    Los archivos que fallaron al cargarse o normalizarse no se registran
+    como procesados: quedan en `failed` y se reintentan cuando cambian.
+
+    Args:
+        name: Nombre del dataset
+        run: Resultado de plan_run
+        clean_file: CSV limpio resultante
+        failed_paths: Archivos de run["paths"] que no se pudieron normalizar
+        mongo_pending: True si el CSV limpio no se pudo cargar en MongoDB
+    """
+    os.makedirs(MANIFEST_DIR, exist_ok=True)
+    files = {path: sig for path, sig in run["files"].items() if path not in failed_paths}
+    failed = dict(run["failed"])
+    failed.update((path, run["files"][path]) for path in failed_paths)
+    if failed_paths:
+        logger.warning(f"{len(failed_paths)} archivos raw con errores no se marcan como procesados")
+
+    manifest = {
+        "files": files,
+        "failed": failed,
+        "clean_file": clean_file,
+        "last_fetch": max((sig["fetched_at"] for sig in files.values()), default=None),
+        "mongo_pending": mongo_pending,
+    }
+    path = _manifest_path(name)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def plan_run(paths, manifest, full=False):
+    """
+    Decide qué archivos raw hay que normalizar.
+
+    Un archivo con el mismo tamaño y mtime que en el manifiesto no se vuelve
+    a leer; si cambiaron, se compara el hash del contenido. Solo se limpia de
+    forma incremental si todos los archivos nuevos son posteriores a los ya
+    procesados; si un archivo procesado cambió o llegó uno más antiguo, se
+    reconstruye el dataset completo para respetar el orden de descarga.
+    Los archivos que fallaron antes solo se reintentan si cambiaron o en
+    una reconstrucción completa.
+
+    Args:
+        paths: Rutas raw actuales, ordenadas por fecha de descarga
+        manifest: Manifiesto de la limpieza anterior
+        full: Forzar reconstrucción completa
+
+    Returns:
+        dict: paths (a normalizar, en orden), files (firmas de todos),
+            failed (fallidos que no se reintentan) y full
+    """
+    previous = manifest.get("files", {})
+    previous_failed = manifest.get("failed", {})
+    files = {}
+    failed = {}
+    changed = []
+    modified = False
+
+    for path in paths:
+        stat = os.stat(path)
+        signature = previous.get(path)
+        if signature and signature["size"] == stat.st_size and signature["mtime"] == stat.st_mtime:
+            files[path] = signature
+            continue
+
+        failed_signature = previous_failed.get(path)
+        if (failed_signature and failed_signature["size"] == stat.st_size
+                and failed_signature["mtime"] == stat.st_mtime):
+            failed[path] = failed_signature
+            continue
+
+        content_hash = file_hash(path)
+        files[path] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "hash": content_hash,
+            "fetched_at": fetch_timestamp(path),
+        }
+        if signature and signature["hash"] == content_hash:
+            continue
+
+        changed.append(path)
+        modified = modified or signature is not None
+
+    clean_file = manifest.get("clean_file")
+    last_fetch = manifest.get("last_fetch")
+
+    if not full and (not clean_file or not os.path.exists(clean_file)):
+        full = True
+    elif not full and modified:
+        logger.info("Archivos raw ya procesados cambiaron - reconstrucción completa")
+        full = True
+    elif not full and last_fetch and any(files[p]["fetched_at"] < last_fetch for p in changed):
+        logger.info("Archivos raw anteriores a la última limpieza - reconstrucción completa")
+        full = True
+
+    if full:
+        # Reconstrucción completa: también se reintentan los fallidos
+        files.update(failed)
+        return {"paths": list(paths), "files": files, "failed": {}, "full": True}
+    return {"paths": changed, "files": files, "failed": failed, "full": False}
+
+
+def retry_pending_load(manifest, name, kind):
+    """
+    Recarga en MongoDB el CSV limpio si la carga anterior falló.
+
+    Returns:
+        bool: True si la carga sigue pendiente
+    """
+    if not manifest["mongo_pending"] or not manifest["clean_file"]:
+        return False
+    logger.info("Carga en MongoDB pendiente - recargando el dataset limpio")
+    return reload_to_mongo(manifest["clean_file"], kind, name) is None
+
+
+def merge_clean(previous_file, new_df, kind):
+    """
+    Fusiona filas nuevas con el CSV limpio anterior por clave natural.
+
+    Las filas nuevas reemplazan a las anteriores con la misma clave; dentro
+    de new_df gana la última (la descarga más reciente).
+
+    Args:
+        previous_file: CSV limpio anterior (o None)
+        new_df: Filas normalizadas de los archivos nuevos
+        kind: 'leagues' o 'fixtures'
+
+    Returns:
+        DataFrame: Dataset completo
+    """
+    frames = [new_df]
+    if previous_file:
+        # Celdas vacías del CSV -> nulos, como salen de la normalización
+        frames.insert(0, read_clean_csv(previous_file, kind, chunksize=None).replace("", None))
+    merged = pd.concat(frames, ignore_index=True)
+    return merged.drop_duplicates(subset=MERGE_KEYS[kind], keep="last").reset_index(drop=True)
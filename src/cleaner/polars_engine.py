@@ -0,0 +1,294 @@
+"""Motor de limpieza con polars: consulta lazy sobre todos los archivos raw"""
+import os
+import tempfile
+from datetime import datetime
+from .logger import get_logger
+from .loader import list_raw_files, iter_raw_files
+from .fixtures_normalizer import ESTADO_MAP, flatten_fixture
+from .save_clean import CLEAN_DIR, reload_to_mongo
+from .manifest import load_manifest, save_manifest, plan_run
+
+try:
+    import polars as pl
+except ImportError:  # Solo necesario con CLEANER_ENGINE=polars
+    pl = None
+
+logger = get_logger()
+
+# Motor de limpieza por defecto: pandas (en memoria) o polars (lazy, multihilo).
+# El número de hilos de polars se controla con POLARS_MAX_THREADS
+CLEANER_ENGINE = os.getenv('CLEANER_ENGINE', 'pandas').lower()
+ENGINES = ("pandas", "polars")
+
+# Archivos intermedios (parquet, uno por archivo raw); se borran al terminar
+STAGING_DIR = "data/staging"
+
+LEAGUE_FIELDS = ["league_id", "league_name", "type", "country", "season", "start", "end", "current"]
+
+
+def resolve_engine(engine=None):
+    """
+    Determina el motor de limpieza a usar.
+
+    Args:
+        engine: 'pandas', 'polars' o None (usa CLEANER_ENGINE)
+
+    Returns:
+        str: Motor elegido
+    """
+    engine = (engine or CLEANER_ENGINE).lower()
+    if engine not in ENGINES:
+        raise ValueError(f"Motor de limpieza desconocido: {engine} (opciones: {', '.join(ENGINES)})")
+    return engine
+
+
+def _league_rows(raw_data):
+    """Aplana un archivo de ligas: una fila por liga y temporada"""
+    rows = []
+    for entry in raw_data.get("response", []):
+        league = entry.get("league", {})
+        country = entry.get("country", {})
+        for season in entry.get("seasons", []):
+            rows.append((
+                league.get("id"), league.get("name"), league.get("type"), country.get("name"),
+                season.get("year"), season.get("start"), season.get("end"), season.get("current"),
+            ))
+    return rows
+
+
+def _fixture_rows(raw_data):
+    """Aplana un archivo de fixtures (los fixtures mal formados se omiten)"""
+    rows = []
+    for fixture_data in raw_data.get("response", []):
+        try:
+            rows.append(flatten_fixture(fixture_data))
+        except Exception as e:
+            logger.warning(f"Error procesando fixture: {str(e)}")
+    return rows
+
+
+def _schemas():
+    """Esquemas de los archivos intermedios (requiere polars)"""
+    return {
+        "leagues": {
+            "league_id": pl.Int64, "league_name": pl.Utf8, "type": pl.Utf8, "country": pl.Utf8,
+            "season": pl.Int64, "start": pl.Utf8, "end": pl.Utf8, "current": pl.Boolean,
+        },
+        "fixtures": {
+            "id_partido": pl.Int64, "date": pl.Utf8, "status_long": pl.Utf8,
+            "liga_id": pl.Int64, "liga_nombre": pl.Utf8, "ronda": pl.Utf8,
+            "id_equipo_local": pl.Int64, "equipo_local": pl.Utf8,
+            "id_equipo_visitante": pl.Int64, "equipo_visitante": pl.Utf8,
+            "goals_home": pl.Int64, "goals_away": pl.Int64,
+            "halftime_home": pl.Int64, "halftime_away": pl.Int64,
+        },
+    }
+
+
+def stage_raw_files(paths, kind, staging_dir, failed=None):
+    """
+    Convierte cada archivo raw en un parquet intermedio.
+
+    Los archivos se parsean y aplanan en paralelo con iter_raw_files (del
+    pool solo vuelven las filas) y solo unos pocos están en memoria a la
+    vez; el resto del trabajo lo hace la consulta lazy leyendo los parquet.
+
+    Args:
+        paths: Rutas de archivos raw
+        kind: 'leagues' o 'fixtures'
+        staging_dir: Directorio donde escribir los parquet
+        failed: Conjunto donde anotar los archivos que no se pudieron
+            cargar o aplanar (opcional)
+
+    Returns:
+        list: Rutas de los parquet generados (en el orden de `paths`)
+    """
+    schema = _schemas()[kind]
+    flatten = _fixture_rows if kind == "fixtures" else _league_rows
+    parts = []
+    done = set()
+
+    for idx, (path, rows) in enumerate(iter_raw_files(paths, transform=flatten), 1):
+        file = os.path.basename(path)
+        done.add(path)
+        if not rows:
+            logger.warning(f"Archivo {idx} no generó datos - omitiendo")
+            continue
+
+        part = os.path.join(staging_dir, f"part_{idx:06d}.parquet")
+        pl.DataFrame(rows, schema=schema, orient="row", strict=False).write_parquet(part)
+        parts.append(part)
+        logger.info(f"✓ Preparado: {file} ({len(rows)} filas)")
+
+    if failed is not None:
+        failed.update(path for path in paths if path not in done)
+    return parts
+
+
+def leagues_plan(parts):
+    """
+    Consulta lazy de ligas: descarta filas sin season/league_id y deja la
+    última fila por (league_id, season), igual que merge_clean
+
+    Returns:
+        LazyFrame: Ligas limpias
+    """
+    return (
+        pl.scan_parquet(parts)
+        .select(LEAGUE_FIELDS)
+        .drop_nulls(subset=["season", "league_id"])
+        .unique(subset=["league_id", "season"], keep="last", maintain_order=True)
+    )
+
+
+def fixtures_plan(parts):
+    """
+    Consulta lazy de fixtures con el mismo formato que normalize_fixtures.
+
+    Fecha y hora conservan la hora local del offset de la API; los fixtures
+    con fecha inválida se descartan y se deja el último por id_partido.
+
+    Returns:
+        LazyFrame: Fixtures limpios
+    """
+    local_date = pl.col("date").str.replace(r"(Z|[+-]\d{2}:?\d{2})$", "")
+    parsed = pl.coalesce(
+        local_date.str.strptime(pl.Datetime("us"), "%Y-%m-%dT%H:%M:%S%.f", strict=False),
+        local_date.str.strptime(pl.Datetime("us"), "%Y-%m-%d", strict=False),
+    )
+
+    def goals(column):
+        return pl.col(column).fill_null(0).cast(pl.Utf8)
+
+    return (
+        pl.scan_parquet(parts)
+        .with_columns(parsed.alias("_dt"))
+        .filter((pl.col("date").fill_null("") == "") | pl.col("_dt").is_not_null())
+        .select(
+            pl.col("equipo_local"),
+            pl.col("equipo_visitante"),
+            pl.col("status_long").replace(ESTADO_MAP).alias("estado_del_partido"),
+            pl.col("_dt").dt.strftime("%Y-%m-%d").alias("fecha"),
+            goals("halftime_home").alias("goles_local_1MT"),
+            goals("goals_home").alias("goles_local_TR"),
+            goals("halftime_away").alias("goles_visitante_1MT"),
+            goals("goals_away").alias("goles_visitante_TR"),
+            pl.col("_dt").dt.strftime("%H:%M:%S%.6f").alias("hora"),
+            pl.col("id_equipo_local"),
+            pl.col("id_equipo_visitante"),
+            pl.col("id_partido"),
+            pl.col("liga_id"),
+            pl.col("liga_nombre"),
+            pl.col("ronda"),
+        )
+        .unique(subset=["id_partido"], keep="last", maintain_order=True)
+    )
+
+
+def _stats_plan(plan, kind):
+    """Estadísticas finales calculadas en la misma ejecución que el CSV"""
+    if kind == "fixtures":
+        return plan.select(
+            pl.len().alias("total"),
+            pl.col("liga_id").n_unique().alias("ligas"),
+            pl.col("estado_del_partido").unique(maintain_order=True).implode().alias("estados"),
+            pl.col("fecha").min().alias("fecha_min"),
+            pl.col("fecha").max().alias("fecha_max"),
+        )
+    return plan.select(
+        pl.len().alias("total"),
+        pl.col("league_id").n_unique().alias("ligas"),
+        pl.col("country").n_unique().alias("paises"),
+        pl.col("season").unique().sort().implode().alias("temporadas"),
+    )
+
+
+def _log_stats(stats, kind):
+    logger.info("\nEstadísticas finales:")
+    if kind == "fixtures":
+        logger.info(f"  Total fixtures: {stats['total']}")
+        logger.info(f"  Ligas: {stats['ligas']}")
+        logger.info(f"  Estados: {stats['estados']}")
+        logger.info(f"  Rango de fechas: {stats['fecha_min']} a {stats['fecha_max']}")
+    else:
+        logger.info(f"  Total registros: {stats['total']}")
+        logger.info(f"  Ligas únicas: {stats['ligas']}")
+        logger.info(f"  Países: {stats['paises']}")
+        logger.info(f"  Temporadas: {stats['temporadas']}")
+
+
+def clean_with_polars(paths, kind, name, failed=None):
+    """
+    Limpia todos los archivos raw con una consulta lazy de polars.
+
+    El CSV limpio se escribe directamente desde el motor streaming (sin
+    materializar el DataFrame completo) y las estadísticas se calculan en
+    la misma ejecución.
+
+    Args:
+        paths: Rutas de archivos raw
+        kind: 'leagues' o 'fixtures'
+        name: Nombre base del archivo limpio
+        failed: Conjunto donde anotar los archivos con errores (opcional)
+
+    Returns:
+        tuple: (ruta del CSV o None, dict de estadísticas)
+    """
+    if pl is None:
+        raise ImportError("polars no instalado: usa CLEANER_ENGINE=pandas")
+
+    os.makedirs(STAGING_DIR, exist_ok=True)
+    os.makedirs(CLEAN_DIR, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=STAGING_DIR) as staging_dir:
+        parts = stage_raw_files(paths, kind, staging_dir, failed)
+        if not parts:
+            return None, {}
+
+        plan = fixtures_plan(parts) if kind == "fixtures" else leagues_plan(parts)
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"{CLEAN_DIR}/{name}_{timestamp}.csv"
+
+        _, stats = pl.collect_all(
+            [plan.sink_csv(filename, lazy=True), _stats_plan(plan, kind)],
+            engine="streaming",
+        )
+
+    file_size = os.path.getsize(filename)
+    logger.info(f"✓ Archivo limpio guardado: {filename}")
+    logger.info(f"  Tamaño: {file_size / 1024:.2f} KB")
+    return filename, stats.row(0, named=True)
+
+
+def run_polars_cleaner(kind="leagues"):
+    """
+    Ejecuta la limpieza completa con polars y carga el resultado en MongoDB.
+
+    Siempre reprocesa todos los archivos raw; al terminar actualiza el
+    manifiesto para que la siguiente limpieza incremental parta de aquí.
+
+    Args:
+        kind: 'leagues' o 'fixtures'
+
+    Returns:
+        bool: True si fue exitoso
+    """
+    name = "fixtures_clean" if kind == "fixtures" else "clean_leagues"
+    paths = list_raw_files("fixtures_" if kind == "fixtures" else None)
+
+    logger.info(f"Motor polars: {len(paths)} archivos raw")
+    failed = set()
+    filename, stats = clean_with_polars(paths, kind, name, failed)
+
+    if filename is None:
+        logger.error("No se procesó ningún archivo exitosamente")
+        return False
+
+    _log_stats(stats, kind)
+    counts = reload_to_mongo(filename, kind, name)
+
+    # Reconstrucción completa: el motor pandas partirá de este CSV
+    run = plan_run(paths, load_manifest(name), full=True)
+    save_manifest(name, run, filename, failed, mongo_pending=counts is None)
+    return True
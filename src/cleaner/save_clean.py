@@ -1,26 +1,34 @@
 import os
 import sys
 from datetime import datetime
+import pandas as pd
 from .logger import get_logger
+from .fixtures_normalizer import FIXTURE_COLUMNS
 
 # Importar repositorios MongoDB
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from src.database.repositories import LeagueRepository, FixturesRepository
+from src.database.repositories import LeagueRepository, FixturesRepository, DatasetVersionRepository
 
 logger = get_logger()
 
 CLEAN_DIR = "data/clean"
 
-def save_clean(df, name="clean_leagues"):
+# Filas por lote al leer un CSV limpio (ej: para cargarlo en MongoDB)
+MONGO_LOAD_CHUNK_SIZE = int(os.getenv('MONGO_LOAD_CHUNK_SIZE', 50000))
+
+def save_clean(df, name="clean_leagues", mongo_df=None):
     """
     Guarda DataFrame limpio en formato CSV y MongoDB.
     
     Args:
         df: DataFrame a guardar
         name: Nombre base del archivo
+        mongo_df: Filas a cargar en MongoDB (por defecto df); en limpiezas
+            incrementales solo las nuevas o modificadas
         
     Returns:
-        str: Path del archivo guardado
+        tuple: (path del archivo guardado, contadores de MongoDB o None si
+            la carga falló)
     """
     try:
         # Crear directorio si no existe
@@ -41,29 +49,100 @@ def save_clean(df, name="clean_leagues"):
         logger.info(f"  Tamaño: {file_size / 1024:.2f} KB")
         
         # Guardar en MongoDB (si está disponible)
-        try:
-            # Detectar si son fixtures o ligas basado en columnas
-            is_fixtures = 'id_partido' in df.columns
-            
-            if is_fixtures:
-                repo = FixturesRepository()
-                if repo.is_available():
-                    logger.info("\nGuardando fixtures en MongoDB...")
-                    inserted = repo.save_fixtures_batch(df, batch_size=1000)
-                    if inserted > 0:
-                        logger.info(f"✓ MongoDB: {inserted} fixtures guardados")
-            else:
-                repo = LeagueRepository()
-                if repo.is_available():
-                    logger.info("\nGuardando ligas en MongoDB...")
-                    inserted = repo.save_clean_batch(df, batch_size=1000)
-                    if inserted > 0:
-                        logger.info(f"✓ MongoDB: {inserted} documentos guardados")
-        except Exception as mongo_error:
-            logger.warning(f"MongoDB no disponible: {str(mongo_error)}")
+        counts = save_to_mongo([df if mongo_df is None else mongo_df], name)
         
-        return filename
+        return filename, counts
         
     except Exception as e:
         logger.error(f"✗ Error al guardar archivo limpio: {str(e)}")
         raise
+
+def save_to_mongo(frames, name="clean_leagues"):
+    """
+    Guarda uno o varios DataFrames limpios en MongoDB (upsert por lotes).
+    
+    Acepta un iterable para poder cargar un CSV grande por trozos sin
+    tenerlo entero en memoria. Las estadísticas y la versión del dataset se
+    actualizan una sola vez al final.
+    
+    Args:
+        frames: Iterable de DataFrames (fixtures o ligas)
+        name: Nombre del dataset
+        
+    Returns:
+        dict: Contadores {'inserted', 'updated', 'unchanged', 'errors'}, o
+            None si MongoDB no está disponible o algún documento falló
+    """
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'errors': 0}
+    repo = None
+    
+    try:
+        for df in frames:
+            if repo is None:
+                # Detectar si son fixtures o ligas basado en columnas
+                is_fixtures = 'id_partido' in df.columns
+                repo = FixturesRepository() if is_fixtures else LeagueRepository()
+                if not repo.is_available():
+                    logger.warning("MongoDB no disponible - carga pendiente")
+                    return None
+                logger.info(f"\nGuardando {'fixtures' if is_fixtures else 'ligas'} en MongoDB...")
+            
+            if is_fixtures:
+                result = repo.save_fixtures_batch(df, batch_size=1000)
+            else:
+                result = repo.save_clean_batch(df, batch_size=1000)
+            for key in counts:
+                counts[key] += result[key]
+        
+        if counts['inserted'] or counts['updated']:
+            label = ('fixtures nuevos', 'actualizados') if is_fixtures else ('ligas nuevas', 'actualizadas')
+            logger.info(
+                f"✓ MongoDB: {counts['inserted']} {label[0]}, "
+                f"{counts['updated']} {label[1]}"
+            )
+            repo.refresh_stats()
+            DatasetVersionRepository().bump(name)
+    except Exception as mongo_error:
+        logger.warning(f"MongoDB no disponible: {str(mongo_error)}")
+        return None
+    
+    if counts['errors']:
+        logger.warning(f"MongoDB: {counts['errors']} documentos no se guardaron - carga pendiente")
+        return None
+    return counts
+
+def reload_to_mongo(filename, kind, name):
+    """
+    Carga en MongoDB un CSV limpio completo, por trozos.
+    
+    Args:
+        filename: Ruta del CSV
+        kind: 'leagues' o 'fixtures'
+        name: Nombre del dataset
+        
+    Returns:
+        dict: Contadores (None si la carga falló)
+    """
+    return save_to_mongo(read_clean_csv(filename, kind), name)
+
+def read_clean_csv(filename, kind, chunksize=MONGO_LOAD_CHUNK_SIZE):
+    """
+    Lee un CSV limpio con los mismos tipos que genera la limpieza.
+    
+    Args:
+        filename: Ruta del CSV
+        kind: 'leagues' o 'fixtures'
+        chunksize: Filas por trozo (None = todo de una vez)
+        
+    Returns:
+        Iterador de DataFrames (o DataFrame si chunksize es None)
+    """
+    if kind == "fixtures":
+        int_columns = ("id_equipo_local", "id_equipo_visitante", "id_partido", "liga_id")
+        text_columns = [c for c in FIXTURE_COLUMNS if c not in int_columns]
+    else:
+        text_columns = ["league_name", "type", "country", "start", "end"]
+    return pd.read_csv(
+        filename, chunksize=chunksize, encoding="utf-8",
+        dtype={column: str for column in text_columns}, keep_default_na=False
+    )
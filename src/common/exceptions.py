@@ -19,3 +19,18 @@ class FileProcessingError(Exception):
 class ConfigurationError(Exception):
     """Error en la configuración del sistema"""
     pass
+
+class QuotaExceededError(APIConnectionError):
+    """Cuota diaria de la API agotada para la prioridad solicitada"""
+    pass
+
+class TransientAPIError(APIConnectionError):
+    """Error transitorio de la API (timeout, conexión, 429, 5xx) que puede reintentarse"""
+    
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class CircuitOpenError(APIConnectionError):
+    """Circuit breaker abierto: se evita llamar a un servicio que está fallando"""
+    pass
@@ -1,45 +1,304 @@
-"""Utilidad para reintentos con backoff exponencial"""
+"""Utilidad para reintentos con backoff exponencial, jitter y circuit breaker"""
+import asyncio
+import os
+import random
+import threading
 import time
 import logging
 from functools import wraps
+from .exceptions import CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
-def retry_on_failure(max_attempts=3, delay=2, backoff=2, exceptions=(Exception,)):
+# Límite de reintentos por ejecución (compartido por todas las funciones)
+RETRY_BUDGET = int(os.getenv("RETRY_BUDGET", "50"))
+
+# Circuit breaker: fallos consecutivos para abrir y segundos hasta probar de nuevo
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RECOVERY_TIMEOUT = float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "60"))
+
+
+class RetryBudget:
+    """
+    Presupuesto de reintentos compartido durante una ejecución.
+
+    Evita que, con el upstream caído, cada liga consuma todos sus
+    reintentos: una vez agotado el presupuesto los fallos se propagan
+    en el primer intento.
+    """
+
+    def __init__(self, limit=RETRY_BUDGET):
+        self.limit = limit
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def try_consume(self):
+        """
+        Consume un reintento del presupuesto.
+
+        Returns:
+            bool: False si el presupuesto está agotado
+        """
+        with self._lock:
+            if self._used >= self.limit:
+                return False
+            self._used += 1
+            return True
+
+    @property
+    def remaining(self):
+        return max(self.limit - self._used, 0)
+
+    def reset(self):
+        """Reinicia el presupuesto (al comenzar una nueva ejecución)"""
+        with self._lock:
+            self._used = 0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por servicio/endpoint.
+
+    - closed: las llamadas pasan normalmente
+    - open: tras `failure_threshold` fallos consecutivos, las llamadas
+      fallan de inmediato con CircuitOpenError durante `recovery_timeout`
+    - half_open: pasado ese tiempo se permite una llamada de prueba; si
+      funciona el circuito se cierra, si falla se vuelve a abrir
+    """
+
+    def __init__(self, name, failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+                 recovery_timeout=CIRCUIT_RECOVERY_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        Verifica si se permite la llamada.
+
+        Raises:
+            CircuitOpenError: Si el circuito está abierto
+        """
+        with self._lock:
+            if self.state == "closed":
+                return
+
+            elapsed = time.monotonic() - self._opened_at
+            if self.state == "open" and elapsed >= self.recovery_timeout:
+                self.state = "half_open"
+                logger.info(f"Circuit breaker '{self.name}': probando recuperación")
+                return
+
+            raise CircuitOpenError(
+                f"Circuit breaker '{self.name}' abierto - "
+                f"reintento en {max(self.recovery_timeout - elapsed, 0):.0f}s"
+            )
+
+    def release_probe(self):
+        """
+        Devuelve el circuito a 'open' si la llamada de prueba terminó con un
+        error que no cuenta como fallo del servicio (ej: cuota agotada o
+        respuesta inválida). La siguiente llamada vuelve a probar.
+        """
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                logger.info(f"Circuit breaker '{self.name}': cerrado")
+            self.state = "closed"
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.error(
+                        f"Circuit breaker '{self.name}': abierto tras {self._failures} fallos"
+                    )
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+retry_budget = RetryBudget()
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(key):
+    """
+    Obtiene el circuit breaker compartido para una clave (ej: endpoint).
+
+    Args:
+        key: Identificador del servicio/endpoint
+
+    Returns:
+        CircuitBreaker: Instancia compartida para esa clave
+    """
+    with _breakers_lock:
+        if key not in _breakers:
+            _breakers[key] = CircuitBreaker(key)
+        return _breakers[key]
+
+
+def reset_retry_budget():
+    """Reinicia el presupuesto global de reintentos"""
+    retry_budget.reset()
+
+
+def _compute_delay(attempt, delay, backoff, max_delay, jitter, error):
+    """
+    Calcula la espera antes del siguiente intento.
+
+    Usa full jitter (aleatorio entre 0 y el backoff exponencial) para que
+    los workers concurrentes no reintenten todos a la vez, y respeta el
+    Retry-After que traiga la excepción.
+    """
+    ceiling = min(max_delay, delay * (backoff ** (attempt - 1)))
+    wait = random.uniform(0, ceiling) if jitter else ceiling
+
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        wait = max(wait, float(retry_after))
+
+    return wait
+
+
+def _should_retry(attempt, max_attempts, budget, func_name, error):
+    """Decide si se reintenta, registrando el motivo cuando no"""
+    if attempt == max_attempts:
+        logger.error(
+            f"Falló {func_name} después de {max_attempts} intentos: {str(error)}"
+        )
+        return False
+
+    if isinstance(error, CircuitOpenError):
+        return False
+
+    if budget is not None and not budget.try_consume():
+        logger.error(
+            f"Presupuesto de reintentos agotado - {func_name} falló: {str(error)}"
+        )
+        return False
+
+    return True
+
+
+def _resolve_breaker(circuit_key, args, kwargs):
+    if circuit_key is None:
+        return None
+    key = circuit_key(*args, **kwargs) if callable(circuit_key) else circuit_key
+    return get_circuit_breaker(key)
+
+
+def retry_on_failure(max_attempts=3, delay=2, backoff=2, exceptions=(Exception,),
+                     max_delay=60, jitter=True, circuit_key=None, budget=retry_budget):
     """
     Decorador para reintentar una función en caso de fallo.
-    
+
     Args:
         max_attempts: Número máximo de intentos
         delay: Delay inicial en segundos
         backoff: Multiplicador del delay en cada reintento
         exceptions: Tupla de excepciones a capturar
+        max_delay: Tope del delay entre intentos
+        jitter: Si True, espera un tiempo aleatorio en [0, delay] (full jitter)
+        circuit_key: Clave (o función de los argumentos) del circuit breaker
+            compartido; None para no usar circuit breaker
+        budget: RetryBudget compartido; None para no limitar
     """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            current_delay = delay
+            breaker = _resolve_breaker(circuit_key, args, kwargs)
             last_exception = None
-            
+
             for attempt in range(1, max_attempts + 1):
+                if breaker is not None:
+                    breaker.before_call()
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
+                    if breaker is not None:
+                        breaker.record_success()
+                    return result
                 except exceptions as e:
                     last_exception = e
-                    if attempt == max_attempts:
-                        logger.error(
-                            f"Falló {func.__name__} después de {max_attempts} intentos: {str(e)}"
-                        )
+                    if breaker is not None:
+                        breaker.record_failure()
+
+                    if not _should_retry(attempt, max_attempts, budget, func.__name__, e):
                         raise
-                    
+
+                    wait = _compute_delay(attempt, delay, backoff, max_delay, jitter, e)
                     logger.warning(
                         f"Intento {attempt}/{max_attempts} falló para {func.__name__}: {str(e)}. "
-                        f"Reintentando en {current_delay}s..."
+                        f"Reintentando en {wait:.1f}s..."
                     )
-                    time.sleep(current_delay)
-                    current_delay *= backoff
-            
+                    time.sleep(wait)
+                except BaseException:
+                    # Errores no reintentables: no dejar el circuito en half_open
+                    if breaker is not None:
+                        breaker.release_probe()
+                    raise
+
             raise last_exception
-        
+
+        return wrapper
+    return decorator
+
+
+def async_retry_on_failure(max_attempts=3, delay=2, backoff=2, exceptions=(Exception,),
+                           max_delay=60, jitter=True, circuit_key=None, budget=retry_budget):
+    """
+    Variante de retry_on_failure para corrutinas.
+
+    Acepta los mismos argumentos y comparte presupuesto y circuit breakers
+    con la versión síncrona, pero espera con asyncio.sleep sin bloquear
+    el event loop.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            breaker = _resolve_breaker(circuit_key, args, kwargs)
+            last_exception = None
+
+            for attempt in range(1, max_attempts + 1):
+                if breaker is not None:
+                    breaker.before_call()
+                try:
+                    result = await func(*args, **kwargs)
+                    if breaker is not None:
+                        breaker.record_success()
+                    return result
+                except exceptions as e:
+                    last_exception = e
+                    if breaker is not None:
+                        breaker.record_failure()
+
+                    if not _should_retry(attempt, max_attempts, budget, func.__name__, e):
+                        raise
+
+                    wait = _compute_delay(attempt, delay, backoff, max_delay, jitter, e)
+                    logger.warning(
+                        f"Intento {attempt}/{max_attempts} falló para {func.__name__}: {str(e)}. "
+                        f"Reintentando en {wait:.1f}s..."
+                    )
+                    await asyncio.sleep(wait)
+                except BaseException:
+                    # Errores no reintentables: no dejar el circuito en half_open
+                    if breaker is not None:
+                        breaker.release_probe()
+                    raise
+
+            raise last_exception
+
         return wrapper
     return decorator
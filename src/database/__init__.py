@@ -1,5 +1,6 @@
 """Módulo de base de datos MongoDB"""
-from .connection import get_db, close_connection
-from .repositories import LeagueRepository
+from .connection import get_db, close_connection, get_connection_state
+from .repositories import LeagueRepository, FixturesRepository, RawFixturesRepository, SyncWatermarkRepository, FetchLockRepository, BackfillCheckpointRepository, DatasetVersionRepository
+from .async_repositories import AsyncLeagueRepository, AsyncFixturesRepository
 
-__all__ = ['get_db', 'close_connection', 'LeagueRepository']
+__all__ = ['get_db', 'close_connection', 'get_connection_state', 'LeagueRepository', 'FixturesRepository', 'RawFixturesRepository', 'SyncWatermarkRepository', 'FetchLockRepository', 'BackfillCheckpointRepository', 'DatasetVersionRepository', 'AsyncLeagueRepository', 'AsyncFixturesRepository']
@@ -0,0 +1,92 @@
+"""Repositorios asíncronos para la API (consultas MongoDB fuera del event loop)"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .repositories import LeagueRepository, FixturesRepository
+
+# Hilos dedicados a consultas MongoDB desde la API
+DB_THREAD_POOL_SIZE = int(os.getenv('DB_THREAD_POOL_SIZE', 16))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor() -> ThreadPoolExecutor:
+    """Obtiene el pool acotado de hilos para consultas MongoDB"""
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=DB_THREAD_POOL_SIZE,
+                    thread_name_prefix="mongo"
+                )
+    return _executor
+
+async def run_in_db_pool(fn, *args, **kwargs):
+    """
+    Ejecuta una función bloqueante en el pool de MongoDB
+
+    Args:
+        fn: Función síncrona (ej: método de un repositorio)
+
+    Returns:
+        Resultado de la función
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+
+def shutdown_executor():
+    """Detiene el pool de hilos (al apagar la API)"""
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+class AsyncRepository:
+    """
+    Envoltorio asíncrono de un repositorio síncrono.
+
+    Cada método del repositorio se expone como corrutina que se ejecuta en
+    el pool acotado, así una consulta lenta no congela el event loop y el
+    número de consultas simultáneas queda limitado a DB_THREAD_POOL_SIZE.
+    """
+
+    repository_class = None
+
+    def __init__(self, repository=None):
+        self._repository = repository if repository is not None else self.repository_class()
+
+    @classmethod
+    async def create(cls):
+        """Crea el repositorio fuera del event loop (la primera conexión puede tardar)"""
+        return cls(await run_in_db_pool(cls.repository_class))
+
+    def is_available(self) -> bool:
+        """Verifica si MongoDB está disponible (no bloquea)"""
+        return self._repository.is_available()
+
+    def __getattr__(self, name):
+        attr = getattr(self._repository, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await run_in_db_pool(attr, *args, **kwargs)
+
+        return method
+
+class AsyncLeagueRepository(AsyncRepository):
+    """Versión asíncrona de LeagueRepository"""
+
+    repository_class = LeagueRepository
+
+class AsyncFixturesRepository(AsyncRepository):
+    """Versión asíncrona de FixturesRepository"""
+
+    repository_class = FixturesRepository
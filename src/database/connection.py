@@ -1,59 +1,246 @@
 """Gestión de conexión a MongoDB"""
 import os
-from pymongo import MongoClient
+import threading
+import time
+from datetime import datetime
+from pymongo import MongoClient, monitoring
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 import logging
 
 logger = logging.getLogger(__name__)
 
-_client = None
-_db = None
+# Timeout de selección de servidor en cada intento de conexión (ms)
+MONGO_TIMEOUT_MS = int(os.getenv('MONGO_TIMEOUT_MS', 5000))
+
+# Backoff de reconexión en segundo plano (seg)
+MONGO_RECONNECT_MIN_DELAY = float(os.getenv('MONGO_RECONNECT_MIN_DELAY', 1))
+MONGO_RECONNECT_MAX_DELAY = float(os.getenv('MONGO_RECONNECT_MAX_DELAY', 60))
+
+STATE_IDLE = "idle"
+STATE_CONNECTED = "connected"
+STATE_DISCONNECTED = "disconnected"
+
+
+class _HeartbeatListener(monitoring.ServerHeartbeatListener):
+    """Detecta caídas de MongoDB después de haber conectado"""
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        self.manager.report_failure(event.reply)
+
+
+class ConnectionManager:
+    """
+    Conexión a MongoDB con caché de fallos y reconexión en segundo plano.
+
+    El primer get_db() intenta conectar de forma síncrona. Si falla, el
+    fallo se recuerda: las llamadas siguientes devuelven None al instante
+    mientras un hilo reintenta con backoff exponencial. Una caída posterior
+    (detectada por los heartbeats del driver) activa el mismo mecanismo.
+    """
+
+    def __init__(self, mongo_url=None, db_name=None, timeout_ms=MONGO_TIMEOUT_MS,
+                 min_delay=MONGO_RECONNECT_MIN_DELAY, max_delay=MONGO_RECONNECT_MAX_DELAY):
+        self.mongo_url = mongo_url
+        self.db_name = db_name
+        self.timeout_ms = timeout_ms
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+
+        self._client = None
+        self._db = None
+        self._state = STATE_IDLE
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._reconnect_thread = None
+
+        self.failures = 0
+        self.total_failures = 0
+        self.reconnects = 0
+        self.last_error = None
+        self.last_failure_at = None
+        self.connected_at = None
+        self.next_retry_at = None
+
+    def get_db(self):
+        """
+        Obtiene la base de datos o None si MongoDB no está disponible.
+
+        Solo bloquea en el primer intento; después responde al instante.
+        """
+        if self._state == STATE_CONNECTED:
+            return self._db
+        if self._state == STATE_DISCONNECTED:
+            return None
+
+        with self._lock:
+            if self._state == STATE_IDLE:
+                self._connect()
+        return self._db if self._state == STATE_CONNECTED else None
+
+    def is_available(self):
+        """Indica si hay conexión, sin intentar conectar"""
+        return self._state == STATE_CONNECTED
+
+    def _connect(self):
+        """Intenta conectar (con el lock tomado). Devuelve True si conectó"""
+        mongo_url = self.mongo_url or os.getenv('MONGO_URL', 'mongodb://localhost:27017/')
+        db_name = self.db_name or os.getenv('MONGO_DB_NAME', 'lucy_sports')
+
+        try:
+            logger.info(f"Conectando a MongoDB: {db_name}")
+
+            if self._client is None:
+                self._client = MongoClient(
+                    mongo_url,
+                    serverSelectionTimeoutMS=self.timeout_ms,
+                    connectTimeoutMS=10000,
+                    socketTimeoutMS=10000,
+                    event_listeners=[_HeartbeatListener(self)]
+                )
+
+            # Verificar conexión
+            self._client.admin.command('ping')
+
+            db = self._client[db_name]
+
+            # Crear índices al conectar
+            _create_indexes(db)
+
+            self._db = db
+            self._state = STATE_CONNECTED
+            self.failures = 0
+            self.next_retry_at = None
+            self.connected_at = datetime.utcnow()
+
+            logger.info(f"✓ Conectado a MongoDB: {db_name}")
+            return True
+
+        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            logger.error(f"Error conectando a MongoDB: {str(e)}")
+            logger.warning("Continuando sin MongoDB - solo archivos")
+            error = e
+        except Exception as e:
+            logger.error(f"Error inesperado con MongoDB: {str(e)}")
+            error = e
+
+        self._mark_failed(error)
+        return False
+
+    def _mark_failed(self, error):
+        """Registra el fallo y arranca la reconexión (con el lock tomado)"""
+        self._db = None
+        self._state = STATE_DISCONNECTED
+        self.failures += 1
+        self.total_failures += 1
+        self.last_error = str(error)
+        self.last_failure_at = datetime.utcnow()
+
+        if self._stop.is_set():
+            return
+        if self._reconnect_thread is None or not self._reconnect_thread.is_alive():
+            self._reconnect_thread = threading.Thread(
+                target=self._reconnect_loop, name="mongo-reconnect", daemon=True
+            )
+            self._reconnect_thread.start()
+
+    def report_failure(self, error):
+        """Marca la conexión como caída (ej: heartbeat fallido)"""
+        # Sin tomar el lock si no hay nada que marcar: el hilo de monitoreo
+        # del driver no debe esperar a un intento de conexión en curso
+        if self._state != STATE_CONNECTED:
+            return
+        with self._lock:
+            if self._state != STATE_CONNECTED:
+                return
+            logger.warning(f"MongoDB no responde: {str(error)} - reconectando en segundo plano")
+            self._mark_failed(error)
+
+    def _reconnect_loop(self):
+        """Reintenta conectar con backoff exponencial hasta lograrlo"""
+        while not self._stop.is_set():
+            delay = min(self.min_delay * (2 ** max(self.failures - 1, 0)), self.max_delay)
+            self.next_retry_at = time.time() + delay
+
+            if self._stop.wait(delay):
+                return
+
+            with self._lock:
+                if self._stop.is_set() or self._state == STATE_CONNECTED:
+                    return
+                if self._connect():
+                    self.reconnects += 1
+                    logger.info("✓ MongoDB reconectado")
+                    return
+
+    def metrics(self):
+        """
+        Obtiene el estado de la conexión.
+
+        Returns:
+            dict: state, available, failures, total_failures, reconnects,
+                last_error, last_failure_at, connected_at y next_retry_in
+        """
+        next_retry_in = None
+        if self._state == STATE_DISCONNECTED and self.next_retry_at is not None:
+            next_retry_in = round(max(self.next_retry_at - time.time(), 0), 1)
+
+        return {
+            "state": self._state,
+            "available": self.is_available(),
+            "failures": self.failures,
+            "total_failures": self.total_failures,
+            "reconnects": self.reconnects,
+            "last_error": self.last_error,
+            "last_failure_at": self.last_failure_at,
+            "connected_at": self.connected_at,
+            "next_retry_in": next_retry_in,
+        }
+
+    def close(self):
+        """Cierra la conexión y detiene la reconexión"""
+        self._stop.set()
+        thread = self._reconnect_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1)
+
+        with self._lock:
+            if self._client:
+                self._client.close()
+                logger.info("Conexión a MongoDB cerrada")
+            self._client = None
+            self._db = None
+            self._state = STATE_IDLE
+            self._reconnect_thread = None
+            self._stop.clear()
+
+
+_manager = ConnectionManager()
 
 def get_db():
     """
     Obtiene la instancia de base de datos MongoDB.
     Implementa patrón Singleton para reutilizar conexión.
-    
+
+    Si MongoDB no está disponible devuelve None sin bloquear (salvo en el
+    primer intento) y se reconecta en segundo plano.
+
     Returns:
         Database: Instancia de MongoDB
     """
-    global _client, _db
-    
-    if _db is not None:
-        return _db
-    
-    try:
-        mongo_url = os.getenv('MONGO_URL', 'mongodb://localhost:27017/')
-        db_name = os.getenv('MONGO_DB_NAME', 'lucy_sports')
-        
-        logger.info(f"Conectando a MongoDB: {db_name}")
-        
-        _client = MongoClient(
-            mongo_url,
-            serverSelectionTimeoutMS=5000,
-            connectTimeoutMS=10000,
-            socketTimeoutMS=10000
-        )
-        
-        # Verificar conexión
-        _client.admin.command('ping')
-        
-        _db = _client[db_name]
-        
-        logger.info(f"✓ Conectado a MongoDB: {db_name}")
-        
-        # Crear índices al conectar
-        _create_indexes(_db)
-        
-        return _db
-        
-    except (ConnectionFailure, ServerSelectionTimeoutError) as e:
-        logger.error(f"Error conectando a MongoDB: {str(e)}")
-        logger.warning("Continuando sin MongoDB - solo archivos")
-        return None
-    except Exception as e:
-        logger.error(f"Error inesperado con MongoDB: {str(e)}")
-        return None
+    return _manager.get_db()
+
+def get_connection_state():
+    """Obtiene las métricas de estado de la conexión a MongoDB"""
+    return _manager.metrics()
 
 def _create_indexes(db):
     """Crea índices para optimizar queries"""
@@ -62,12 +249,22 @@ def _create_indexes(db):
         db.raw_leagues.create_index('timestamp')
         db.raw_leagues.create_index('country')
         
+        # Índices para raw_fixtures (un documento por fixture y versión)
+        db.raw_fixtures.create_index([('fixture_id', 1), ('content_hash', 1)], unique=True)
+        db.raw_fixtures.create_index([('fixture_id', 1), ('last_seen_at', -1)])
+        db.raw_fixtures.create_index([('league_id', 1), ('season', 1)])
+        
         # Índices para clean_leagues
         db.clean_leagues.create_index('league_id')
         db.clean_leagues.create_index('season')
         db.clean_leagues.create_index('country')
         db.clean_leagues.create_index([('country', 1), ('season', 1)])
         
+        # Índices de paginación por cursor (orden league_id, season); el de
+        # (league_id, season) es único y se crea en ensure_clean_leagues_unique_index
+        db.clean_leagues.create_index([('country', 1), ('league_id', 1), ('season', 1)])
+        db.clean_leagues.create_index([('season', 1), ('league_id', 1)])
+        
         # Índices para fixtures
         db.fixtures.create_index('id_partido', unique=True)
         db.fixtures.create_index('liga_id')
@@ -76,16 +273,46 @@ def _create_indexes(db):
         db.fixtures.create_index('id_equipo_visitante')
         db.fixtures.create_index([('liga_id', 1), ('fecha', -1)])
         
+        # Índices de paginación por cursor (orden fecha, id_partido)
+        db.fixtures.create_index([('fecha', -1), ('id_partido', -1)])
+        db.fixtures.create_index([('liga_id', 1), ('fecha', -1), ('id_partido', -1)])
+        db.fixtures.create_index([('id_equipo_local', 1), ('fecha', -1), ('id_partido', -1)])
+        db.fixtures.create_index([('id_equipo_visitante', 1), ('fecha', -1), ('id_partido', -1)])
+        
+        # Índices para marcas de sincronización incremental
+        db.sync_watermarks.create_index([('league_id', 1), ('season', 1)], unique=True)
+        
+        # Locks de requests en curso (se eliminan solos al expirar)
+        db.fetch_locks.create_index('expires_at', expireAfterSeconds=0)
+        
+        # Checkpoints de backfill
+        db.backfill_checkpoints.create_index([('league_id', 1), ('season', 1)], unique=True)
+        
         logger.info("✓ Índices creados en MongoDB")
     except Exception as e:
         logger.warning(f"No se pudieron crear índices: {str(e)}")
+    
+    try:
+        ensure_clean_leagues_unique_index(db)
+    except Exception as e:
+        logger.warning(
+            f"No se pudo crear el índice único de clean_leagues: {str(e)}. "
+            "Ejecuta: python compact_leagues.py"
+        )
+
+def ensure_clean_leagues_unique_index(db):
+    """
+    Crea el índice único (league_id, season) de clean_leagues.
+    
+    Si existe la versión no única del mismo índice, se reemplaza. Falla si
+    la colección todavía tiene ligas duplicadas (ver compact_leagues.py).
+    """
+    key = [('league_id', 1), ('season', 1)]
+    for name, info in db.clean_leagues.index_information().items():
+        if info.get('key') == key and not info.get('unique'):
+            db.clean_leagues.drop_index(name)
+    db.clean_leagues.create_index(key, unique=True)
 
 def close_connection():
     """Cierra la conexión a MongoDB"""
-    global _client, _db
-    
-    if _client:
-        _client.close()
-        _client = None
-        _db = None
-        logger.info("Conexión a MongoDB cerrada")
+    _manager.close()
@@ -1,6 +1,40 @@
 """Modelos y schemas para MongoDB"""
+import hashlib
+import json
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Iterator
+import numpy as np
+
+# Conversión columnar DataFrame -> documentos: cada columna se castea de una
+# vez y se devuelve como lista de tipos Python nativos (int, str, bool)
+
+def _int_column(series) -> List[int]:
+    return series.astype('int64').tolist()
+
+def _str_column(series) -> List[str]:
+    # Mismo resultado que str(valor) por fila (None -> 'None', NaN -> 'nan')
+    return np.asarray(series.to_numpy(dtype=object), dtype=str).tolist()
+
+def _optional_str_column(series) -> List[Optional[str]]:
+    # str(valor) o None si el valor es falso (None, '', 0), como en from_dataframe_row
+    values = series.to_numpy(dtype=object)
+    strings = np.asarray(values, dtype=str).astype(object)
+    strings[~values.astype(bool)] = None
+    return strings.tolist()
+
+def _bool_column(series) -> List[bool]:
+    return series.astype(bool).tolist()
+
+def _records(columns: Dict[str, List], constants: Dict) -> List[Dict]:
+    """Arma los documentos a partir de columnas ya convertidas"""
+    keys = list(columns) + list(constants)
+    constant_values = tuple(constants.values())
+    return [dict(zip(keys, values + constant_values)) for values in zip(*columns.values())]
+
+def iter_dataframe_batches(df, batch_size: int) -> Iterator:
+    """Recorre un DataFrame en trozos de `batch_size` filas"""
+    for start in range(0, len(df), batch_size):
+        yield df.iloc[start:start + batch_size]
 
 class RawLeagueModel:
     """Modelo para datos raw de ligas"""
@@ -27,9 +61,69 @@ class RawLeagueModel:
             'source': 'football-api-sports'
         }
 
+class RawFixtureModel:
+    """Modelo para datos raw de un partido (un documento por fixture y versión)"""
+    
+    @staticmethod
+    def content_hash(item: Dict) -> str:
+        """
+        Calcula el hash del contenido de un fixture de la API
+        
+        Args:
+            item: Elemento de 'response' del endpoint /fixtures
+            
+        Returns:
+            str: SHA-256 del JSON normalizado (claves ordenadas)
+        """
+        raw = json.dumps(item, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def create(item: Dict, fetched_at: Optional[datetime] = None) -> Dict:
+        """
+        Crea documento para colección raw_fixtures
+        
+        Args:
+            item: Elemento de 'response' del endpoint /fixtures
+            fetched_at: Momento de la descarga (por defecto ahora)
+            
+        Returns:
+            dict: Documento para MongoDB
+        """
+        fixture = item.get('fixture', {})
+        league = item.get('league', {})
+        return {
+            'fixture_id': fixture.get('id'),
+            'content_hash': RawFixtureModel.content_hash(item),
+            'league_id': league.get('id'),
+            'season': league.get('season'),
+            'status': fixture.get('status', {}).get('short'),
+            'fetched_at': fetched_at or datetime.utcnow(),
+            'data': item,
+            'source': 'football-api-sports'
+        }
+
 class FixturesModel:
     """Modelo para datos de fixtures/partidos"""
     
+    # Campos de control que no forman parte del contenido del partido
+    METADATA_FIELDS = ('created_at', 'updated_at', 'content_hash')
+    
+    @staticmethod
+    def content_hash(doc: Dict) -> str:
+        """
+        Calcula el hash del contenido de un documento de fixture
+        
+        Args:
+            doc: Documento de fixtures (se ignoran los campos de control)
+            
+        Returns:
+            str: SHA-256 de los campos de negocio
+        """
+        content = {k: v for k, v in doc.items() if k not in FixturesModel.METADATA_FIELDS}
+        raw = json.dumps(content, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
     @staticmethod
     def from_dataframe_row(row: Dict) -> Dict:
         """
@@ -62,10 +156,39 @@ class FixturesModel:
         }
     
     @staticmethod
-    def bulk_from_dataframe(df) -> List[Dict]:
-        """Convierte DataFrame completo a lista de documentos"""
-        return [FixturesModel.from_dataframe_row(row) 
-                for row in df.to_dict('records')]
+    def bulk_from_dataframe(df, timestamp: Optional[datetime] = None) -> List[Dict]:
+        """
+        Convierte DataFrame completo a lista de documentos
+        
+        Los campos se convierten por columna (no fila a fila) y todos los
+        documentos comparten el mismo created_at/updated_at.
+        
+        Args:
+            df: DataFrame de pandas con fixtures
+            timestamp: Marca de tiempo del lote (por defecto ahora)
+            
+        Returns:
+            list: Lista de documentos para MongoDB
+        """
+        timestamp = timestamp or datetime.utcnow()
+        columns = {
+            'id_partido': _int_column(df['id_partido']),
+            'equipo_local': _str_column(df['equipo_local']),
+            'equipo_visitante': _str_column(df['equipo_visitante']),
+            'id_equipo_local': _int_column(df['id_equipo_local']),
+            'id_equipo_visitante': _int_column(df['id_equipo_visitante']),
+            'estado_del_partido': _str_column(df['estado_del_partido']),
+            'fecha': _optional_str_column(df['fecha']),
+            'hora': _optional_str_column(df['hora']),
+            'goles_local_1MT': _str_column(df['goles_local_1MT']),
+            'goles_local_TR': _str_column(df['goles_local_TR']),
+            'goles_visitante_1MT': _str_column(df['goles_visitante_1MT']),
+            'goles_visitante_TR': _str_column(df['goles_visitante_TR']),
+            'liga_id': _int_column(df['liga_id']),
+            'liga_nombre': _str_column(df['liga_nombre']),
+            'ronda': _str_column(df['ronda']),
+        }
+        return _records(columns, {'created_at': timestamp, 'updated_at': timestamp})
 
 class CleanLeagueModel:
     """Modelo para datos limpios de ligas"""
@@ -94,15 +217,29 @@ class CleanLeagueModel:
         }
     
     @staticmethod
-    def bulk_from_dataframe(df) -> List[Dict]:
+    def bulk_from_dataframe(df, timestamp: Optional[datetime] = None) -> List[Dict]:
         """
         Convierte DataFrame completo a lista de documentos
         
+        Los campos se convierten por columna (no fila a fila) y todos los
+        documentos comparten el mismo created_at.
+        
         Args:
             df: DataFrame de pandas
+            timestamp: Marca de tiempo del lote (por defecto ahora)
             
         Returns:
             list: Lista de documentos para MongoDB
         """
-        return [CleanLeagueModel.from_dataframe_row(row) 
-                for row in df.to_dict('records')]
+        timestamp = timestamp or datetime.utcnow()
+        columns = {
+            'league_id': _int_column(df['league_id']),
+            'league_name': _str_column(df['league_name']),
+            'type': _str_column(df['type']),
+            'country': _str_column(df['country']),
+            'season': _int_column(df['season']),
+            'start': _optional_str_column(df['start']),
+            'end': _optional_str_column(df['end']),
+            'current': _bool_column(df['current']),
+        }
+        return _records(columns, {'created_at': timestamp})
@@ -1,12 +1,170 @@
 """Repositorios para operaciones CRUD en MongoDB"""
+import base64
+import json
 import logging
-from typing import List, Dict, Optional
-from datetime import datetime
-from .connection import get_db
-from .models import RawLeagueModel, CleanLeagueModel, FixturesModel
+import os
+import threading
+import time
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+from pymongo import UpdateOne, ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from .connection import get_db, ensure_clean_leagues_unique_index
+from .models import RawLeagueModel, CleanLeagueModel, FixturesModel, RawFixtureModel, iter_dataframe_batches
 
 logger = logging.getLogger(__name__)
 
+# Claves de orden (y de cursor) de los listados; respaldadas por índices compuestos
+LEAGUES_SORT = [('league_id', 1), ('season', 1)]
+FIXTURES_SORT = [('fecha', -1), ('id_partido', -1)]
+
+# Vida (seg) de los conteos cacheados de colecciones sin filtro
+COUNT_CACHE_TTL = int(os.getenv('COUNT_CACHE_TTL', 60))
+
+_count_cache = {}
+_count_cache_lock = threading.Lock()
+
+def _cached_count(collection, query: Optional[Dict] = None) -> int:
+    """
+    Cuenta los documentos que cumplen un filtro, cacheando el resultado
+    durante COUNT_CACHE_TTL segundos
+    
+    Sin filtro se usa estimated_document_count (metadatos de la colección).
+    """
+    key = (collection.name, json.dumps(query or {}, sort_keys=True, default=str))
+    now = time.monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(key)
+        if cached and cached[1] > now:
+            return cached[0]
+    
+    if query:
+        total = collection.count_documents(query)
+    else:
+        total = collection.estimated_document_count()
+    with _count_cache_lock:
+        _count_cache[key] = (total, now + COUNT_CACHE_TTL)
+    return total
+
+def invalidate_count_cache(collection_name: Optional[str] = None) -> None:
+    """Descarta conteos cacheados (tras escribir en la colección)"""
+    with _count_cache_lock:
+        if collection_name is None:
+            _count_cache.clear()
+        else:
+            for key in [k for k in _count_cache if k[0] == collection_name]:
+                del _count_cache[key]
+
+def encode_cursor(values: List) -> str:
+    """Codifica los valores de la clave de orden del último documento como cursor opaco"""
+    raw = json.dumps(values, separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor: str, size: int) -> List:
+    """
+    Decodifica un cursor opaco
+    
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError(f"Cursor inválido: {cursor}")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"Cursor inválido: {cursor}")
+    return values
+
+def _keyset_filter(sort: List, values: List) -> Dict:
+    """
+    Construye el filtro "después de `values`" para una clave de orden compuesta
+    
+    Para sort [(a, -1), (b, -1)] y valores [x, y]:
+    {'$or': [{a: {'$lt': x}}, {a: None}, {a: x, b: {'$lt': y}}, {a: x, b: None}]}
+    
+    MongoDB ordena null/ausente antes que cualquier valor, pero $lt/$gt no
+    los comparan: en orden descendente quedan después de cualquier valor
+    (rama {a: None}) y en ascendente antes, así que desde un null solo se
+    sigue por los valores no nulos. Así los fixtures sin fecha también se
+    alcanzan por cursor, al final del recorrido.
+    """
+    branches = []
+    for i, (field, direction) in enumerate(sort):
+        prefix = {f: v for (f, _), v in zip(sort[:i], values[:i])}
+        value = values[i]
+        if value is None:
+            if direction == 1:
+                branches.append({**prefix, field: {'$ne': None}})
+            continue
+        branches.append({**prefix, field: {'$gt' if direction == 1 else '$lt': value}})
+        if direction == -1:
+            branches.append({**prefix, field: None})
+    return {'$or': branches}
+
+def _projection(fields: Optional[List[str]], sort: List) -> Optional[Dict]:
+    """Proyección con los campos pedidos más la clave de orden (para el cursor)"""
+    if fields is None:
+        return None
+    projection = {'_id': 0}
+    projection.update({field: 1 for field in fields})
+    projection.update({field: 1 for field, _ in sort})
+    return projection
+
+def _paginate(collection, query: Dict, page: int, limit: int, sort: Optional[List] = None,
+              after: Optional[List] = None, projection: Optional[Dict] = None) -> Tuple[List[Dict], int, bool]:
+    """
+    Obtiene una página y el total de documentos que cumplen el filtro
+    
+    Con `after` (valores de la clave de orden del último documento visto)
+    la página se lee por keyset sobre el índice compuesto de `sort`, sin
+    skip, y el total es el conteo cacheado del filtro. Si no, página y
+    total salen de una sola agregación ($facet); sin filtro, el total es el
+    conteo cacheado de la colección. Con `projection` solo se leen esos
+    campos. Se lee un documento de más para saber si hay página siguiente.
+    
+    Returns:
+        tuple: (documentos de la página, total, hay más páginas)
+    """
+    skip = (page - 1) * limit
+    
+    if after is not None:
+        keyset = _keyset_filter(sort, after)
+        cursor = collection.find({'$and': [query, keyset]} if query else keyset, projection)
+        items = list(cursor.sort(sort).limit(limit + 1))
+        total = _cached_count(collection, query)
+    elif not query:
+        cursor = collection.find({}, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        items = list(cursor.skip(skip).limit(limit + 1))
+        total = _cached_count(collection)
+    else:
+        pipeline = [{'$match': query}]
+        if sort:
+            pipeline.append({'$sort': dict(sort)})
+        pipeline.append({'$facet': {
+            'items': [{'$skip': skip}, {'$limit': limit + 1}] + ([{'$project': projection}] if projection else []),
+            'total': [{'$count': 'count'}]
+        }})
+        result = next(collection.aggregate(pipeline), {'items': [], 'total': []})
+        items = result['items']
+        total = result['total'][0]['count'] if result['total'] else 0
+    
+    has_more = len(items) > limit
+    items = items[:limit]
+    
+    if projection is None or projection.get('_id', 1):
+        for item in items:
+            item['_id'] = str(item['_id'])
+    
+    return items, total, has_more
+
+def _next_cursor(items: List[Dict], has_more: bool, sort: List) -> Optional[str]:
+    """Cursor para la página siguiente (None si es la última)"""
+    if not has_more or not items:
+        return None
+    return encode_cursor([items[-1].get(field) for field, _ in sort])
+
 class LeagueRepository:
     """Repositorio para operaciones con ligas"""
     
@@ -14,6 +172,7 @@ class LeagueRepository:
         self.db = get_db()
         self.raw_collection = self.db.raw_leagues if self.db is not None else None
         self.clean_collection = self.db.clean_leagues if self.db is not None else None
+        self.stats_collection = self.db.dataset_stats if self.db is not None else None
     
     def is_available(self) -> bool:
         """Verifica si MongoDB está disponible"""
@@ -65,40 +224,109 @@ class LeagueRepository:
     
     # === CLEAN DATA OPERATIONS ===
     
-    def save_clean_batch(self, df, batch_size: int = 1000) -> int:
+    def save_clean_batch(self, df, batch_size: int = 1000) -> Dict:
         """
-        Guarda DataFrame limpio en MongoDB por lotes
+        Guarda DataFrame limpio en MongoDB por lotes (upsert por league_id + season)
+        
+        Volver a cargar el mismo catálogo no duplica ligas: cada lote es un
+        bulk_write desordenado de upserts sobre la clave natural.
         
         Args:
             df: DataFrame de pandas
             batch_size: Tamaño de lote para inserción
             
         Returns:
-            int: Número de documentos insertados
+            dict: Contadores {'inserted', 'updated', 'unchanged', 'errors'}
         """
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'errors': 0}
         if not self.is_available():
-            return 0
+            counts['errors'] = len(df)
+            return counts
         
         try:
-            # Limpiar colección antes de insertar nuevos datos
-            # self.clean_collection.delete_many({})  # Comentado para no perder datos históricos
-            
-            documents = CleanLeagueModel.bulk_from_dataframe(df)
-            total_inserted = 0
+            # Una sola fila por liga/temporada (la última)
+            df = df.drop_duplicates(subset=['league_id', 'season'], keep='last')
+            timestamp = datetime.utcnow()
             
-            # Insertar por lotes
-            for i in range(0, len(documents), batch_size):
-                batch = documents[i:i + batch_size]
-                result = self.clean_collection.insert_many(batch, ordered=False)
-                total_inserted += len(result.inserted_ids)
-                logger.info(f"  Lote {i//batch_size + 1}: {len(batch)} documentos insertados")
+            # Upsert por lotes (documentos construidos por columnas, lote a lote)
+            for batch_number, chunk in enumerate(iter_dataframe_batches(df, batch_size), 1):
+                batch = CleanLeagueModel.bulk_from_dataframe(chunk, timestamp)
+                operations = [
+                    UpdateOne(
+                        {'league_id': doc['league_id'], 'season': doc['season']},
+                        {
+                            '$set': {k: v for k, v in doc.items() if k != 'created_at'},
+                            '$setOnInsert': {'created_at': doc['created_at']}
+                        },
+                        upsert=True
+                    )
+                    for doc in batch
+                ]
+                result = self.clean_collection.bulk_write(operations, ordered=False)
+                counts['inserted'] += result.upserted_count
+                counts['updated'] += result.modified_count
+                counts['unchanged'] += result.matched_count - result.modified_count
+                logger.info(f"  Lote {batch_number}: {len(batch)} ligas procesadas")
             
-            logger.info(f"✓ Total guardado en MongoDB: {total_inserted} documentos")
-            return total_inserted
+            if counts['inserted'] or counts['updated']:
+                invalidate_count_cache(self.clean_collection.name)
+            logger.info(
+                f"✓ Ligas en MongoDB: {counts['inserted']} insertadas, "
+                f"{counts['updated']} actualizadas, {counts['unchanged']} sin cambios"
+            )
+            return counts
             
         except Exception as e:
             logger.error(f"Error guardando clean data en MongoDB: {str(e)}")
-            return 0
+            counts['errors'] = len(df) - counts['inserted'] - counts['updated'] - counts['unchanged']
+            return counts
+    
+    def compact_duplicates(self, dry_run: bool = False, batch_size: int = 1000) -> Dict:
+        """
+        Elimina copias repetidas de ligas (misma league_id + season), dejando
+        la más reciente, y crea el índice único sobre la clave natural
+        
+        Args:
+            dry_run: Solo contar, sin borrar
+            batch_size: IDs por delete_many
+            
+        Returns:
+            dict: duplicated_keys, removed, remaining
+        """
+        summary = {'duplicated_keys': 0, 'removed': 0, 'remaining': 0}
+        if not self.is_available():
+            return summary
+        
+        cursor = self.clean_collection.aggregate([
+            {'$sort': {'created_at': -1, '_id': -1}},
+            {'$group': {
+                '_id': {'league_id': '$league_id', 'season': '$season'},
+                'ids': {'$push': '$_id'},
+                'count': {'$sum': 1}
+            }},
+            {'$match': {'count': {'$gt': 1}}}
+        ], allowDiskUse=True)
+        
+        to_delete = []
+        for group in cursor:
+            summary['duplicated_keys'] += 1
+            # El primero es el más reciente: se conserva
+            to_delete.extend(group['ids'][1:])
+        
+        if not dry_run:
+            for i in range(0, len(to_delete), batch_size):
+                result = self.clean_collection.delete_many({'_id': {'$in': to_delete[i:i + batch_size]}})
+                summary['removed'] += result.deleted_count
+            
+            ensure_clean_leagues_unique_index(self.db)
+            invalidate_count_cache(self.clean_collection.name)
+        
+        summary['remaining'] = self.clean_collection.count_documents({})
+        logger.info(
+            f"✓ Compactación de ligas: {summary['duplicated_keys']} claves duplicadas, "
+            f"{summary['removed']} documentos eliminados, {summary['remaining']} restantes"
+        )
+        return summary
     
     def get_all_leagues(self, page: int = 1, limit: int = 50) -> List[Dict]:
         """
@@ -168,37 +396,101 @@ class LeagueRepository:
             logger.error(f"Error filtrando por temporada: {str(e)}")
             return []
     
+    def get_leagues_page(self, country: Optional[str] = None, season: Optional[int] = None,
+                         page: int = 1, limit: int = 50, cursor: Optional[str] = None,
+                         fields: Optional[List[str]] = None) -> Tuple[List[Dict], int, Optional[str]]:
+        """
+        Obtiene una página de ligas (orden league_id, season) y el total que
+        cumple los filtros
+        
+        Args:
+            country: Filtrar por país (opcional)
+            season: Filtrar por temporada (opcional)
+            page: Número de página (inicia en 1); se ignora si hay cursor
+            limit: Registros por página
+            cursor: Cursor opaco de la página anterior (next_cursor)
+            fields: Campos a devolver (proyección, sin _id); None = documento completo
+            
+        Returns:
+            tuple: (lista de ligas, total, cursor de la página siguiente o None)
+            
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        after = decode_cursor(cursor, len(LEAGUES_SORT)) if cursor else None
+        
+        if not self.is_available():
+            return [], 0, None
+        
+        query = {}
+        if country is not None:
+            query['country'] = country
+        if season is not None:
+            query['season'] = season
+        
+        try:
+            items, total, has_more = _paginate(self.clean_collection, query, page, limit, LEAGUES_SORT, after,
+                                               _projection(fields, LEAGUES_SORT))
+            return items, total, _next_cursor(items, has_more, LEAGUES_SORT)
+        except Exception as e:
+            logger.error(f"Error paginando ligas: {str(e)}")
+            return [], 0, None
+    
     def count_leagues(self) -> int:
         """Cuenta total de ligas en la base de datos"""
         if not self.is_available():
             return 0
         
         try:
-            return self.clean_collection.count_documents({})
+            return _cached_count(self.clean_collection)
         except Exception as e:
             logger.error(f"Error contando documentos: {str(e)}")
             return 0
     
-    def get_stats(self) -> Dict:
-        """Obtiene estadísticas de la base de datos"""
+    def refresh_stats(self) -> Dict:
+        """
+        Recalcula las estadísticas de ligas y las guarda materializadas en
+        dataset_stats (se llama tras cada carga de datos limpios)
+        
+        Returns:
+            dict: Estadísticas calculadas
+        """
         if not self.is_available():
             return {}
         
         try:
-            total = self.clean_collection.count_documents({})
-            
-            # Países únicos
-            countries = self.clean_collection.distinct('country')
-            
-            # Temporadas únicas
-            seasons = self.clean_collection.distinct('season')
+            result = next(self.clean_collection.aggregate([{'$facet': {
+                'total': [{'$count': 'count'}],
+                'countries': [{'$group': {'_id': '$country'}}],
+                'seasons': [{'$group': {'_id': '$season'}}]
+            }}]))
             
-            return {
-                'total_leagues': total,
+            countries = sorted(d['_id'] for d in result['countries'] if d['_id'] is not None)
+            stats = {
+                'total_leagues': result['total'][0]['count'] if result['total'] else 0,
                 'countries': len(countries),
-                'seasons': sorted(seasons),
-                'country_list': sorted(countries)
+                'seasons': sorted(d['_id'] for d in result['seasons'] if d['_id'] is not None),
+                'country_list': countries
             }
+            
+            self.stats_collection.replace_one(
+                {'_id': 'leagues'},
+                {**stats, 'updated_at': datetime.utcnow()},
+                upsert=True
+            )
+            return stats
+        except Exception as e:
+            logger.error(f"Error recalculando stats: {str(e)}")
+            return {}
+    
+    def get_stats(self) -> Dict:
+        """Obtiene estadísticas de la base de datos (documento materializado)"""
+        if not self.is_available():
+            return {}
+        
+        try:
+            stats = self.stats_collection.find_one({'_id': 'leagues'}, {'_id': 0, 'updated_at': 0})
+            return stats if stats is not None else self.refresh_stats()
         except Exception as e:
             logger.error(f"Error obteniendo stats: {str(e)}")
             return {}
@@ -209,6 +501,7 @@ class FixturesRepository:
     def __init__(self):
         self.db = get_db()
         self.collection = self.db.fixtures if self.db is not None else None
+        self.stats_collection = self.db.dataset_stats if self.db is not None else None
     
     def is_available(self) -> bool:
         """Verifica si MongoDB está disponible"""
@@ -217,136 +510,562 @@ class FixturesRepository:
         except:
             return False
     
-    def save_fixtures_batch(self, df, batch_size: int = 1000) -> int:
+    def save_fixtures_batch(self, df, batch_size: int = 1000) -> Dict:
         """
-        Guarda fixtures en MongoDB por lotes
+        Guarda fixtures en MongoDB por lotes (upsert por id_partido)
+        
+        Cada lote se escribe con un único bulk_write desordenado. Los
+        fixtures cuyo contenido no cambió (mismo content_hash) no se
+        escriben; created_at solo se fija al insertar.
         
         Args:
             df: DataFrame de pandas con fixtures
             batch_size: Tamaño de lote
             
         Returns:
-            int: Número de documentos insertados
+            dict: Contadores {'inserted', 'updated', 'unchanged', 'errors'}
         """
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'errors': 0}
         if not self.is_available():
-            return 0
+            counts['errors'] = len(df)
+            return counts
         
         try:
-            documents = FixturesModel.bulk_from_dataframe(df)
-            total_inserted = 0
+            # Una sola fila por id_partido (la última), para que los
+            # upserts de un lote desordenado no compitan entre sí
+            df = df.drop_duplicates(subset='id_partido', keep='last')
+            timestamp = datetime.utcnow()
             
-            # Insertar por lotes
-            for i in range(0, len(documents), batch_size):
-                batch = documents[i:i + batch_size]
+            for batch_number, chunk in enumerate(iter_dataframe_batches(df, batch_size), 1):
+                batch = FixturesModel.bulk_from_dataframe(chunk, timestamp)
                 
-                # Usar update_many con upsert para evitar duplicados
+                # Hashes actuales de los fixtures del lote (una sola consulta)
+                ids = [doc['id_partido'] for doc in batch]
+                existing = {
+                    d['id_partido']: d.get('content_hash')
+                    for d in self.collection.find(
+                        {'id_partido': {'$in': ids}},
+                        {'_id': 0, 'id_partido': 1, 'content_hash': 1}
+                    )
+                }
+                
+                operations = []
                 for doc in batch:
-                    self.collection.update_one(
+                    content_hash = FixturesModel.content_hash(doc)
+                    if existing.get(doc['id_partido']) == content_hash:
+                        counts['unchanged'] += 1
+                        continue
+                    
+                    content = {k: v for k, v in doc.items() if k not in FixturesModel.METADATA_FIELDS}
+                    operations.append(UpdateOne(
                         {'id_partido': doc['id_partido']},
-                        {'$set': doc},
+                        {
+                            '$set': {**content, 'content_hash': content_hash, 'updated_at': doc['updated_at']},
+                            '$setOnInsert': {'created_at': doc['created_at']}
+                        },
                         upsert=True
-                    )
-                    total_inserted += 1
+                    ))
+                
+                if operations:
+                    try:
+                        result = self.collection.bulk_write(operations, ordered=False)
+                        counts['inserted'] += result.upserted_count
+                        counts['updated'] += result.modified_count
+                        counts['unchanged'] += result.matched_count - result.modified_count
+                    except BulkWriteError as bwe:
+                        # Las operaciones sin error se aplicaron igualmente
+                        details = bwe.details
+                        counts['inserted'] += details.get('nUpserted', 0)
+                        counts['updated'] += details.get('nModified', 0)
+                        counts['unchanged'] += details.get('nMatched', 0) - details.get('nModified', 0)
+                        counts['errors'] += len(details.get('writeErrors', []))
+                        logger.error(f"  {len(details.get('writeErrors', []))} fixtures con error en el lote")
                 
-                logger.info(f"  Lote {i//batch_size + 1}: {len(batch)} fixtures procesados")
+                logger.info(
+                    f"  Lote {batch_number}: {len(batch)} fixtures procesados "
+                    f"({len(operations)} escritos)"
+                )
             
-            logger.info(f"✓ Total guardado en MongoDB: {total_inserted} fixtures")
-            return total_inserted
+            if counts['inserted'] or counts['updated']:
+                invalidate_count_cache(self.collection.name)
+            logger.info(
+                f"✓ Fixtures en MongoDB: {counts['inserted']} insertados, "
+                f"{counts['updated']} actualizados, {counts['unchanged']} sin cambios"
+            )
+            return counts
             
         except Exception as e:
             logger.error(f"Error guardando fixtures en MongoDB: {str(e)}")
+            counts['errors'] = len(df) - counts['inserted'] - counts['updated'] - counts['unchanged']
+            return counts
+    
+    def get_fixtures_page(self, league_id: Optional[int] = None, team_id: Optional[int] = None,
+                          start_date: Optional[str] = None, end_date: Optional[str] = None,
+                          page: int = 1, limit: int = 50, cursor: Optional[str] = None,
+                          fields: Optional[List[str]] = None) -> Tuple[List[Dict], int, Optional[str]]:
+        """
+        Obtiene una página de fixtures (más recientes primero, orden fecha,
+        id_partido) y el total que cumple los filtros
+        
+        Args:
+            league_id: Filtrar por liga (opcional)
+            team_id: Filtrar por equipo local o visitante (opcional)
+            start_date: Fecha mínima YYYY-MM-DD (opcional)
+            end_date: Fecha máxima YYYY-MM-DD (opcional)
+            page: Número de página (inicia en 1); se ignora si hay cursor
+            limit: Registros por página
+            cursor: Cursor opaco de la página anterior (next_cursor)
+            fields: Campos a devolver (proyección, sin _id); None = documento completo
+            
+        Returns:
+            tuple: (lista de fixtures, total, cursor de la página siguiente o None)
+            
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        after = decode_cursor(cursor, len(FIXTURES_SORT)) if cursor else None
+        
+        if not self.is_available():
+            return [], 0, None
+        
+        query = {}
+        if league_id is not None:
+            query['liga_id'] = league_id
+        if team_id is not None:
+            query['$or'] = [
+                {'id_equipo_local': team_id},
+                {'id_equipo_visitante': team_id}
+            ]
+        if start_date is not None or end_date is not None:
+            query['fecha'] = {}
+            if start_date is not None:
+                query['fecha']['$gte'] = start_date
+            if end_date is not None:
+                query['fecha']['$lte'] = end_date
+        
+        try:
+            items, total, has_more = _paginate(self.collection, query, page, limit, FIXTURES_SORT, after,
+                                               _projection(fields, FIXTURES_SORT))
+            return items, total, _next_cursor(items, has_more, FIXTURES_SORT)
+        except Exception as e:
+            logger.error(f"Error paginando fixtures: {str(e)}")
+            return [], 0, None
+    
+    def count_fixtures(self) -> int:
+        """Cuenta total de fixtures"""
+        if not self.is_available():
+            return 0
+        
+        try:
+            return _cached_count(self.collection)
+        except Exception as e:
+            logger.error(f"Error contando fixtures: {str(e)}")
             return 0
     
-    def get_fixtures_by_league(self, league_id: int, page: int = 1, limit: int = 50) -> List[Dict]:
-        """Obtiene fixtures de una liga específica"""
+    def refresh_stats(self) -> Dict:
+        """
+        Recalcula las estadísticas de fixtures (incluido el conteo por liga)
+        y las guarda materializadas en dataset_stats
+        
+        Returns:
+            dict: Estadísticas calculadas
+        """
         if not self.is_available():
-            return []
+            return {}
         
         try:
-            skip = (page - 1) * limit
-            cursor = self.collection.find(
-                {'liga_id': league_id}
-            ).sort('fecha', -1).skip(skip).limit(limit)
+            result = next(self.collection.aggregate([{'$facet': {
+                'total': [{'$count': 'count'}],
+                'ligas': [{'$group': {'_id': '$liga_id', 'count': {'$sum': 1}}}],
+                'estados': [{'$group': {'_id': '$estado_del_partido'}}]
+            }}]))
             
-            fixtures = list(cursor)
-            for fixture in fixtures:
-                fixture['_id'] = str(fixture['_id'])
+            por_liga = {d['_id']: d['count'] for d in result['ligas'] if d['_id'] is not None}
+            stats = {
+                'total_fixtures': result['total'][0]['count'] if result['total'] else 0,
+                'total_ligas': len(por_liga),
+                'estados': sorted(d['_id'] for d in result['estados'] if d['_id'] is not None),
+                'ligas': sorted(por_liga),
+                # Claves de documento MongoDB: siempre strings
+                'fixtures_por_liga': {str(liga): count for liga, count in sorted(por_liga.items())}
+            }
             
-            return fixtures
+            self.stats_collection.replace_one(
+                {'_id': 'fixtures'},
+                {**stats, 'updated_at': datetime.utcnow()},
+                upsert=True
+            )
+            return stats
         except Exception as e:
-            logger.error(f"Error obteniendo fixtures: {str(e)}")
-            return []
+            logger.error(f"Error recalculando stats de fixtures: {str(e)}")
+            return {}
     
-    def get_fixtures_by_date_range(self, start_date: str, end_date: str, page: int = 1, limit: int = 50) -> List[Dict]:
-        """Obtiene fixtures en un rango de fechas"""
+    def get_fixtures_stats(self) -> Dict:
+        """Obtiene estadísticas de fixtures (documento materializado)"""
         if not self.is_available():
-            return []
+            return {}
         
         try:
-            skip = (page - 1) * limit
-            cursor = self.collection.find({
-                'fecha': {'$gte': start_date, '$lte': end_date}
-            }).sort('fecha', -1).skip(skip).limit(limit)
+            stats = self.stats_collection.find_one({'_id': 'fixtures'}, {'_id': 0, 'updated_at': 0})
+            return stats if stats is not None else self.refresh_stats()
+        except Exception as e:
+            logger.error(f"Error obteniendo stats: {str(e)}")
+            return {}
+
+class RawFixturesRepository:
+    """Repositorio de datos raw por partido (un documento por fixture y versión)"""
+    
+    def __init__(self):
+        self.db = get_db()
+        self.collection = self.db.raw_fixtures if self.db is not None else None
+    
+    def is_available(self) -> bool:
+        """Verifica si MongoDB está disponible"""
+        try:
+            return self.db is not None and self.collection is not None
+        except:
+            return False
+    
+    def save_raw(self, data: Dict, batch_size: int = 1000) -> Dict:
+        """
+        Guarda una respuesta de /fixtures como un documento por partido
+        
+        Un fixture cuyo contenido no cambió desde la última descarga no se
+        vuelve a insertar (clave única fixture_id + content_hash); solo se
+        actualiza su 'last_seen_at'. La versión vigente de cada partido es
+        la de 'last_seen_at' más reciente (si un partido vuelve a un
+        contenido anterior, esa versión pasa a ser la última).
+        
+        Args:
+            data: Respuesta JSON de la API (endpoint /fixtures)
+            batch_size: Operaciones por bulk_write
             
-            fixtures = list(cursor)
-            for fixture in fixtures:
-                fixture['_id'] = str(fixture['_id'])
+        Returns:
+            dict: Contadores {'inserted', 'unchanged'}
+        """
+        counts = {'inserted': 0, 'unchanged': 0}
+        if not self.is_available():
+            return counts
+        
+        fetched_at = datetime.utcnow()
+        operations = []
+        for item in data.get('response', []):
+            document = RawFixtureModel.create(item, fetched_at)
+            if document['fixture_id'] is None:
+                continue
+            operations.append(UpdateOne(
+                {'fixture_id': document['fixture_id'], 'content_hash': document['content_hash']},
+                {'$setOnInsert': document, '$set': {'last_seen_at': fetched_at}},
+                upsert=True
+            ))
+        
+        try:
+            for i in range(0, len(operations), batch_size):
+                result = self.collection.bulk_write(operations[i:i + batch_size], ordered=False)
+                counts['inserted'] += result.upserted_count
+                counts['unchanged'] += result.matched_count
             
-            return fixtures
+            logger.info(
+                f"✓ Raw fixtures en MongoDB: {counts['inserted']} nuevos, "
+                f"{counts['unchanged']} sin cambios"
+            )
+            return counts
         except Exception as e:
-            logger.error(f"Error obteniendo fixtures por fecha: {str(e)}")
-            return []
+            logger.error(f"Error guardando raw fixtures en MongoDB: {str(e)}")
+            return counts
     
-    def get_fixtures_by_team(self, team_id: int, page: int = 1, limit: int = 50) -> List[Dict]:
-        """Obtiene fixtures de un equipo específico"""
+    def get_latest(self, fixture_id: int) -> Optional[Dict]:
+        """Obtiene la versión raw más reciente de un partido"""
         if not self.is_available():
-            return []
+            return None
         
         try:
-            skip = (page - 1) * limit
-            cursor = self.collection.find({
-                '$or': [
-                    {'id_equipo_local': team_id},
-                    {'id_equipo_visitante': team_id}
-                ]
-            }).sort('fecha', -1).skip(skip).limit(limit)
+            doc = self.collection.find_one(
+                {'fixture_id': fixture_id},
+                {'_id': 0, 'data': 1},
+                sort=[('last_seen_at', -1), ('fetched_at', -1)]
+            )
+            return doc['data'] if doc else None
+        except Exception as e:
+            logger.error(f"Error obteniendo raw fixture: {str(e)}")
+            return None
+    
+    def get_latest_by_league(self, league_id: int, season: int) -> Optional[Dict]:
+        """
+        Reconstruye la respuesta de /fixtures de una liga/temporada con la
+        versión más reciente de cada partido
+        
+        Returns:
+            dict: {'get': 'fixtures', 'response': [...]} (apto para
+                normalize_fixtures) o None
+        """
+        if not self.is_available():
+            return None
+        
+        try:
+            cursor = self.collection.aggregate([
+                {'$match': {'league_id': league_id, 'season': season}},
+                {'$sort': {'fixture_id': 1, 'last_seen_at': -1, 'fetched_at': -1}},
+                {'$group': {'_id': '$fixture_id', 'data': {'$first': '$data'}}},
+                {'$sort': {'_id': 1}}
+            ])
+            items = [doc['data'] for doc in cursor]
+            return {
+                'get': 'fixtures',
+                'parameters': {'league': str(league_id), 'season': str(season)},
+                'results': len(items),
+                'response': items
+            }
+        except Exception as e:
+            logger.error(f"Error reconstruyendo raw fixtures: {str(e)}")
+            return None
+
+class SyncWatermarkRepository:
+    """Repositorio de marcas de sincronización incremental de fixtures"""
+    
+    def __init__(self):
+        self.db = get_db()
+        self.collection = self.db.sync_watermarks if self.db is not None else None
+    
+    def is_available(self) -> bool:
+        """Verifica si MongoDB está disponible"""
+        try:
+            return self.db is not None and self.collection is not None
+        except:
+            return False
+    
+    def get_watermark(self, league_id: int, season: int) -> Optional[Dict]:
+        """
+        Obtiene la última marca de sincronización de una liga/temporada
+        
+        Returns:
+            dict: {'last_sync': datetime, 'fixtures': {id: estado}} o None
+        """
+        if not self.is_available():
+            return None
+        
+        try:
+            return self.collection.find_one(
+                {'league_id': league_id, 'season': season},
+                {'_id': 0}
+            )
+        except Exception as e:
+            logger.error(f"Error obteniendo watermark: {str(e)}")
+            return None
+    
+    def save_watermark(self, league_id: int, season: int, last_sync: datetime, fixtures: Dict) -> bool:
+        """
+        Guarda la marca de sincronización de una liga/temporada
+        
+        Args:
+            league_id: ID de la liga
+            season: Temporada
+            last_sync: Momento de la sincronización
+            fixtures: Estado conocido por fixture {str(id): {'status', 'date', 'fingerprint'}}
             
-            fixtures = list(cursor)
-            for fixture in fixtures:
-                fixture['_id'] = str(fixture['_id'])
+        Returns:
+            bool: True si se guardó
+        """
+        if not self.is_available():
+            return False
+        
+        try:
+            self.collection.update_one(
+                {'league_id': league_id, 'season': season},
+                {'$set': {'last_sync': last_sync, 'fixtures': fixtures}},
+                upsert=True
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error guardando watermark: {str(e)}")
+            return False
+
+class FetchLockRepository:
+    """Repositorio de locks entre procesos para requests a la API en curso"""
+    
+    def __init__(self):
+        self.db = get_db()
+        self.collection = self.db.fetch_locks if self.db is not None else None
+    
+    def is_available(self) -> bool:
+        """Verifica si MongoDB está disponible"""
+        try:
+            return self.db is not None and self.collection is not None
+        except:
+            return False
+    
+    def acquire(self, key: str, owner: str, ttl_seconds: int) -> bool:
+        """
+        Intenta tomar el lock de una clave
+        
+        Args:
+            key: Clave del request (endpoint + parámetros)
+            owner: Identificador único del proceso que lo toma
+            ttl_seconds: Vida máxima del lock (por si el dueño muere)
             
-            return fixtures
+        Returns:
+            bool: True si se obtuvo el lock
+        """
+        if not self.is_available():
+            return False
+        
+        now = datetime.utcnow()
+        lock = {'owner': owner, 'acquired_at': now, 'expires_at': now + timedelta(seconds=ttl_seconds)}
+        
+        try:
+            self.collection.insert_one({'_id': key, **lock})
+            return True
+        except DuplicateKeyError:
+            # El lock existe: solo se puede tomar si ya expiró
+            try:
+                result = self.collection.update_one(
+                    {'_id': key, 'expires_at': {'$lt': now}},
+                    {'$set': lock}
+                )
+                return result.modified_count == 1
+            except Exception as e:
+                logger.error(f"Error tomando lock expirado: {str(e)}")
+                return False
         except Exception as e:
-            logger.error(f"Error obteniendo fixtures por equipo: {str(e)}")
-            return []
+            logger.error(f"Error tomando lock: {str(e)}")
+            return False
     
-    def count_fixtures(self) -> int:
-        """Cuenta total de fixtures"""
+    def is_locked(self, key: str) -> bool:
+        """Verifica si hay un lock vigente para la clave"""
         if not self.is_available():
-            return 0
+            return False
         
         try:
-            return self.collection.count_documents({})
+            return self.collection.count_documents(
+                {'_id': key, 'expires_at': {'$gte': datetime.utcnow()}},
+                limit=1
+            ) > 0
         except Exception as e:
-            logger.error(f"Error contando fixtures: {str(e)}")
-            return 0
+            logger.error(f"Error consultando lock: {str(e)}")
+            return False
     
-    def get_fixtures_stats(self) -> Dict:
-        """Obtiene estadísticas de fixtures"""
+    def release(self, key: str, owner: str) -> None:
+        """Libera el lock si pertenece a `owner`"""
         if not self.is_available():
-            return {}
+            return
+        
+        try:
+            self.collection.delete_one({'_id': key, 'owner': owner})
+        except Exception as e:
+            logger.error(f"Error liberando lock: {str(e)}")
+
+class BackfillCheckpointRepository:
+    """Repositorio de checkpoints de cargas históricas (backfill)"""
+    
+    def __init__(self):
+        self.db = get_db()
+        self.collection = self.db.backfill_checkpoints if self.db is not None else None
+    
+    def is_available(self) -> bool:
+        """Verifica si MongoDB está disponible"""
+        try:
+            return self.db is not None and self.collection is not None
+        except:
+            return False
+    
+    def get_completed(self) -> set:
+        """
+        Obtiene las unidades liga/temporada ya completadas
+        
+        Returns:
+            set: Conjunto de tuplas (league_id, season)
+        """
+        if not self.is_available():
+            return set()
+        
+        try:
+            cursor = self.collection.find(
+                {'status': 'done'},
+                {'_id': 0, 'league_id': 1, 'season': 1}
+            )
+            return {(doc['league_id'], doc['season']) for doc in cursor}
+        except Exception as e:
+            logger.error(f"Error obteniendo checkpoints: {str(e)}")
+            return set()
+    
+    def mark_completed(self, league_id: int, season: int, filename: Optional[str]) -> bool:
+        """
+        Registra una unidad liga/temporada como completada
+        
+        Returns:
+            bool: True si se guardó el checkpoint
+        """
+        if not self.is_available():
+            return False
+        
+        try:
+            self.collection.update_one(
+                {'league_id': league_id, 'season': season},
+                {'$set': {
+                    'status': 'done',
+                    'filename': filename,
+                    'completed_at': datetime.utcnow()
+                }},
+                upsert=True
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error guardando checkpoint: {str(e)}")
+            return False
+
+class DatasetVersionRepository:
+    """Repositorio de la versión del dataset limpio (cambia en cada carga)"""
+    
+    def __init__(self):
+        self.db = get_db()
+        self.collection = self.db.dataset_meta if self.db is not None else None
+    
+    def is_available(self) -> bool:
+        """Verifica si MongoDB está disponible"""
+        try:
+            return self.db is not None and self.collection is not None
+        except:
+            return False
+    
+    def get_version(self) -> Optional[int]:
+        """
+        Obtiene la versión actual del dataset
+        
+        Returns:
+            int: Versión (0 si nunca se cargaron datos) o None si no hay MongoDB
+        """
+        if not self.is_available():
+            return None
         
         try:
-            total = self.collection.count_documents({})
-            ligas = self.collection.distinct('liga_id')
-            estados = self.collection.distinct('estado_del_partido')
+            doc = self.collection.find_one({'_id': 'dataset_version'})
+            return doc['version'] if doc else 0
+        except Exception as e:
+            logger.error(f"Error obteniendo versión del dataset: {str(e)}")
+            return None
+    
+    def bump(self, source: str = "") -> Optional[int]:
+        """
+        Incrementa la versión del dataset tras modificar datos limpios
+        
+        Args:
+            source: Origen del cambio (para diagnóstico)
             
-            return {
-                'total_fixtures': total,
-                'total_ligas': len(ligas),
-                'estados': estados,
-                'ligas': ligas
-            }
+        Returns:
+            int: Nueva versión o None si no hay MongoDB
+        """
+        if not self.is_available():
+            return None
+        
+        try:
+            doc = self.collection.find_one_and_update(
+                {'_id': 'dataset_version'},
+                {'$inc': {'version': 1}, '$set': {'updated_at': datetime.utcnow(), 'source': source}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            logger.info(f"✓ Versión del dataset: {doc['version']}")
+            return doc['version']
         except Exception as e:
-            logger.error(f"Error obteniendo stats: {str(e)}")
-            return {}
+            logger.error(f"Error actualizando versión del dataset: {str(e)}")
+            return None
@@ -0,0 +1,118 @@
+"""Extracción concurrente de fixtures para múltiples ligas/temporadas"""
+import asyncio
+import time
+from .config import FETCH_CONCURRENCY
+from .fixtures_client import fetch_fixtures
+from .delta_sync import fetch_fixtures_delta, commit_watermark
+from .quota import PRIORITY_DEFAULT
+from .save_raw import save_raw
+from .logger import get_logger
+
+logger = get_logger()
+
+
+async def _fetch_and_save(league_id, season, semaphore, priority, delta):
+    """
+    Extrae y guarda los fixtures de una liga/temporada.
+
+    El cliente HTTP es bloqueante, por lo que la llamada y el guardado
+    se ejecutan en hilos del executor por defecto. El ritmo de requests
+    lo regula el QuotaScheduler compartido del cliente.
+
+    Returns:
+        dict: Resultado de la unidad (league_id, season, filename, error)
+    """
+    result = {"league_id": league_id, "season": season, "filename": None, "error": None}
+
+    async with semaphore:
+        try:
+            watermark = None
+            if delta:
+                data, watermark = await asyncio.to_thread(
+                    fetch_fixtures_delta, league_id, season, priority
+                )
+            else:
+                data = await asyncio.to_thread(fetch_fixtures, league_id, season, priority)
+
+            if data is None:
+                result["error"] = "No se obtuvieron datos"
+                return result
+
+            if delta and not data.get("response"):
+                await asyncio.to_thread(commit_watermark, league_id, season, watermark)
+                return result
+
+            # Guardar en cuanto llega, sin esperar al resto de ligas
+            result["filename"] = await asyncio.to_thread(
+                save_raw,
+                data,
+                f"fixtures_{league_id}_{season}",
+                country=f"league_{league_id}",
+                season=season
+            )
+            if not result["filename"]:
+                result["error"] = "Error al guardar datos"
+            else:
+                await asyncio.to_thread(commit_watermark, league_id, season, watermark)
+        except Exception as e:
+            logger.error(f"✗ Liga {league_id}, temporada {season}: {str(e)}")
+            result["error"] = str(e)
+
+    return result
+
+
+async def fetch_fixtures_many_async(pairs, concurrency=None, priority=PRIORITY_DEFAULT, delta=False,
+                                    on_result=None):
+    """
+    Extrae fixtures de varias ligas/temporadas de forma concurrente.
+
+    Args:
+        pairs: Iterable de tuplas (league_id, season)
+        concurrency: Máximo de requests simultáneos (por defecto FETCH_CONCURRENCY)
+        priority: Prioridad en la cuota diaria para todas las unidades
+        delta: Si True, usa sincronización incremental por liga
+        on_result: Función opcional llamada (en un hilo) con el resultado de
+            cada unidad en cuanto termina, ej: para guardar checkpoints
+
+    Returns:
+        list: Resultados por unidad, en el orden en que terminaron
+    """
+    pairs = list(dict.fromkeys((int(l), int(s)) for l, s in pairs))
+    concurrency = concurrency or FETCH_CONCURRENCY
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    logger.info(
+        f"Extrayendo {len(pairs)} ligas/temporadas (concurrencia={concurrency})"
+    )
+    start = time.monotonic()
+
+    tasks = [
+        asyncio.create_task(_fetch_and_save(league_id, season, semaphore, priority, delta))
+        for league_id, season in pairs
+    ]
+
+    results = []
+    for task in asyncio.as_completed(tasks):
+        result = await task
+        results.append(result)
+        if on_result is not None:
+            await asyncio.to_thread(on_result, result)
+        if result["error"] is None:
+            logger.info(
+                f"✓ [{len(results)}/{len(pairs)}] Liga {result['league_id']}, "
+                f"temporada {result['season']} guardada"
+            )
+
+    failed = sum(1 for r in results if r["error"] is not None)
+    logger.info(
+        f"Extracción concurrente finalizada en {time.monotonic() - start:.2f}s: "
+        f"{len(results) - failed} OK, {failed} con error"
+    )
+    return results
+
+
+def fetch_fixtures_many(pairs, concurrency=None, priority=PRIORITY_DEFAULT, delta=False,
+                        on_result=None):
+    """Versión síncrona de fetch_fixtures_many_async para scripts CLI"""
+    return asyncio.run(fetch_fixtures_many_async(pairs, concurrency, priority, delta, on_result))
@@ -0,0 +1,186 @@
+"""Planificador de cargas históricas (backfill) con checkpoints en MongoDB"""
+import math
+from .config import QUOTA_RESERVE_BACKFILL
+from .async_fixtures import fetch_fixtures_many
+from .http_client import get_client
+from .quota import PRIORITY_BACKFILL
+from .logger import get_logger
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from src.database.repositories import BackfillCheckpointRepository
+
+logger = get_logger()
+
+
+def build_units(league_ids, seasons):
+    """
+    Construye la matriz de unidades liga × temporada.
+
+    Args:
+        league_ids: Iterable de IDs de liga
+        seasons: Iterable de temporadas
+
+    Returns:
+        list: Tuplas (league_id, season), de la temporada más reciente a la
+            más antigua para tener antes los datos más útiles
+    """
+    return [
+        (int(league_id), int(season))
+        for season in sorted({int(s) for s in seasons}, reverse=True)
+        for league_id in dict.fromkeys(int(l) for l in league_ids)
+    ]
+
+
+def daily_backfill_budget(scheduler=None):
+    """
+    Requests diarios disponibles para backfill (cuota menos la reserva).
+
+    Returns:
+        int: Requests por día
+    """
+    scheduler = scheduler or get_client().scheduler
+    return max(int(scheduler.daily_limit * (1 - QUOTA_RESERVE_BACKFILL)), 1)
+
+
+def today_backfill_budget(scheduler=None):
+    """
+    Requests que el backfill aún puede hacer hoy, según la cuota restante
+    informada por la API.
+
+    Returns:
+        int | None: Requests disponibles hoy, o None si aún no se conoce
+    """
+    scheduler = scheduler or get_client().scheduler
+    return scheduler.available_today(PRIORITY_BACKFILL)
+
+
+def plan_backfill(units, completed=None, cache=None, daily_budget=None, today_budget=None):
+    """
+    Estima el coste en cuota de un backfill y lo reparte por días.
+
+    Cada unidad pendiente cuesta un request a /fixtures (la API devuelve la
+    temporada completa), salvo que su respuesta ya esté en la caché.
+
+    Args:
+        units: Lista de tuplas (league_id, season)
+        completed: Conjunto de unidades ya completadas (checkpoints)
+        cache: ResponseCache para descontar unidades ya cacheadas
+        daily_budget: Requests por día disponibles para backfill
+        today_budget: Requests que quedan hoy (por defecto daily_budget)
+
+    Returns:
+        dict: pending, cached, cost, daily_budget, to_fetch (unidades no
+            cacheadas, en orden) y days (lista de listas de unidades, una
+            por día; la primera se ajusta a today_budget)
+    """
+    completed = completed or set()
+    daily_budget = daily_budget or daily_backfill_budget()
+    if today_budget is None:
+        today_budget = daily_budget
+
+    pending = [unit for unit in units if unit not in completed]
+    cached = [
+        unit for unit in pending
+        if cache is not None
+        and cache.contains("fixtures", {"league": unit[0], "season": unit[1]})
+    ]
+    cached_set = set(cached)
+    to_fetch = [unit for unit in pending if unit not in cached_set]
+
+    # Las unidades cacheadas no consumen cuota: van todas el primer día
+    later = to_fetch[today_budget:]
+    days = [cached + to_fetch[:today_budget]]
+    days += [later[i:i + daily_budget] for i in range(0, len(later), daily_budget)]
+    if not days[0] and len(days) == 1:
+        days = []
+
+    return {
+        "total": len(units),
+        "completed": len(units) - len(pending),
+        "pending": pending,
+        "cached": len(cached),
+        "cost": len(to_fetch),
+        "daily_budget": daily_budget,
+        "to_fetch": to_fetch,
+        "days": days,
+        "estimated_days": (1 if to_fetch[:today_budget] else 0) + math.ceil(len(later) / daily_budget),
+    }
+
+
+def run_backfill(units, concurrency=None, max_units=None):
+    """
+    Ejecuta (o reanuda) un backfill guardando un checkpoint por unidad.
+
+    Solo se procesa la porción del plan que cabe en la cuota que queda hoy
+    (informada por la API); las unidades restantes quedan pendientes para
+    la siguiente ejecución. Una unidad solo cuenta como hecha si su
+    checkpoint se guardó.
+
+    Args:
+        units: Lista de tuplas (league_id, season)
+        concurrency: Unidades simultáneas (por defecto FETCH_CONCURRENCY)
+        max_units: Tope opcional de unidades en esta ejecución
+
+    Returns:
+        dict: Resumen con done, failed y remaining
+    """
+    repo = BackfillCheckpointRepository()
+    if not repo.is_available():
+        logger.warning("MongoDB no disponible - el backfill no podrá reanudarse")
+
+    client = get_client()
+    completed = repo.get_completed()
+    plan = plan_backfill(units, completed, client.cache, today_budget=today_backfill_budget(client.scheduler))
+
+    logger.info(
+        f"Backfill: {plan['total']} unidades, {plan['completed']} ya completadas, "
+        f"{len(plan['pending'])} pendientes ({plan['cached']} en caché), "
+        f"coste estimado {plan['cost']} requests en {plan['estimated_days']} días "
+        f"({plan['daily_budget']}/día)"
+    )
+
+    if not plan["pending"]:
+        logger.info("✓ Backfill completo - nada pendiente")
+        return {"done": 0, "failed": 0, "remaining": 0}
+
+    pending = plan["pending"]
+    done = []
+    failed = []
+
+    def checkpoint(result):
+        unit = (result["league_id"], result["season"])
+        if result["error"] is not None:
+            failed.append(unit)
+        elif repo.mark_completed(unit[0], unit[1], result["filename"]):
+            done.append(unit)
+        else:
+            logger.warning(f"Checkpoint de {unit[0]}:{unit[1]} no guardado - se repetirá")
+
+    def fetch(batch):
+        fetch_fixtures_many(batch, concurrency=concurrency, priority=PRIORITY_BACKFILL, on_result=checkpoint)
+
+    max_units = len(plan["pending"]) if max_units is None else max_units
+    if today_backfill_budget(client.scheduler) is None and plan["to_fetch"] and max_units > 0:
+        # La cuota restante de hoy se conoce con la primera respuesta: se
+        # pide una unidad y el resto se planifica con la cuota real
+        logger.info("Cuota restante desconocida - consultando una unidad primero")
+        fetch(plan["to_fetch"][:1])
+        max_units -= 1
+        completed = completed | set(plan["to_fetch"][:1])
+        plan = plan_backfill(units, completed, client.cache, today_budget=today_backfill_budget(client.scheduler))
+
+    batch = (plan["days"][0] if plan["days"] else [])[:max_units]
+    if batch:
+        fetch(batch)
+    elif plan["to_fetch"]:
+        logger.info("Cuota de backfill de hoy agotada")
+
+    remaining = len(set(pending) - set(done))
+
+    logger.info(
+        f"Backfill: {len(done)} unidades completadas hoy, {len(failed)} fallidas, "
+        f"{remaining} pendientes"
+    )
+    return {"done": len(done), "failed": len(failed), "remaining": remaining}
@@ -25,3 +25,40 @@ DEFAULT_SEASON = int(os.getenv("DEFAULT_SEASON", "2023"))
 # Configuración de reintentos
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
 RETRY_DELAY = int(os.getenv("RETRY_DELAY", "2"))
+
+# Configuración de concurrencia (extracción multi-liga)
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "8"))
+RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", "30"))
+
+# Configuración del cliente HTTP (pool de conexiones keep-alive)
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", str(max(FETCH_CONCURRENCY, 10))))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+
+# Configuración de caché de respuestas HTTP en disco
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_DIR = os.getenv("CACHE_DIR", "data/cache/http")
+CACHE_MAX_MB = int(os.getenv("CACHE_MAX_MB", "500"))
+CACHE_TTL_LEAGUES = int(os.getenv("CACHE_TTL_LEAGUES", str(6 * 3600)))   # Catálogos: horas
+CACHE_TTL_CURRENT = int(os.getenv("CACHE_TTL_CURRENT", str(5 * 60)))     # Jornada actual: minutos
+
+# Configuración de cuota diaria (se ajusta con los headers de la API)
+DAILY_QUOTA = int(os.getenv("DAILY_QUOTA", "100"))
+QUOTA_RESERVE_DEFAULT = float(os.getenv("QUOTA_RESERVE_DEFAULT", "0.10"))
+QUOTA_RESERVE_BACKFILL = float(os.getenv("QUOTA_RESERVE_BACKFILL", "0.30"))
+
+# Máximo de IDs por request en /fixtures?ids= (límite de la API)
+FIXTURES_IDS_BATCH_SIZE = int(os.getenv("FIXTURES_IDS_BATCH_SIZE", "20"))
+
+# Sincronización incremental de fixtures (ventana de fechas consultada)
+DELTA_LOOKBACK_DAYS = int(os.getenv("DELTA_LOOKBACK_DAYS", "3"))
+DELTA_LOOKAHEAD_DAYS = int(os.getenv("DELTA_LOOKAHEAD_DAYS", "7"))
+
+# De-duplicación de requests idénticos en curso (single-flight)
+SINGLE_FLIGHT_LOCK_TTL = int(os.getenv("SINGLE_FLIGHT_LOCK_TTL", "60"))
+SINGLE_FLIGHT_WAIT = float(os.getenv("SINGLE_FLIGHT_WAIT", "45"))
+
+# Almacenamiento raw: compresión (gzip, zstd, none) y de-duplicación (skip, link)
+RAW_COMPRESSION = os.getenv("RAW_COMPRESSION", "gzip").lower()
+RAW_DEDUP_MODE = os.getenv("RAW_DEDUP_MODE", "skip").lower()
@@ -0,0 +1,151 @@
+"""Sincronización incremental de fixtures con marcas (watermarks) en MongoDB"""
+import hashlib
+import json
+from datetime import datetime, timedelta
+from .config import DELTA_LOOKBACK_DAYS, DELTA_LOOKAHEAD_DAYS
+from .fixtures_client import fetch_fixtures
+from .quota import PRIORITY_DEFAULT
+from .response_cache import FINISHED_STATUSES
+from .logger import get_logger
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from src.database.repositories import SyncWatermarkRepository
+
+logger = get_logger()
+
+
+def fixture_fingerprint(item):
+    """
+    Huella de los campos de un fixture que cambian durante la temporada.
+
+    Args:
+        item: Elemento de 'response' de la API
+
+    Returns:
+        str: Hash de estado, fecha, goles y marcador
+    """
+    fixture = item.get("fixture", {})
+    payload = [
+        fixture.get("status", {}).get("short"),
+        fixture.get("date"),
+        item.get("goals"),
+        item.get("score"),
+    ]
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _fixture_state(item):
+    fixture = item.get("fixture", {})
+    return {
+        "status": fixture.get("status", {}).get("short"),
+        "date": (fixture.get("date") or "")[:10] or None,
+        "fingerprint": fixture_fingerprint(item),
+    }
+
+
+def compute_window(watermark, now=None):
+    """
+    Calcula la ventana de fechas que puede haber cambiado desde la última sync.
+
+    La ventana va desde DELTA_LOOKBACK_DAYS antes de la última sincronización
+    (o la fecha del partido pendiente más antiguo, ej: aplazados) hasta
+    DELTA_LOOKAHEAD_DAYS después de hoy.
+
+    Args:
+        watermark: Documento de SyncWatermarkRepository
+        now: Momento actual (para tests)
+
+    Returns:
+        tuple: (from_date, to_date) en formato YYYY-MM-DD
+    """
+    now = now or datetime.utcnow()
+    from_date = (watermark["last_sync"] - timedelta(days=DELTA_LOOKBACK_DAYS)).date().isoformat()
+
+    pending = [
+        state["date"]
+        for state in watermark.get("fixtures", {}).values()
+        if state.get("status") not in FINISHED_STATUSES
+        and state.get("date") and state["date"] < from_date
+    ]
+    if pending:
+        from_date = min(pending)
+
+    to_date = (now + timedelta(days=DELTA_LOOKAHEAD_DAYS)).date().isoformat()
+    return from_date, to_date
+
+
+def fetch_fixtures_delta(league_id, season, priority=PRIORITY_DEFAULT):
+    """
+    Obtiene solo los fixtures nuevos o modificados desde la última sincronización.
+
+    Sin watermark previo (o sin MongoDB) se descarga la temporada completa.
+    La nueva marca NO se persiste aquí: el llamador debe invocar
+    commit_watermark() después de guardar los datos, para no perder cambios
+    si el guardado falla.
+
+    Args:
+        league_id: ID de la liga
+        season: Temporada
+        priority: Prioridad en la cuota diaria
+
+    Returns:
+        tuple: (data, watermark) donde data tiene el formato de la API con
+            solo los fixtures cambiados en 'response', y watermark es la
+            nueva marca a persistir (None si MongoDB no está disponible)
+    """
+    repo = SyncWatermarkRepository()
+    sync_time = datetime.utcnow()
+
+    if not repo.is_available():
+        logger.warning("MongoDB no disponible - sincronización completa sin watermark")
+        return fetch_fixtures(league_id, season, priority), None
+
+    watermark = repo.get_watermark(league_id, season)
+
+    if watermark is None:
+        logger.info(f"Sin watermark para liga {league_id}/{season} - sincronización completa")
+        data = fetch_fixtures(league_id, season, priority)
+        known = {}
+        changed = data.get("response", [])
+    else:
+        from_date, to_date = compute_window(watermark, sync_time)
+        data = fetch_fixtures(league_id, season, priority, from_date=from_date, to_date=to_date)
+        known = dict(watermark.get("fixtures", {}))
+        changed = [
+            item for item in data.get("response", [])
+            if known.get(str(item.get("fixture", {}).get("id")), {}).get("fingerprint")
+            != fixture_fingerprint(item)
+        ]
+        logger.info(
+            f"Delta liga {league_id}/{season}: {len(data.get('response', []))} fixtures "
+            f"en ventana, {len(changed)} con cambios"
+        )
+
+    for item in data.get("response", []):
+        known[str(item.get("fixture", {}).get("id"))] = _fixture_state(item)
+
+    delta = dict(data)
+    delta["response"] = changed
+    delta["results"] = len(changed)
+
+    return delta, {"last_sync": sync_time, "fixtures": known}
+
+
+def commit_watermark(league_id, season, watermark):
+    """
+    Persiste la marca de sincronización devuelta por fetch_fixtures_delta.
+
+    Returns:
+        bool: True si se guardó
+    """
+    if watermark is None:
+        return False
+
+    saved = SyncWatermarkRepository().save_watermark(
+        league_id, season, watermark["last_sync"], watermark["fixtures"]
+    )
+    if saved:
+        logger.info(f"✓ Watermark actualizado: liga {league_id}/{season}")
+    return saved
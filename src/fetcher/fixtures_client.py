@@ -1,110 +1,77 @@
 """Cliente para obtener fixtures/partidos de la API"""
-import requests
-from requests.exceptions import RequestException, Timeout, ConnectionError
-from .config import API_KEY, BASE_URL, MAX_RETRIES, RETRY_DELAY
+from concurrent.futures import ThreadPoolExecutor
+from .config import MAX_RETRIES, RETRY_DELAY, FETCH_CONCURRENCY, FIXTURES_IDS_BATCH_SIZE
+from .http_client import get_client
+from .quota import PRIORITY_DEFAULT, PRIORITY_LIVE
 from .logger import get_logger
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from src.common.retry import retry_on_failure
-from src.common.exceptions import APIConnectionError, APIResponseError
+from src.common.exceptions import TransientAPIError
 
 logger = get_logger()
 
 @retry_on_failure(
     max_attempts=MAX_RETRIES, 
     delay=RETRY_DELAY, 
-    exceptions=(RequestException, ConnectionError, Timeout)
+    exceptions=(TransientAPIError,),
+    circuit_key="fixtures"
 )
-def fetch_fixtures(league_id, season):
+def fetch_fixtures(league_id, season, priority=PRIORITY_DEFAULT, from_date=None, to_date=None):
     """
     Obtiene fixtures (partidos) de una liga y temporada.
     
     Args:
         league_id: ID de la liga
         season: Temporada (año)
+        priority: Prioridad en la cuota diaria (PRIORITY_BACKFILL para históricos)
+        from_date: Fecha inicial opcional (YYYY-MM-DD)
+        to_date: Fecha final opcional (YYYY-MM-DD)
     
     Returns:
         dict: Datos de fixtures en formato JSON
     """
-    url = f"{BASE_URL}/fixtures"
-
-    headers = {
-        "x-apisports-key": API_KEY,
-    }
-
     params = {
         "league": league_id,
         "season": season
     }
-
-    logger.info(f"Solicitando fixtures: liga={league_id}, temporada={season}")
-
-    try:
-        response = requests.get(
-            url, 
-            headers=headers, 
-            params=params,
-            timeout=30
+    
+    if from_date and to_date:
+        params["from"] = from_date
+        params["to"] = to_date
+        logger.info(
+            f"Solicitando fixtures: liga={league_id}, temporada={season}, "
+            f"ventana={from_date} a {to_date}"
         )
+    else:
+        logger.info(f"Solicitando fixtures: liga={league_id}, temporada={season}")
 
-        if response.status_code == 401:
-            logger.error("Error 401: API key inválida")
-            raise APIConnectionError("API key inválida")
-        
-        if response.status_code == 429:
-            logger.error("Error 429: Límite de requests excedido")
-            raise APIConnectionError("Límite de API excedido")
-        
-        if response.status_code != 200:
-            logger.error(f"Error API: {response.status_code}")
-            raise APIResponseError(f"API retornó status {response.status_code}")
+    data = get_client().get("fixtures", params=params, priority=priority)
 
-        data = response.json()
+    num_fixtures = len(data.get('response', []))
+    logger.info(f"✓ Fixtures obtenidos: {num_fixtures}")
 
-        if "response" not in data:
-            logger.error("Respuesta sin campo 'response'")
-            raise APIResponseError("Formato de respuesta inválido")
-
-        num_fixtures = len(data.get('response', []))
-        logger.info(f"✓ Fixtures obtenidos: {num_fixtures}")
-
-        return data
-
-    except Timeout:
-        logger.error("Timeout al conectar con la API")
-        raise APIConnectionError("Timeout de conexión")
-    
-    except ConnectionError as e:
-        logger.error(f"Error de conexión: {str(e)}")
-        raise APIConnectionError(f"Error de conexión: {str(e)}")
-    
-    except requests.exceptions.JSONDecodeError:
-        logger.error("Error al decodificar respuesta JSON")
-        raise APIResponseError("Respuesta no válida")
+    return data
 
 @retry_on_failure(
     max_attempts=MAX_RETRIES, 
     delay=RETRY_DELAY, 
-    exceptions=(RequestException, ConnectionError, Timeout)
+    exceptions=(TransientAPIError,),
+    circuit_key="fixtures"
 )
-def fetch_fixture_by_id(fixture_id):
+def fetch_fixture_by_id(fixture_id, priority=PRIORITY_LIVE):
     """
     Obtiene un fixture específico por ID.
     
     Args:
         fixture_id: ID del fixture
+        priority: Prioridad en la cuota diaria (por defecto, en vivo)
     
     Returns:
         dict: Datos del fixture
     """
-    url = f"{BASE_URL}/fixtures"
-
-    headers = {
-        "x-apisports-key": API_KEY,
-    }
-
     params = {
         "id": fixture_id
     }
@@ -112,12 +79,7 @@ def fetch_fixture_by_id(fixture_id):
     logger.info(f"Solicitando fixture ID: {fixture_id}")
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-
-        if response.status_code != 200:
-            raise APIResponseError(f"API retornó status {response.status_code}")
-
-        data = response.json()
+        data = get_client().get("fixtures", params=params, priority=priority)
         
         if data.get('response'):
             logger.info(f"✓ Fixture {fixture_id} obtenido")
@@ -127,3 +89,70 @@ def fetch_fixture_by_id(fixture_id):
     except Exception as e:
         logger.error(f"Error obteniendo fixture {fixture_id}: {str(e)}")
         raise
+
+@retry_on_failure(
+    max_attempts=MAX_RETRIES, 
+    delay=RETRY_DELAY, 
+    exceptions=(TransientAPIError,),
+    circuit_key="fixtures"
+)
+def _fetch_fixtures_batch(ids, priority):
+    """Obtiene un lote de fixtures (máx. FIXTURES_IDS_BATCH_SIZE) en un solo request"""
+    params = {
+        "ids": "-".join(str(fixture_id) for fixture_id in ids)
+    }
+    return get_client().get("fixtures", params=params, priority=priority)
+
+def fetch_fixtures_by_ids(fixture_ids, priority=PRIORITY_LIVE, max_workers=None):
+    """
+    Obtiene varios fixtures por ID usando el parámetro multi-id de la API.
+    
+    Los IDs se agrupan en lotes de FIXTURES_IDS_BATCH_SIZE, los lotes se
+    piden de forma concurrente y las respuestas se combinan. Un lote que
+    falla tras sus reintentos se registra y sus IDs quedan en 'missing',
+    sin descartar los lotes que sí llegaron.
+    
+    Args:
+        fixture_ids: Iterable de IDs de fixtures
+        priority: Prioridad en la cuota diaria (por defecto, en vivo)
+        max_workers: Lotes simultáneos (por defecto FETCH_CONCURRENCY)
+    
+    Returns:
+        dict: Respuesta combinada con el formato de la API, más la clave
+            'missing' con los IDs que la API no devolvió
+    """
+    ids = list(dict.fromkeys(int(fixture_id) for fixture_id in fixture_ids))
+    batches = [
+        ids[i:i + FIXTURES_IDS_BATCH_SIZE]
+        for i in range(0, len(ids), FIXTURES_IDS_BATCH_SIZE)
+    ]
+    
+    logger.info(f"Solicitando {len(ids)} fixtures en {len(batches)} lotes")
+    
+    response = []
+    if batches:
+        workers = min(max_workers or FETCH_CONCURRENCY, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [(batch, executor.submit(_fetch_fixtures_batch, batch, priority)) for batch in batches]
+            for batch, future in futures:
+                try:
+                    data = future.result()
+                except Exception as e:
+                    logger.error(f"Error en lote de {len(batch)} fixtures ({batch[0]}..{batch[-1]}): {str(e)}")
+                    continue
+                response.extend(data.get('response', []))
+    
+    found = {item.get('fixture', {}).get('id') for item in response}
+    missing = [fixture_id for fixture_id in ids if fixture_id not in found]
+    
+    if missing:
+        logger.warning(f"Fixtures no devueltos por la API: {missing}")
+    logger.info(f"✓ Fixtures obtenidos: {len(response)}/{len(ids)}")
+    
+    return {
+        "get": "fixtures",
+        "parameters": {"ids": "-".join(str(fixture_id) for fixture_id in ids)},
+        "results": len(response),
+        "response": response,
+        "missing": missing
+    }
@@ -0,0 +1,251 @@
+"""Cliente HTTP compartido para todos los endpoints de API-Football"""
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import Timeout, ConnectionError
+from .config import (
+    API_KEY, BASE_URL, ENDPOINTS,
+    HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE,
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, CACHE_ENABLED
+)
+from .logger import get_logger
+from .response_cache import ResponseCache, ttl_for
+from .quota import QuotaScheduler, PRIORITY_DEFAULT
+from .single_flight import SingleFlight, DistributedFlight
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from src.common.exceptions import APIConnectionError, APIResponseError, TransientAPIError
+
+logger = get_logger()
+
+
+class APIFootballClient:
+    """
+    Cliente HTTP con sesión keep-alive y pool de conexiones.
+
+    Reutiliza conexiones TCP/TLS entre requests y envía los headers
+    comunes (API key, compresión gzip) una sola vez en la sesión.
+    """
+
+    def __init__(self, base_url=BASE_URL, api_key=API_KEY,
+                 pool_connections=HTTP_POOL_CONNECTIONS,
+                 pool_maxsize=HTTP_POOL_MAXSIZE,
+                 connect_timeout=HTTP_CONNECT_TIMEOUT,
+                 read_timeout=HTTP_READ_TIMEOUT,
+                 cache=None, scheduler=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache = cache
+        self.scheduler = scheduler if scheduler is not None else QuotaScheduler()
+        self.single_flight = SingleFlight()
+        self.distributed_flight = DistributedFlight() if cache is not None else None
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "x-apisports-key": api_key,
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+        })
+
+        # Los reintentos los gestiona retry_on_failure, no urllib3
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def url_for(self, endpoint):
+        """
+        Construye la URL completa de un endpoint.
+
+        Args:
+            endpoint: Nombre del endpoint en ENDPOINTS (ej: "fixtures")
+
+        Returns:
+            str: URL absoluta
+        """
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Endpoint desconocido: {endpoint}")
+        return f"{self.base_url}{ENDPOINTS[endpoint]}"
+
+    def get(self, endpoint, params=None, use_cache=True, priority=PRIORITY_DEFAULT):
+        """
+        Ejecuta un GET contra la API y valida la respuesta.
+
+        Si el cliente tiene caché, las respuestas vigentes se sirven desde
+        disco sin consumir cuota de la API. Los requests idénticos en curso
+        (mismo endpoint y parámetros) se agrupan en uno solo, dentro del
+        proceso y entre procesos (lock en MongoDB + caché compartida).
+
+        Args:
+            endpoint: Nombre del endpoint en ENDPOINTS
+            params: Parámetros de query
+            use_cache: Si False, ignora la caché y fuerza el request
+            priority: Prioridad para la cuota diaria (ver src/fetcher/quota.py)
+
+        Returns:
+            dict: Respuesta JSON de la API
+
+        Raises:
+            TransientAPIError: Timeout, error de conexión, 429 o 5xx (reintentable)
+            APIConnectionError: API key inválida
+            QuotaExceededError: Cuota diaria agotada para la prioridad
+            APIResponseError: Status inesperado o respuesta inválida
+        """
+        url = self.url_for(endpoint)
+        cache = self.cache if use_cache else None
+
+        if cache is not None:
+            cached = cache.get(endpoint, params)
+            if cached is not None:
+                logger.info(f"Respuesta desde caché: {endpoint} {params}")
+                return cached
+
+        key = ResponseCache.make_key(endpoint, params)
+
+        def request():
+            # Otro llamador pudo guardar la respuesta entre la consulta de
+            # caché y la obtención del turno (single-flight o lock)
+            if cache is not None:
+                cached = cache.get(endpoint, params, count=False)
+                if cached is not None:
+                    return cached
+            return self._request(url, endpoint, params, priority)
+
+        if self.distributed_flight is None:
+            return self.single_flight.do(key, request)
+
+        wait_started = time.time()
+
+        def read_shared():
+            return self.cache.get(endpoint, params, min_stored_at=wait_started, count=False)
+
+        return self.single_flight.do(
+            key, lambda: self.distributed_flight.do(key, request, read_shared)
+        )
+
+    def _request(self, url, endpoint, params, priority):
+        """Ejecuta el request HTTP real y guarda la respuesta en caché"""
+        self.scheduler.acquire(priority)
+
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+        except Timeout:
+            logger.error("Timeout al conectar con la API")
+            raise TransientAPIError("Timeout de conexión - La API no respondió a tiempo")
+        except ConnectionError as e:
+            logger.error(f"Error de conexión: {str(e)}")
+            raise TransientAPIError(f"Error de conexión: {str(e)}")
+
+        self.scheduler.update_from_headers(response.headers)
+        data = self._parse_response(response)
+
+        if self.cache is not None:
+            self.cache.set(endpoint, params, data, ttl_for(endpoint, params, data))
+
+        return data
+
+    def _parse_response(self, response):
+        """Valida status code y estructura de la respuesta"""
+        if response.status_code == 401:
+            logger.error("Error 401: API key inválida o expirada")
+            raise APIConnectionError("API key inválida. Verifica tu configuración en .env")
+
+        if response.status_code == 429:
+            logger.error("Error 429: Límite de requests excedido")
+            retry_after = response.headers.get("Retry-After")
+            retry_after = int(retry_after) if retry_after and retry_after.isdigit() else None
+            self.scheduler.on_rate_limited(retry_after)
+            raise TransientAPIError(
+                "Límite de API excedido. Espera antes de reintentar",
+                retry_after=retry_after
+            )
+
+        if response.status_code >= 500:
+            logger.error(f"Error API: {response.status_code}")
+            raise TransientAPIError(f"API retornó status {response.status_code}")
+
+        if response.status_code != 200:
+            logger.error(f"Error API: {response.status_code} - {response.text}")
+            raise APIResponseError(f"API retornó status {response.status_code}")
+
+        try:
+            data = response.json()
+        except requests.exceptions.JSONDecodeError:
+            logger.error("Error al decodificar respuesta JSON")
+            raise APIResponseError("La API retornó una respuesta no válida")
+
+        if "response" not in data:
+            logger.error("Respuesta de API sin campo 'response'")
+            raise APIResponseError("Formato de respuesta inválido")
+
+        return data
+
+    def close(self):
+        """Cierra la sesión y libera las conexiones del pool"""
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Obtiene el cliente HTTP compartido del paquete fetcher.
+    Implementa patrón Singleton para reutilizar el pool de conexiones.
+
+    Returns:
+        APIFootballClient: Instancia compartida
+    """
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = APIFootballClient(
+                    cache=ResponseCache() if CACHE_ENABLED else None
+                )
+
+    return _client
+
+
+def close_client():
+    """Cierra el cliente HTTP compartido"""
+    global _client
+
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def log_cache_stats(target_logger=None):
+    """
+    Registra los contadores de la caché y la cuota restante del cliente compartido.
+
+    Args:
+        target_logger: Logger donde escribir (por defecto el del fetcher)
+    """
+    target_logger = target_logger or logger
+
+    if _client is None:
+        return
+
+    if _client.cache is not None:
+        stats = _client.cache.stats()
+        target_logger.info(
+            f"Caché HTTP: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']}% aciertos)"
+        )
+
+    quota = _client.scheduler.stats()
+    if quota["daily_remaining"] is not None:
+        target_logger.info(
+            f"Cuota API: {quota['daily_remaining']}/{quota['daily_limit']} requests restantes hoy"
+        )
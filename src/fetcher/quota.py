@@ -0,0 +1,178 @@
+"""Planificador de requests según la cuota informada por la API"""
+import threading
+import time
+from datetime import datetime, timezone
+from .config import (
+    RATE_LIMIT_PER_MINUTE, DAILY_QUOTA,
+    QUOTA_RESERVE_DEFAULT, QUOTA_RESERVE_BACKFILL
+)
+from .rate_limiter import TokenBucket
+from .logger import get_logger
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from src.common.exceptions import QuotaExceededError
+
+logger = get_logger()
+
+# Prioridades (menor valor = más prioritario)
+PRIORITY_LIVE = 0       # Jornadas en juego / partidos en vivo
+PRIORITY_DEFAULT = 1    # Refrescos normales del pipeline
+PRIORITY_BACKFILL = 2   # Cargas históricas
+
+# Fracción de la cuota diaria reservada para prioridades superiores
+DAILY_RESERVES = {
+    PRIORITY_LIVE: 0.0,
+    PRIORITY_DEFAULT: QUOTA_RESERVE_DEFAULT,
+    PRIORITY_BACKFILL: QUOTA_RESERVE_BACKFILL,
+}
+
+# Headers de API-Football (requests los trata sin distinguir mayúsculas)
+HEADER_DAILY_LIMIT = "x-ratelimit-requests-limit"
+HEADER_DAILY_REMAINING = "x-ratelimit-requests-remaining"
+HEADER_MINUTE_LIMIT = "x-ratelimit-limit"
+HEADER_MINUTE_REMAINING = "x-ratelimit-remaining"
+
+# Pausa por defecto tras un 429 sin Retry-After
+DEFAULT_RATE_LIMIT_PAUSE = 60
+
+
+def _int_header(headers, name):
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class QuotaScheduler:
+    """
+    Regula el ritmo de requests para no recibir nunca un 429.
+
+    - Límite por minuto: token bucket cuya tasa y tokens disponibles se
+      ajustan con los headers de cada respuesta
+    - Cuota diaria: cada prioridad solo puede consumir hasta dejar libre
+      su reserva (DAILY_RESERVES), de modo que las cargas históricas
+      nunca agotan la cuota que necesitan las jornadas en vivo
+    """
+
+    def __init__(self, rate_per_minute=RATE_LIMIT_PER_MINUTE, daily_limit=DAILY_QUOTA):
+        self.bucket = TokenBucket(rate_per_minute)
+        self.minute_limit = rate_per_minute
+        self.daily_limit = daily_limit
+        self.daily_remaining = None   # Desconocido hasta la primera respuesta
+        self._day = self._today()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _today():
+        # La cuota diaria de API-Football se reinicia a las 00:00 UTC
+        return datetime.now(timezone.utc).date()
+
+    def _check_daily_budget(self, priority):
+        """Reserva un request de la cuota diaria o lanza QuotaExceededError"""
+        with self._lock:
+            today = self._today()
+            if today != self._day:
+                self._day = today
+                self.daily_remaining = None
+
+            if self.daily_remaining is None:
+                return
+
+            reserve = DAILY_RESERVES.get(priority, QUOTA_RESERVE_BACKFILL) * self.daily_limit
+            if self.daily_remaining - 1 < reserve:
+                raise QuotaExceededError(
+                    f"Cuota diaria insuficiente para prioridad {priority}: "
+                    f"quedan {self.daily_remaining}, reserva {reserve:.0f}"
+                )
+
+            # Descuento optimista; el header de la respuesta lo corrige
+            self.daily_remaining -= 1
+
+    def available_today(self, priority=PRIORITY_DEFAULT):
+        """
+        Requests que una prioridad aún puede hacer hoy sin tocar su reserva.
+
+        Returns:
+            int | None: Requests disponibles, o None si la cuota restante
+                todavía no se conoce (sin respuestas de la API hoy)
+        """
+        with self._lock:
+            if self.daily_remaining is None or self._today() != self._day:
+                return None
+            reserve = DAILY_RESERVES.get(priority, QUOTA_RESERVE_BACKFILL) * self.daily_limit
+            return max(int(self.daily_remaining - reserve), 0)
+
+    def _pause_remaining(self):
+        return self._paused_until - time.monotonic()
+
+    def acquire(self, priority=PRIORITY_DEFAULT):
+        """
+        Bloquea hasta que se pueda enviar un request con la prioridad dada.
+
+        Raises:
+            QuotaExceededError: Si la cuota diaria disponible para esa
+                prioridad está agotada
+        """
+        self._check_daily_budget(priority)
+
+        wait = self._pause_remaining()
+        if wait > 0:
+            time.sleep(wait)
+
+        self.bucket.acquire()
+
+    def update_from_headers(self, headers):
+        """
+        Actualiza límites y cuota restante a partir de una respuesta.
+
+        Args:
+            headers: Headers de la respuesta HTTP
+        """
+        minute_limit = _int_header(headers, HEADER_MINUTE_LIMIT)
+        minute_remaining = _int_header(headers, HEADER_MINUTE_REMAINING)
+        daily_limit = _int_header(headers, HEADER_DAILY_LIMIT)
+        daily_remaining = _int_header(headers, HEADER_DAILY_REMAINING)
+
+        if minute_limit and minute_limit != self.minute_limit:
+            logger.info(f"Límite por minuto de la API: {minute_limit}")
+            self.minute_limit = minute_limit
+            self.bucket.set_rate(minute_limit)
+
+        if minute_remaining is not None:
+            self.bucket.limit_tokens(minute_remaining)
+
+        with self._lock:
+            if daily_limit:
+                self.daily_limit = daily_limit
+            if daily_remaining is not None:
+                self.daily_remaining = daily_remaining
+
+    def on_rate_limited(self, retry_after=None):
+        """
+        Registra un 429: vacía el bucket y pausa los requests salientes.
+
+        Args:
+            retry_after: Segundos indicados por el header Retry-After
+        """
+        pause = retry_after if retry_after is not None else DEFAULT_RATE_LIMIT_PAUSE
+        self.bucket.limit_tokens(0)
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        logger.warning(f"Límite por minuto alcanzado - pausando requests {pause}s")
+
+    def stats(self):
+        """
+        Obtiene el estado actual de la cuota.
+
+        Returns:
+            dict: Límites y cuota restante conocidos
+        """
+        return {
+            "minute_limit": self.minute_limit,
+            "daily_limit": self.daily_limit,
+            "daily_remaining": self.daily_remaining,
+        }
@@ -0,0 +1,90 @@
+"""Limitador de tasa (token bucket) compartido entre hilos y corrutinas"""
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe.
+    
+    Permite ráfagas de hasta `capacity` requests y después limita a
+    `rate_per_minute` requests por minuto. Una sola instancia puede
+    compartirse entre hilos y corrutinas para aplicar un límite global.
+    """
+    
+    def __init__(self, rate_per_minute, capacity=None):
+        """
+        Args:
+            rate_per_minute: Requests permitidos por minuto
+            capacity: Tamaño máximo de ráfaga (por defecto rate_per_minute)
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute debe ser mayor que 0")
+        
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+    
+    def _reserve(self):
+        """
+        Intenta consumir un token.
+        
+        Returns:
+            float: 0 si se obtuvo el token, o segundos a esperar antes de reintentar
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+    
+    def set_rate(self, rate_per_minute, capacity=None):
+        """
+        Ajusta la tasa del bucket (ej: al conocer el límite real de la API).
+        
+        Args:
+            rate_per_minute: Nuevos requests permitidos por minuto
+            capacity: Nuevo tamaño de ráfaga (por defecto rate_per_minute)
+        """
+        if rate_per_minute <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self.rate = rate_per_minute / 60.0
+            self.capacity = float(capacity if capacity is not None else rate_per_minute)
+            self._tokens = min(self._tokens, self.capacity)
+    
+    def limit_tokens(self, available):
+        """
+        Limita los tokens disponibles a `available` (ej: los requests que el
+        servidor dice que quedan en la ventana actual).
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, max(float(available), 0.0))
+    
+    def acquire(self):
+        """Bloquea el hilo actual hasta obtener un token"""
+        while True:
+            wait = self._reserve()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+    
+    async def acquire_async(self):
+        """Espera (sin bloquear el event loop) hasta obtener un token"""
+        while True:
+            wait = self._reserve()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
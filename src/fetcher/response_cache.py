@@ -0,0 +1,268 @@
+"""Caché en disco de respuestas HTTP con TTL por estado de los datos"""
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from .config import CACHE_DIR, CACHE_MAX_MB, CACHE_TTL_LEAGUES, CACHE_TTL_CURRENT
+from .logger import get_logger
+
+logger = get_logger()
+
+# TTL especial: la entrada no expira nunca
+TTL_FOREVER = None
+
+# Estados (status.short) de partidos que ya no pueden cambiar
+FINISHED_STATUSES = {"FT", "AET", "PEN", "CANC", "ABD", "AWD", "WO"}
+
+# Parámetros de una consulta de temporada completa (sin from/to, ids, round...)
+FULL_SEASON_PARAMS = {"league", "season"}
+
+
+def ttl_for(endpoint, params, data):
+    """
+    Decide el TTL de una respuesta según el estado de los datos.
+
+    - Temporadas terminadas consultadas completas (solo league + season;
+      todos los partidos finalizados, o temporadas anteriores a la del año
+      pasado): no expiran nunca. Una consulta parcial (rango de fechas,
+      ids, jornada...) solo ve una parte y no prueba que la temporada
+      terminó
+    - Catálogos de ligas/equipos: CACHE_TTL_LEAGUES (horas)
+    - Jornadas en curso o próximas: CACHE_TTL_CURRENT (minutos)
+
+    Args:
+        endpoint: Nombre del endpoint en ENDPOINTS
+        params: Parámetros del request
+        data: Respuesta JSON de la API
+
+    Returns:
+        int | None: Segundos de vida, o TTL_FOREVER
+    """
+    if endpoint != "fixtures":
+        return CACHE_TTL_LEAGUES
+
+    params = {k: v for k, v in (params or {}).items() if v is not None}
+    if set(params) != FULL_SEASON_PARAMS:
+        return CACHE_TTL_CURRENT
+
+    fixtures = data.get("response", [])
+    statuses = {
+        f.get("fixture", {}).get("status", {}).get("short")
+        for f in fixtures
+    }
+    if fixtures and statuses <= FINISHED_STATUSES:
+        return TTL_FOREVER
+
+    if int(params["season"]) < datetime.now().year - 1:
+        return TTL_FOREVER
+
+    return CACHE_TTL_CURRENT
+
+
+class ResponseCache:
+    """
+    Caché de respuestas en disco (un archivo JSON por entrada).
+
+    La clave es el endpoint más los parámetros normalizados. Cuando el
+    tamaño total supera `max_bytes`, se eliminan las entradas usadas hace
+    más tiempo (LRU, usando el mtime del archivo como marca de acceso).
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint, params=None):
+        """
+        Genera la clave de caché para un endpoint y sus parámetros.
+
+        Los parámetros se normalizan (strings, sin valores None, ordenados)
+        para que {"season": 2023} y {"season": "2023"} compartan entrada.
+        """
+        normalized = {
+            str(k): str(v) for k, v in (params or {}).items() if v is not None
+        }
+        raw = json.dumps([endpoint, normalized], sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, endpoint, params=None, min_stored_at=None, count=True):
+        """
+        Obtiene una respuesta cacheada si existe y no expiró.
+
+        Args:
+            endpoint: Nombre del endpoint
+            params: Parámetros del request
+            min_stored_at: Si se indica, ignora entradas guardadas antes de
+                ese timestamp (ej: para leer solo respuestas recién publicadas)
+            count: Si False, la consulta no cuenta como hit/miss (relecturas
+                internas del cliente mientras espera a otro llamador)
+
+        Returns:
+            dict | None: Respuesta JSON o None si no hay entrada válida
+        """
+        path = self._path(self.make_key(endpoint, params))
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count(hit=False, enabled=count)
+            return None
+
+        if min_stored_at is not None and entry["stored_at"] < min_stored_at:
+            self._count(hit=False, enabled=count)
+            return None
+
+        ttl = entry.get("ttl")
+        if ttl is not None and time.time() - entry["stored_at"] > ttl:
+            self._count(hit=False, enabled=count)
+            return None
+
+        # Marcar como usada recientemente (LRU)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self._count(hit=True, enabled=count)
+        return entry["data"]
+
+    def contains(self, endpoint, params=None):
+        """
+        Indica si hay una entrada vigente, sin contarla como hit/miss.
+
+        Returns:
+            bool: True si get() devolvería una respuesta
+        """
+        path = self._path(self.make_key(endpoint, params))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        ttl = entry.get("ttl")
+        return ttl is None or time.time() - entry["stored_at"] <= ttl
+
+    def set(self, endpoint, params, data, ttl):
+        """
+        Guarda una respuesta en caché.
+
+        Args:
+            endpoint: Nombre del endpoint
+            params: Parámetros del request
+            data: Respuesta JSON
+            ttl: Segundos de vida o TTL_FOREVER
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        path = self._path(self.make_key(endpoint, params))
+        entry = {
+            "endpoint": endpoint,
+            "params": params,
+            "stored_at": time.time(),
+            "ttl": ttl,
+            "data": data,
+        }
+
+        # Escritura atómica para no dejar entradas corruptas
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"No se pudo escribir en caché: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            if self._size is not None:
+                self._size += os.path.getsize(path)
+            self._evict_if_needed()
+
+    def _entries(self):
+        """Lista (mtime, tamaño, path) de las entradas en disco"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _evict_if_needed(self):
+        """Elimina entradas LRU hasta quedar por debajo del 90% del máximo"""
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+
+        if self._size <= self.max_bytes:
+            return
+
+        target = self.max_bytes * 0.9
+        entries = self._entries()
+        self._size = sum(size for _, size, _ in entries)
+        evicted = 0
+
+        for _, size, path in sorted(entries):
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+                self._size -= size
+                evicted += 1
+            except OSError:
+                continue
+
+        if evicted:
+            logger.info(f"Caché HTTP: {evicted} entradas eliminadas (LRU)")
+
+    def _count(self, hit, enabled=True):
+        if not enabled:
+            return
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """
+        Obtiene contadores de uso de la caché.
+
+        Returns:
+            dict: hits, misses y porcentaje de aciertos
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(100 * self.hits / total, 1) if total else 0.0,
+        }
+
+    def clear(self):
+        """Elimina todas las entradas de la caché"""
+        if not os.path.exists(self.cache_dir):
+            return
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+            self._size = 0
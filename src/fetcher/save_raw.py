@@ -1,28 +1,108 @@
+import gzip
+import hashlib
 import json
 import os
 import sys
 from datetime import datetime
 from .logger import get_logger
-from .config import DEFAULT_COUNTRY, DEFAULT_SEASON
+from .config import DEFAULT_COUNTRY, DEFAULT_SEASON, RAW_COMPRESSION, RAW_DEDUP_MODE
 
 # Importar repositorio MongoDB
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from src.database.repositories import LeagueRepository
+from src.database.repositories import LeagueRepository, RawFixturesRepository
+
+try:
+    import zstandard
+except ImportError:  # Dependencia opcional
+    zstandard = None
 
 logger = get_logger()
 
+RAW_DIR = "data/raw"
+
+# Último snapshot por nombre (hash + archivo), para no duplicar payloads idénticos
+LATEST_DIR = os.path.join(RAW_DIR, ".latest")
+
+EXTENSIONS = {
+    "gzip": ".json.gz",
+    "zstd": ".json.zst",
+    "none": ".json",
+}
+
+
+def _resolve_compression(compression):
+    if compression == "zstd" and zstandard is None:
+        logger.warning("zstandard no instalado - usando gzip")
+        return "gzip"
+    if compression not in EXTENSIONS:
+        logger.warning(f"Compresión desconocida '{compression}' - usando gzip")
+        return "gzip"
+    return compression
+
+
+def _open_compressed(path, compression):
+    """Abre un archivo binario de escritura con la compresión indicada"""
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(path, "wb"))
+    return open(path, "wb")
+
+
+def _write_stream(data, path, compression):
+    """
+    Serializa `data` como JSON compacto directamente al archivo comprimido,
+    por fragmentos, calculando el hash del contenido al mismo tiempo.
+
+    Returns:
+        str: SHA-256 del JSON sin comprimir
+    """
+    hasher = hashlib.sha256()
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    with _open_compressed(path, compression) as f:
+        for chunk in encoder.iterencode(data):
+            chunk = chunk.encode("utf-8")
+            hasher.update(chunk)
+            f.write(chunk)
+
+    return hasher.hexdigest()
+
+
+def _read_latest(name):
+    try:
+        with open(os.path.join(LATEST_DIR, f"{name}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_latest(name, content_hash, path):
+    os.makedirs(LATEST_DIR, exist_ok=True)
+    latest_path = os.path.join(LATEST_DIR, f"{name}.json")
+    tmp_path = f"{latest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"hash": content_hash, "path": path}, f)
+    os.replace(tmp_path, latest_path)
+
+
 def save_raw(data, name, country=None, season=None):
     """
-    Guarda datos raw en formato JSON y MongoDB.
-    
+    Guarda datos raw en formato JSON comprimido y MongoDB.
+
+    El JSON se escribe compacto y comprimido (RAW_COMPRESSION). Si el
+    contenido es idéntico al último snapshot guardado con el mismo nombre,
+    no se vuelve a escribir (RAW_DEDUP_MODE=skip) o se crea un hard link
+    al snapshot anterior (RAW_DEDUP_MODE=link).
+
     Args:
         data: Datos a guardar
         name: Nombre base del archivo
         country: País de los datos (opcional)
         season: Temporada de los datos (opcional)
-    
+
     Returns:
-        str: Path del archivo guardado o None si falla
+        str: Path del archivo guardado (o del snapshot idéntico) o None si falla
     """
     if data is None:
         logger.warning("No se guardó RAW: data es None")
@@ -30,32 +110,59 @@ def save_raw(data, name, country=None, season=None):
 
     try:
         # Crear directorio si no existe
-        os.makedirs("data/raw/", exist_ok=True)
+        os.makedirs(RAW_DIR, exist_ok=True)
+
+        compression = _resolve_compression(RAW_COMPRESSION)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"{RAW_DIR}/{name}_{timestamp}{EXTENSIONS[compression]}"
+        tmp_filename = f"{filename}.{os.getpid()}.tmp"
+
+        # Guardar en archivo (streaming + hash)
+        content_hash = _write_stream(data, tmp_filename, compression)
+
+        latest = _read_latest(name)
+        if latest and latest.get("hash") == content_hash and os.path.exists(latest["path"]):
+            os.remove(tmp_filename)
 
-        filename = f"data/raw/{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            if RAW_DEDUP_MODE == "link":
+                # Mantener la extensión (y compresión) del snapshot original
+                extension = latest["path"][latest["path"].rindex(".json"):]
+                link_name = f"{RAW_DIR}/{name}_{timestamp}{extension}"
+                if not os.path.exists(link_name):
+                    os.link(latest["path"], link_name)
+                logger.info(f"✓ RAW sin cambios - enlazado a {latest['path']}: {link_name}")
+                return link_name
 
-        # Guardar en archivo JSON
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+            logger.info(f"✓ RAW sin cambios - se omite escritura (igual a {latest['path']})")
+            return latest["path"]
+
+        os.replace(tmp_filename, filename)
+        _write_latest(name, content_hash, filename)
 
         logger.info(f"✓ Archivo RAW guardado: {filename}")
-        
+
         # Mostrar estadísticas
         file_size = os.path.getsize(filename)
-        logger.info(f"  Tamaño: {file_size / 1024:.2f} KB")
-        
+        logger.info(f"  Tamaño: {file_size / 1024:.2f} KB ({compression})")
+
         # Guardar en MongoDB (si está disponible)
         try:
-            repo = LeagueRepository()
-            if repo.is_available():
-                country = country or DEFAULT_COUNTRY
-                season = season or DEFAULT_SEASON
-                mongo_id = repo.save_raw(data, country, season)
-                if mongo_id:
-                    logger.info(f"  MongoDB ID: {mongo_id}")
+            if data.get("get") == "fixtures":
+                # Un documento por partido en lugar de un blob por respuesta
+                repo = RawFixturesRepository()
+                if repo.is_available():
+                    repo.save_raw(data)
+            else:
+                repo = LeagueRepository()
+                if repo.is_available():
+                    country = country or DEFAULT_COUNTRY
+                    season = season or DEFAULT_SEASON
+                    mongo_id = repo.save_raw(data, country, season)
+                    if mongo_id:
+                        logger.info(f"  MongoDB ID: {mongo_id}")
         except Exception as mongo_error:
             logger.warning(f"MongoDB no disponible: {str(mongo_error)}")
-        
+
         return filename
 
     except Exception as e:
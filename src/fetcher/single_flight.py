@@ -0,0 +1,141 @@
+"""De-duplicación de requests idénticos en curso (single-flight)"""
+import threading
+import time
+import uuid
+from .config import SINGLE_FLIGHT_LOCK_TTL, SINGLE_FLIGHT_WAIT
+from .logger import get_logger
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from src.database.repositories import FetchLockRepository
+
+logger = get_logger()
+
+# Intervalo de consulta del lock entre procesos
+LOCK_POLL_INTERVAL = 0.5
+
+
+class _Call:
+    """Request en curso compartido por varios llamadores"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Agrupa llamadas concurrentes con la misma clave en una sola ejecución.
+
+    El primer llamador (líder) ejecuta la función; los demás esperan y
+    reciben el mismo resultado (o la misma excepción).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def do(self, key, fn):
+        """
+        Ejecuta `fn` una sola vez por clave entre los llamadores concurrentes.
+
+        Args:
+            key: Clave del request
+            fn: Función sin argumentos que realiza el request
+
+        Returns:
+            Resultado de `fn`
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+class DistributedFlight:
+    """
+    Coordina requests idénticos entre procesos mediante un lock en MongoDB.
+
+    El proceso que obtiene el lock hace el request; los demás esperan a
+    que se libere y leen el resultado de la caché en disco compartida.
+    Si MongoDB no está disponible, cada proceso hace su propio request.
+    """
+
+    def __init__(self, lock_ttl=SINGLE_FLIGHT_LOCK_TTL, max_wait=SINGLE_FLIGHT_WAIT):
+        self.lock_ttl = lock_ttl
+        self.max_wait = max_wait
+        self._repo = None
+        self._repo_checked = False
+        self._init_lock = threading.Lock()
+
+    def _get_repo(self):
+        # Se resuelve una sola vez: no reintentar MongoDB en cada request
+        with self._init_lock:
+            if not self._repo_checked:
+                repo = FetchLockRepository()
+                self._repo = repo if repo.is_available() else None
+                self._repo_checked = True
+        return self._repo
+
+    def do(self, key, fn, read_shared):
+        """
+        Ejecuta `fn` como líder o espera al líder de otro proceso.
+
+        Args:
+            key: Clave del request
+            fn: Función sin argumentos que realiza el request
+            read_shared: Función sin argumentos que devuelve el resultado
+                publicado por el líder (ej: lectura de caché) o None
+
+        Returns:
+            Resultado del request
+        """
+        repo = self._get_repo()
+        if repo is None:
+            return fn()
+
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + self.max_wait
+
+        while not repo.acquire(key, owner, self.lock_ttl):
+            # Otro proceso está haciendo el mismo request
+            while repo.is_locked(key) and time.monotonic() < deadline:
+                time.sleep(LOCK_POLL_INTERVAL)
+
+            shared = read_shared()
+            if shared is not None:
+                logger.info("Respuesta compartida por otro proceso (single-flight)")
+                return shared
+
+            if time.monotonic() >= deadline:
+                logger.warning("Timeout esperando lock de otro proceso - request propio")
+                return fn()
+
+        try:
+            return fn()
+        finally:
+            repo.release(key, owner)
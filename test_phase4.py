@@ -0,0 +1,1782 @@
+#!/usr/bin/env python3
+"""Tests para Fase 4 - Rendimiento y escalabilidad"""
+import os
+import sys
+import time
+
+# Los módulos del fetcher exigen API_KEY al importarse
+os.environ.setdefault("API_KEY", "test_key")
+
+
+def test_token_bucket():
+    """Test 1: Verificar el limitador de tasa compartido"""
+    print("\n" + "="*60)
+    print("TEST 1: Token Bucket")
+    print("="*60)
+
+    from src.fetcher.rate_limiter import TokenBucket
+
+    # 600/min = 10 por segundo, ráfaga de 2
+    bucket = TokenBucket(600, capacity=2)
+
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+
+    # 2 tokens inmediatos + 2 a 0.1s cada uno
+    assert elapsed >= 0.15, f"❌ El bucket no limitó la tasa ({elapsed:.3f}s)"
+
+    print(f"✓ 4 requests con ráfaga 2 a 10/s: {elapsed:.3f}s")
+    print("✅ TEST 1 PASADO\n")
+
+
+def test_league_season_args():
+    """Test 2: Verificar el parseo de pares liga/temporada"""
+    print("="*60)
+    print("TEST 2: Argumentos Liga/Temporada")
+    print("="*60)
+
+    from main_fixtures_fetcher import parse_league_season_args, parse_cli_args
+
+    assert parse_league_season_args(["131", "2023"]) == [(131, 2023)]
+    assert parse_league_season_args(["39:2023", "140:2022"]) == [(39, 2023), (140, 2022)]
+    assert parse_league_season_args([]) == []
+    assert parse_league_season_args(["39:2023", "--delta"]) == [(39, 2023)]
+
+    for bad in (["39:2023", "140"], ["39:abc"], ["39"], ["39", "x"], ["39", "2023", "140"]):
+        try:
+            parse_league_season_args(bad)
+            raise AssertionError(f"❌ Argumentos inválidos aceptados: {bad}")
+        except ValueError:
+            pass
+
+    # CLI: --delta reconocido; opciones desconocidas y pares inválidos -> uso (código 2)
+    assert parse_cli_args(["39:2023", "--delta"]) == ([(39, 2023)], True)
+    for bad in (["--delat", "39", "2023"], ["39", "abc"]):
+        try:
+            parse_cli_args(bad)
+            raise AssertionError(f"❌ CLI aceptó {bad}")
+        except SystemExit as e:
+            assert e.code == 2
+
+    print("✓ Formatos clásico y multi-liga soportados")
+    print("✅ TEST 2 PASADO\n")
+
+
+def test_shared_http_client():
+    """Test 3: Verificar el cliente HTTP compartido"""
+    print("="*60)
+    print("TEST 3: Cliente HTTP Compartido")
+    print("="*60)
+
+    from src.fetcher.http_client import get_client
+    from src.fetcher.config import ENDPOINTS
+
+    client = get_client()
+
+    assert client is get_client(), "❌ get_client no reutiliza la instancia"
+    assert client.session.headers["x-apisports-key"], "❌ API key no configurada en la sesión"
+    assert "gzip" in client.session.headers["Accept-Encoding"], "❌ gzip no negociado"
+
+    for endpoint, path in ENDPOINTS.items():
+        assert client.url_for(endpoint).endswith(path)
+
+    adapter = client.session.get_adapter(client.url_for("fixtures"))
+    print(f"✓ Sesión compartida, pool máximo: {adapter._pool_maxsize}")
+    print("✅ TEST 3 PASADO\n")
+
+
+def test_response_cache():
+    """Test 4: Verificar caché de respuestas con TTL y LRU"""
+    print("="*60)
+    print("TEST 4: Caché de Respuestas HTTP")
+    print("="*60)
+
+    import tempfile
+    from src.fetcher.response_cache import ResponseCache, ttl_for, TTL_FOREVER
+    from src.fetcher.config import CACHE_TTL_LEAGUES, CACHE_TTL_CURRENT
+
+    finished = {"response": [{"fixture": {"status": {"short": "FT"}}}]}
+    live = {"response": [{"fixture": {"status": {"short": "2H"}}}]}
+
+    assert ttl_for("fixtures", {"league": 39, "season": 2023}, finished) is TTL_FOREVER
+    assert ttl_for("fixtures", {"league": 39, "season": 2100}, live) == CACHE_TTL_CURRENT
+    assert ttl_for("leagues", {"country": "england"}, finished) == CACHE_TTL_LEAGUES
+    assert ttl_for("fixtures", {"league": 39, "season": 2015, "timezone": None}, live) is TTL_FOREVER
+
+    # Consultas parciales: que sus partidos terminaran no cierra la temporada
+    partial = {"league": 39, "season": 2024, "from": "2024-08-01", "to": "2024-08-31"}
+    assert ttl_for("fixtures", partial, finished) == CACHE_TTL_CURRENT
+    assert ttl_for("fixtures", {"ids": "1-2-3"}, finished) == CACHE_TTL_CURRENT
+    assert ttl_for("fixtures", {"league": 39, "season": 2015, "round": "Regular Season - 1"}, finished) == CACHE_TTL_CURRENT
+    print("✓ TTL según estado de los datos")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(cache_dir=tmp, max_bytes=10 * 1024)
+
+        # Parámetros equivalentes comparten entrada
+        cache.set("fixtures", {"league": 39, "season": 2023}, finished, TTL_FOREVER)
+        assert cache.get("fixtures", {"season": "2023", "league": "39"}) == finished
+        assert cache.get("fixtures", {"league": 40, "season": 2023}) is None
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+        # Entradas expiradas no se sirven
+        cache.set("leagues", {"country": "spain"}, finished, -1)
+        assert cache.get("leagues", {"country": "spain"}) is None
+
+        # Eviction LRU al superar el tamaño máximo
+        big = {"response": ["x" * 1024]}
+        for i in range(20):
+            cache.set("fixtures", {"id": i}, big, TTL_FOREVER)
+        total = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+        assert total <= 10 * 1024, f"❌ La caché no se recortó ({total} bytes)"
+        assert cache.get("fixtures", {"id": 19}) == big, "❌ Se eliminó la entrada más reciente"
+
+    print(f"✓ Hits/misses: {cache.stats()}")
+    print("✅ TEST 4 PASADO\n")
+
+
+def test_quota_scheduler():
+    """Test 5: Verificar planificador de cuota por prioridad"""
+    print("="*60)
+    print("TEST 5: Planificador de Cuota")
+    print("="*60)
+
+    from src.fetcher.quota import (
+        QuotaScheduler, PRIORITY_LIVE, PRIORITY_DEFAULT, PRIORITY_BACKFILL
+    )
+    from src.common.exceptions import QuotaExceededError
+
+    scheduler = QuotaScheduler(rate_per_minute=600, daily_limit=100)
+    scheduler.update_from_headers({
+        "x-ratelimit-requests-limit": "100",
+        "x-ratelimit-requests-remaining": "25",
+        "x-ratelimit-limit": "300",
+        "x-ratelimit-remaining": "299",
+    })
+
+    assert scheduler.minute_limit == 300, "❌ Límite por minuto no actualizado"
+    assert scheduler.daily_remaining == 25, "❌ Cuota diaria no actualizada"
+    assert scheduler.available_today(PRIORITY_BACKFILL) == 0
+    assert scheduler.available_today(PRIORITY_LIVE) == 25
+
+    # Con 25 restantes, los backfills (reserva 30%) quedan bloqueados
+    try:
+        scheduler.acquire(PRIORITY_BACKFILL)
+        raise AssertionError("❌ Backfill consumió la reserva de prioridades altas")
+    except QuotaExceededError:
+        pass
+
+    scheduler.acquire(PRIORITY_DEFAULT)
+    scheduler.acquire(PRIORITY_LIVE)
+    assert scheduler.daily_remaining == 23
+
+    print(f"✓ Estado de cuota: {scheduler.stats()}")
+    print("✅ TEST 5 PASADO\n")
+
+
+def test_fixtures_by_ids_batching():
+    """Test 6: Verificar lotes de fixtures por ID"""
+    print("="*60)
+    print("TEST 6: Fixtures por ID en Lotes")
+    print("="*60)
+
+    import src.fetcher.fixtures_client as fixtures_client
+
+    requested = []
+
+    class StubClient:
+        def get(self, endpoint, params=None, priority=None):
+            ids = [int(i) for i in params["ids"].split("-")]
+            requested.append(ids)
+            # La API no devuelve los múltiplos de 10
+            return {"response": [{"fixture": {"id": i}} for i in ids if i % 10]}
+
+    original = fixtures_client.get_client
+    fixtures_client.get_client = lambda: StubClient()
+    try:
+        data = fixtures_client.fetch_fixtures_by_ids(list(range(1, 46)) + [5])
+    finally:
+        fixtures_client.get_client = original
+
+    assert len(requested) == 3, f"❌ Se esperaban 3 lotes, hubo {len(requested)}"
+    assert max(len(batch) for batch in requested) == 20
+    assert data["results"] == 41
+    assert data["missing"] == [10, 20, 30, 40]
+
+    # Un lote que falla no descarta los demás: sus IDs quedan en missing
+    class FailingBatchClient(StubClient):
+        def get(self, endpoint, params=None, priority=None):
+            if params["ids"].startswith("21-"):
+                raise ValueError("lote rechazado")
+            return super().get(endpoint, params, priority)
+
+    fixtures_client.get_client = lambda: FailingBatchClient()
+    try:
+        partial = fixtures_client.fetch_fixtures_by_ids(range(1, 46))
+    finally:
+        fixtures_client.get_client = original
+
+    assert partial["results"] == 41 - 18, partial["results"]
+    assert partial["missing"] == [10] + list(range(20, 41)), partial["missing"]
+
+    print(f"✓ 45 IDs en {len(requested)} requests, faltantes: {data['missing']}")
+    print("✅ TEST 6 PASADO\n")
+
+
+def test_delta_sync_window():
+    """Test 7: Verificar ventana y huellas de la sincronización incremental"""
+    print("="*60)
+    print("TEST 7: Sincronización Incremental")
+    print("="*60)
+
+    from datetime import datetime
+    from src.fetcher.delta_sync import compute_window, fixture_fingerprint
+    from src.fetcher.config import DELTA_LOOKBACK_DAYS, DELTA_LOOKAHEAD_DAYS
+
+    watermark = {
+        "last_sync": datetime(2023, 10, 10, 12, 0),
+        "fixtures": {
+            "1": {"status": "FT", "date": "2023-08-01"},
+            "2": {"status": "PST", "date": "2023-09-15"},
+            "3": {"status": "NS", "date": "2023-10-20"},
+        }
+    }
+    from_date, to_date = compute_window(watermark, now=datetime(2023, 10, 12))
+
+    # El partido aplazado amplía la ventana hacia atrás
+    assert from_date == "2023-09-15", f"❌ from inesperado: {from_date}"
+    assert to_date == f"2023-10-{12 + DELTA_LOOKAHEAD_DAYS}", f"❌ to inesperado: {to_date}"
+
+    del watermark["fixtures"]["2"]
+    from_date, _ = compute_window(watermark, now=datetime(2023, 10, 12))
+    assert from_date == f"2023-10-{10 - DELTA_LOOKBACK_DAYS:02d}"
+
+    item = {"fixture": {"id": 1, "status": {"short": "NS"}}, "goals": {"home": None}}
+    changed = {"fixture": {"id": 1, "status": {"short": "1H"}}, "goals": {"home": 0}}
+    assert fixture_fingerprint(item) == fixture_fingerprint(dict(item))
+    assert fixture_fingerprint(item) != fixture_fingerprint(changed)
+
+    print(f"✓ Ventana: {from_date} a {to_date}")
+    print("✅ TEST 7 PASADO\n")
+
+
+def test_retry_jitter_and_circuit_breaker():
+    """Test 8: Verificar jitter, Retry-After, presupuesto y circuit breaker"""
+    print("="*60)
+    print("TEST 8: Reintentos y Circuit Breaker")
+    print("="*60)
+
+    import asyncio
+    from src.common.retry import (
+        retry_on_failure, async_retry_on_failure, RetryBudget,
+        get_circuit_breaker, _compute_delay
+    )
+    from src.common.exceptions import TransientAPIError, CircuitOpenError
+
+    # Full jitter: siempre dentro de [0, delay * backoff^(n-1)]
+    delays = [_compute_delay(3, 1, 2, 60, True, ValueError()) for _ in range(50)]
+    assert all(0 <= d <= 4 for d in delays) and len(set(delays)) > 1
+    assert _compute_delay(1, 1, 2, 60, True, TransientAPIError("429", retry_after=7)) >= 7
+    print("✓ Full jitter y Retry-After")
+
+    # Presupuesto agotado: no se reintenta
+    budget = RetryBudget(limit=1)
+    calls = []
+
+    @retry_on_failure(max_attempts=5, delay=0.01, exceptions=(ValueError,), budget=budget)
+    def always_fails():
+        calls.append(1)
+        raise ValueError("fallo")
+
+    try:
+        always_fails()
+    except ValueError:
+        pass
+    assert len(calls) == 2, f"❌ Se esperaban 2 llamadas, hubo {len(calls)}"
+    print("✓ Presupuesto de reintentos respetado")
+
+    # Circuit breaker: se abre tras el umbral y falla rápido
+    breaker = get_circuit_breaker("test_endpoint")
+    breaker.failure_threshold = 2
+    calls.clear()
+
+    @retry_on_failure(max_attempts=5, delay=0.01, exceptions=(ValueError,),
+                      circuit_key="test_endpoint", budget=None)
+    def upstream_down():
+        calls.append(1)
+        raise ValueError("caído")
+
+    for _ in range(2):
+        try:
+            upstream_down()
+        except (ValueError, CircuitOpenError):
+            pass
+    assert breaker.state == "open"
+    assert len(calls) == 2, f"❌ El circuito abierto no cortó las llamadas ({len(calls)})"
+    print("✓ Circuit breaker abierto tras 2 fallos")
+
+    # Prueba en half_open con un error no reintentable: no queda atascado
+    from src.common.exceptions import APIResponseError
+    breaker.recovery_timeout = 0
+    probe_errors = [APIResponseError("respuesta inválida")]
+
+    @retry_on_failure(max_attempts=2, delay=0.01, exceptions=(ValueError,),
+                      circuit_key="test_endpoint", budget=None)
+    def probe():
+        if probe_errors:
+            raise probe_errors.pop()
+        return "ok"
+
+    try:
+        probe()
+        assert False, "❌ Se esperaba APIResponseError"
+    except APIResponseError:
+        pass
+    assert breaker.state == "open", f"❌ Circuito en {breaker.state} tras la prueba fallida"
+    assert probe() == "ok" and breaker.state == "closed"
+    print("✓ Prueba fallida con error no reintentable no bloquea el circuito")
+
+    # Variante async
+    attempts = []
+
+    @async_retry_on_failure(max_attempts=3, delay=0.01, exceptions=(ValueError,), budget=None)
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ValueError("transitorio")
+        return "ok"
+
+    assert asyncio.run(flaky()) == "ok" and len(attempts) == 3
+    print("✓ Variante async")
+    print("✅ TEST 8 PASADO\n")
+
+
+def test_single_flight():
+    """Test 9: Verificar de-duplicación de requests en curso"""
+    print("="*60)
+    print("TEST 9: Single-Flight")
+    print("="*60)
+
+    import threading
+    from src.fetcher.single_flight import SingleFlight
+
+    flight = SingleFlight()
+    executions = []
+    results = []
+
+    def slow_request():
+        executions.append(1)
+        time.sleep(0.2)
+        return {"response": [1]}
+
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("fixtures:39:2023", slow_request)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(executions) == 1, f"❌ Se ejecutaron {len(executions)} requests"
+    assert len(results) == 5 and all(r is results[0] for r in results)
+
+    # Las claves distintas no se agrupan y los errores se propagan a todos
+    def failing():
+        raise ValueError("upstream caído")
+
+    try:
+        flight.do("otra", failing)
+        raise AssertionError("❌ El error no se propagó")
+    except ValueError:
+        pass
+
+    # Entre procesos: esperar al líder no cuenta misses y, con el lock
+    # tomado, se relee la caché antes de llamar a la API
+    import tempfile
+    from src.fetcher.http_client import APIFootballClient
+    from src.fetcher.response_cache import ResponseCache
+
+    data = {"response": [1]}
+
+    class OtherProcessFlight:
+        def do(self, key, fn, read_shared):
+            for attempt in range(5):
+                if attempt == 3:
+                    client.cache.set("fixtures", {"id": 1}, data, 60)
+                shared = read_shared()
+                if shared is not None:
+                    return shared
+            return fn()
+
+    class NoNetwork:
+        def get(self, *args, **kwargs):
+            raise AssertionError("❌ Request a la API con la respuesta ya en caché")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = APIFootballClient(api_key="test", cache=ResponseCache(cache_dir=tmp))
+        client.session = NoNetwork()
+
+        client.distributed_flight = OtherProcessFlight()
+        assert client.get("fixtures", {"id": 1}) == data
+        assert client.cache.stats()["misses"] == 1, client.cache.stats()
+
+        # El otro proceso publica justo antes de que este tome el lock
+        class LateLockFlight:
+            def do(self, key, fn, read_shared):
+                client.cache.set("fixtures", {"id": 2}, data, 60)
+                return fn()
+
+        client.distributed_flight = LateLockFlight()
+        assert client.get("fixtures", {"id": 2}) == data
+        assert client.cache.stats()["misses"] == 2
+
+    print(f"✓ 5 llamadas concurrentes, 1 request ({flight.shared} compartidas)")
+    print("✅ TEST 9 PASADO\n")
+
+
+def test_backfill_plan():
+    """Test 10: Verificar plan de backfill con checkpoints y caché"""
+    print("="*60)
+    print("TEST 10: Plan de Backfill")
+    print("="*60)
+
+    from types import SimpleNamespace
+    import src.fetcher.backfill as backfill_module
+    from src.fetcher.backfill import build_units, plan_backfill
+    from backfill import parse_int_list
+
+    assert parse_int_list("2019-2021,2023") == [2019, 2020, 2021, 2023]
+
+    units = build_units([39, 140, 135], parse_int_list("2019-2023"))
+    assert len(units) == 15 and units[0] == (39, 2023), "❌ Orden de unidades inesperado"
+
+    class StubCache:
+        def contains(self, endpoint, params):
+            return params["season"] == 2019
+
+    completed = {(39, 2023), (140, 2023)}
+    plan = plan_backfill(units, completed, StubCache(), daily_budget=4)
+
+    assert len(plan["pending"]) == 13
+    assert plan["cached"] == 3
+    assert plan["cost"] == 10
+    assert plan["estimated_days"] == 3
+    assert len(plan["days"][0]) == 3 + 4, "❌ Las unidades en caché deben ir el primer día"
+    assert not set(plan["days"][0]) & completed
+
+    # Hoy solo queda cuota para 1 request: el resto pasa a días siguientes
+    today = plan_backfill(units, completed, StubCache(), daily_budget=4, today_budget=1)
+    assert len(today["days"][0]) == 3 + 1 and today["estimated_days"] == 4, today["days"]
+
+    # Ejecución: la cuota real se lee tras la primera unidad y una unidad
+    # cuyo checkpoint no se guarda no cuenta como hecha
+    class FakeScheduler:
+        daily_limit = 100
+        known = None
+
+        def available_today(self, priority):
+            return self.known
+
+    class FakeRepo:
+        saved = []
+
+        def is_available(self):
+            return True
+
+        def get_completed(self):
+            return set(completed)
+
+        def mark_completed(self, league_id, season, filename):
+            if (league_id, season) == (39, 2022):
+                return False
+            self.saved.append((league_id, season))
+            return True
+
+    fetched = []
+
+    def fake_fetch_many(batch, concurrency=None, priority=None, on_result=None):
+        fetched.append(list(batch))
+        scheduler.known = 2
+        for league_id, season in batch:
+            on_result({"league_id": league_id, "season": season, "filename": "f", "error": None})
+
+    scheduler = FakeScheduler()
+    client = SimpleNamespace(scheduler=scheduler, cache=StubCache())
+    original = (backfill_module.BackfillCheckpointRepository, backfill_module.get_client,
+                backfill_module.fetch_fixtures_many)
+    backfill_module.BackfillCheckpointRepository = FakeRepo
+    backfill_module.get_client = lambda: client
+    backfill_module.fetch_fixtures_many = fake_fetch_many
+    try:
+        summary = backfill_module.run_backfill(units)
+    finally:
+        (backfill_module.BackfillCheckpointRepository, backfill_module.get_client,
+         backfill_module.fetch_fixtures_many) = original
+
+    assert fetched[0] == [(135, 2023)], fetched
+    assert len(fetched[1]) == 3 + 2 and (135, 2023) not in fetched[1], fetched
+    assert (39, 2022) not in FakeRepo.saved and summary["done"] == 5, (summary, FakeRepo.saved)
+    assert summary["remaining"] == 13 - 5
+
+    print(f"✓ Coste: {plan['cost']} requests en {plan['estimated_days']} días")
+    print("✅ TEST 10 PASADO\n")
+
+
+def test_raw_storage_dedup():
+    """Test 11: Verificar almacenamiento raw comprimido y de-duplicado"""
+    print("="*60)
+    print("TEST 11: Almacenamiento Raw")
+    print("="*60)
+
+    import tempfile
+    import src.fetcher.save_raw as save_raw_module
+    from src.cleaner import loader
+    from src.cleaner.loader import is_raw_file, read_raw_file
+
+    class StubRepo:
+        saved = 0
+
+        def is_available(self):
+            return True
+
+        def save_raw(self, data, country, season):
+            StubRepo.saved += 1
+            return "stub"
+
+    data = {"get": "leagues", "response": [{"league": {"id": 39, "name": "Liga ñ"}}]}
+    original = (save_raw_module.RAW_DIR, save_raw_module.LATEST_DIR,
+                save_raw_module.RAW_DEDUP_MODE, save_raw_module.LeagueRepository)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        save_raw_module.RAW_DIR = tmp
+        save_raw_module.LATEST_DIR = os.path.join(tmp, ".latest")
+        save_raw_module.LeagueRepository = StubRepo
+        try:
+            first = save_raw_module.save_raw(data, "leagues_test")
+            assert first.endswith(".json.gz") and is_raw_file(os.path.basename(first))
+            assert read_raw_file(first) == data, "❌ El archivo comprimido no se lee igual"
+
+            # Snapshot idéntico: no se escribe ni se guarda en MongoDB
+            assert save_raw_module.save_raw(data, "leagues_test") == first
+            assert StubRepo.saved == 1
+
+            # Modo link: nuevo nombre, mismo inodo
+            save_raw_module.RAW_DEDUP_MODE = "link"
+            time.sleep(1.1)
+            linked = save_raw_module.save_raw(data, "leagues_test")
+            assert linked != first and os.path.samefile(linked, first)
+
+            # El cleaner no vuelve a procesar el enlace
+            original_raw_dir = loader.RAW_DIR
+            loader.RAW_DIR = tmp
+            try:
+                assert loader.list_raw_files() == [os.path.join(tmp, os.path.basename(first))]
+            finally:
+                loader.RAW_DIR = original_raw_dir
+
+            # Contenido distinto: nuevo snapshot
+            time.sleep(1.1)
+            changed = save_raw_module.save_raw({"get": "leagues", "response": []}, "leagues_test")
+            assert changed not in (first, linked) and StubRepo.saved == 2
+        finally:
+            (save_raw_module.RAW_DIR, save_raw_module.LATEST_DIR,
+             save_raw_module.RAW_DEDUP_MODE, save_raw_module.LeagueRepository) = original
+
+    print("✓ gzip + de-duplicación por hash (skip y link)")
+    print("✅ TEST 11 PASADO\n")
+
+
+def test_raw_fixtures_documents():
+    """Test 12: Verificar documentos raw por partido"""
+    print("="*60)
+    print("TEST 12: Raw Fixtures por Partido")
+    print("="*60)
+
+    import tempfile
+    import time
+    from types import SimpleNamespace
+    import src.fetcher.save_raw as save_raw_module
+    from src.database.models import RawFixtureModel
+    from src.database.repositories import RawFixturesRepository
+
+    item = {
+        "fixture": {"id": 1001, "status": {"short": "NS"}},
+        "league": {"id": 39, "season": 2023},
+        "goals": {"home": None, "away": None},
+    }
+    reordered = {"goals": item["goals"], "league": item["league"], "fixture": item["fixture"]}
+    changed = {**item, "goals": {"home": 1, "away": 0}}
+
+    doc = RawFixtureModel.create(item)
+    assert doc["fixture_id"] == 1001 and doc["league_id"] == 39 and doc["season"] == 2023
+    assert doc["status"] == "NS" and doc["data"] == item
+    assert RawFixtureModel.content_hash(reordered) == doc["content_hash"], "❌ Hash depende del orden"
+    assert RawFixtureModel.content_hash(changed) != doc["content_hash"]
+
+    class StubFixturesRepo:
+        saved = []
+
+        def is_available(self):
+            return True
+
+        def save_raw(self, data):
+            StubFixturesRepo.saved.append(data)
+            return {"inserted": len(data["response"]), "unchanged": 0}
+
+    class FailingLeagueRepo:
+        def __init__(self):
+            raise AssertionError("❌ fixtures no deben ir a raw_leagues")
+
+    original = (save_raw_module.RAW_DIR, save_raw_module.LATEST_DIR,
+                save_raw_module.RawFixturesRepository, save_raw_module.LeagueRepository)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        save_raw_module.RAW_DIR = tmp
+        save_raw_module.LATEST_DIR = os.path.join(tmp, ".latest")
+        save_raw_module.RawFixturesRepository = StubFixturesRepo
+        save_raw_module.LeagueRepository = FailingLeagueRepo
+        try:
+            data = {"get": "fixtures", "response": [item]}
+            save_raw_module.save_raw(data, "fixtures_39_2023", country="league_39", season=2023)
+            assert StubFixturesRepo.saved == [data]
+        finally:
+            (save_raw_module.RAW_DIR, save_raw_module.LATEST_DIR,
+             save_raw_module.RawFixturesRepository, save_raw_module.LeagueRepository) = original
+
+    # A -> B -> A: la versión vigente es la vista más recientemente
+    class FakeRawFixtures:
+        def __init__(self):
+            self.docs = []
+
+        def bulk_write(self, operations, ordered=True):
+            inserted = matched = 0
+            for op in operations:
+                doc = next((d for d in self.docs
+                            if all(d[k] == v for k, v in op._filter.items())), None)
+                if doc is None:
+                    doc = dict(op._doc["$setOnInsert"])
+                    self.docs.append(doc)
+                    inserted += 1
+                else:
+                    matched += 1
+                doc.update(op._doc["$set"])
+            return SimpleNamespace(upserted_count=inserted, matched_count=matched)
+
+        def _latest(self, fixture_id, sort):
+            docs = [d for d in self.docs if d["fixture_id"] == fixture_id]
+            for field, direction in reversed(sort):
+                docs.sort(key=lambda d: d[field], reverse=direction == -1)
+            return docs[0]
+
+        def find_one(self, query, projection=None, sort=None):
+            return self._latest(query["fixture_id"], sort)
+
+        def aggregate(self, pipeline):
+            sort = [(f, d) for f, d in pipeline[1]["$sort"].items() if f != "fixture_id"]
+            ids = sorted({d["fixture_id"] for d in self.docs})
+            return iter([{"_id": i, "data": self._latest(i, sort)["data"]} for i in ids])
+
+    repo = RawFixturesRepository.__new__(RawFixturesRepository)
+    repo.db = object()
+    repo.collection = FakeRawFixtures()
+    for version in (item, changed, item):
+        repo.save_raw({"get": "fixtures", "response": [version]})
+        time.sleep(0.01)
+    assert len(repo.collection.docs) == 2
+    assert repo.get_latest(1001) == item, "❌ get_latest devolvió una versión antigua"
+    assert repo.get_latest_by_league(39, 2023)["response"] == [item]
+
+    print("✓ Un documento por fixture, hash estable por contenido")
+    print("✅ TEST 12 PASADO\n")
+
+
+def test_mongo_connection_manager():
+    """Test 13: Verificar caché de fallos y reconexión de MongoDB"""
+    print("="*60)
+    print("TEST 13: Conexión MongoDB sin Bloqueos")
+    print("="*60)
+
+    from src.database.connection import ConnectionManager
+
+    manager = ConnectionManager(
+        mongo_url="mongodb://127.0.0.1:1/", timeout_ms=200, min_delay=0.1, max_delay=0.2
+    )
+    try:
+        assert manager.get_db() is None
+        assert manager.metrics()["state"] == "disconnected"
+
+        # Llamadas siguientes: sin esperar el timeout de conexión
+        start = time.monotonic()
+        for _ in range(50):
+            assert manager.get_db() is None and not manager.is_available()
+        elapsed = time.monotonic() - start
+        assert elapsed < 0.1, f"❌ get_db bloquea tras un fallo ({elapsed:.2f}s)"
+
+        # Reconexión en segundo plano con backoff
+        time.sleep(1.0)
+        metrics = manager.metrics()
+        assert metrics["total_failures"] >= 2, "❌ No se reintentó en segundo plano"
+        assert metrics["last_error"] and metrics["available"] is False
+    finally:
+        manager.close()
+
+    assert manager.metrics()["state"] == "idle"
+    print(f"✓ Fallos registrados: {metrics['total_failures']}, 50 llamadas en {elapsed*1000:.1f} ms")
+    print("✅ TEST 13 PASADO\n")
+
+
+def test_async_repository_offload():
+    """Test 14: Verificar repositorios asíncronos sin bloquear el event loop"""
+    print("="*60)
+    print("TEST 14: Repositorios Asíncronos")
+    print("="*60)
+
+    import asyncio
+    from src.database.async_repositories import AsyncRepository
+
+    class SlowRepo:
+        def is_available(self):
+            return True
+
+        def count_leagues(self):
+            time.sleep(0.2)
+            return 42
+
+    async def scenario():
+        repo = AsyncRepository(SlowRepo())
+        assert repo.is_available() is True
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(10):
+                await asyncio.sleep(0.02)
+                ticks += 1
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(repo.count_leagues() for _ in range(5)), ticker())
+        return results[:5], time.monotonic() - start, ticks
+
+    counts, elapsed, ticks = asyncio.run(scenario())
+
+    assert counts == [42] * 5
+    assert elapsed < 0.5, f"❌ Las consultas no se ejecutaron en paralelo ({elapsed:.2f}s)"
+    assert ticks == 10, "❌ El event loop quedó bloqueado"
+
+    print(f"✓ 5 consultas de 0.2s en {elapsed:.2f}s, event loop libre")
+    print("✅ TEST 14 PASADO\n")
+
+
+def test_paginated_counts():
+    """Test 15: Verificar paginación con total en una sola consulta"""
+    print("="*60)
+    print("TEST 15: Paginación con Totales Reales")
+    print("="*60)
+
+    from src.database.repositories import _paginate, invalidate_count_cache
+
+    class FakeCursor(list):
+        def sort(self, sort):
+            return self
+
+        def skip(self, n):
+            return FakeCursor(self[n:])
+
+        def limit(self, n):
+            return FakeCursor(self[:n])
+
+    class FakeCollection:
+        name = "fake_fixtures"
+
+        def __init__(self, docs):
+            self.docs = docs
+            self.pipelines = []
+            self.counts = 0
+
+        def find(self, query=None, projection=None):
+            return FakeCursor(dict(d) for d in self.docs)
+
+        def estimated_document_count(self):
+            self.counts += 1
+            return len(self.docs)
+
+        def aggregate(self, pipeline):
+            self.pipelines.append(pipeline)
+            league = pipeline[0]["$match"]["liga_id"]
+            matched = [dict(d) for d in self.docs if d["liga_id"] == league]
+            facet = pipeline[-1]["$facet"]
+            skip, limit = facet["items"][0]["$skip"], facet["items"][1]["$limit"]
+            return iter([{"items": matched[skip:skip + limit], "total": [{"count": len(matched)}]}])
+
+    docs = [{"_id": i, "liga_id": 39 if i < 12000 else 140} for i in range(12500)]
+    collection = FakeCollection(docs)
+    invalidate_count_cache()
+
+    # Con filtro: una sola agregación, total real (> 10000)
+    items, total, has_more = _paginate(collection, {"liga_id": 39}, page=3, limit=50, sort=[("fecha", -1)])
+    assert total == 12000, f"❌ Total incorrecto: {total}"
+    assert [d["_id"] for d in items] == [str(i) for i in range(100, 150)] and has_more
+    assert len(collection.pipelines) == 1 and "$sort" in collection.pipelines[0][1]
+    assert not _paginate(collection, {"liga_id": 39}, page=240, limit=50)[2], "❌ Última página con siguiente"
+
+    # Sin filtro: conteo cacheado de la colección
+    _paginate(collection, {}, page=1, limit=10)
+    _, total, _ = _paginate(collection, {}, page=2, limit=10)
+    assert total == 12500 and collection.counts == 1, "❌ Conteo sin filtro no cacheado"
+
+    invalidate_count_cache("fake_fixtures")
+    _paginate(collection, {}, page=1, limit=10)
+    assert collection.counts == 2
+
+    print("✓ Total con filtro: 12000 en 1 agregación; conteos sin filtro cacheados")
+    print("✅ TEST 15 PASADO\n")
+
+
+def test_keyset_cursor_pagination():
+    """Test 16: Verificar paginación por cursor (keyset)"""
+    print("="*60)
+    print("TEST 16: Paginación por Cursor")
+    print("="*60)
+
+    from src.database.repositories import (
+        _paginate, _next_cursor, decode_cursor, encode_cursor,
+        invalidate_count_cache, FIXTURES_SORT
+    )
+
+    def matches(doc, query):
+        for field, cond in query.items():
+            if field == "$or":
+                if not any(matches(doc, branch) for branch in cond):
+                    return False
+            elif field == "$and":
+                if not all(matches(doc, branch) for branch in cond):
+                    return False
+            elif isinstance(cond, dict):
+                # Como en MongoDB, $lt/$gt nunca comparan contra null/ausente
+                value = doc.get(field)
+                if "$lt" in cond and (value is None or not value < cond["$lt"]):
+                    return False
+                if "$gt" in cond and (value is None or not value > cond["$gt"]):
+                    return False
+                if "$ne" in cond and value == cond["$ne"]:
+                    return False
+            elif doc.get(field) != cond:
+                return False
+        return True
+
+    class FakeCursor(list):
+        def sort(self, sort):
+            # null/ausente antes que cualquier valor, como en MongoDB
+            for field, direction in reversed(sort):
+                super().sort(key=lambda d: (d.get(field) is not None, d.get(field)), reverse=direction == -1)
+            return self
+
+        def limit(self, n):
+            return FakeCursor(self[:n])
+
+    class FakeCollection:
+        name = "fake_keyset"
+
+        def __init__(self, docs):
+            self.docs = docs
+            self.queries = []
+
+        def find(self, query=None, projection=None):
+            self.queries.append(query)
+            return FakeCursor(dict(d) for d in self.docs if matches(d, query or {}))
+
+        def count_documents(self, query):
+            return sum(1 for d in self.docs if matches(d, query))
+
+    # Varias fechas repetidas para probar el desempate por id_partido y
+    # fixtures sin fecha (null o ausente), que van al final; 25 documentos =
+    # 5 páginas justas (la última no debe dar cursor)
+    docs = [
+        {"_id": i, "id_partido": i, "liga_id": 39, "fecha": f"2023-08-{10 + i // 4:02d}"}
+        for i in range(25)
+    ]
+    for i in (3, 11, 17):
+        docs[i]["fecha"] = None
+    del docs[20]["fecha"]
+    collection = FakeCollection(docs)
+
+    def newest_first(doc):
+        return (doc.get("fecha") is not None, doc.get("fecha"), doc["id_partido"])
+    invalidate_count_cache()
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        after = decode_cursor(cursor, len(FIXTURES_SORT)) if cursor else None
+        if after is None:
+            items = sorted(docs, key=newest_first, reverse=True)[:5]
+            items, has_more = [dict(d, _id=str(d["_id"])) for d in items], True
+        else:
+            items, total, has_more = _paginate(collection, {"liga_id": 39}, 1, 5, FIXTURES_SORT, after)
+            assert total == 25
+        assert len(items) == 5, "❌ Página vacía o incompleta"
+        seen.extend(d["id_partido"] for d in items)
+        pages += 1
+        cursor = _next_cursor(items, has_more, FIXTURES_SORT)
+        if cursor is None:
+            break
+
+    expected = [d["id_partido"] for d in sorted(docs, key=newest_first, reverse=True)]
+    assert seen == expected, "❌ El recorrido por cursor perdió o repitió fixtures"
+    assert pages == 5
+
+    # Sin skip: cada página filtra por la clave del último documento
+    assert all("$and" in q for q in collection.queries)
+
+    assert decode_cursor(encode_cursor(["2023-08-10", 7]), 2) == ["2023-08-10", 7]
+    for bad in ("no-es-un-cursor", encode_cursor([1])):
+        try:
+            decode_cursor(bad, 2)
+            assert False, "❌ Cursor inválido aceptado"
+        except ValueError:
+            pass
+
+    print(f"✓ {len(seen)} fixtures en {pages} páginas sin repetidos")
+    print("✅ TEST 16 PASADO\n")
+
+
+def test_api_response_cache():
+    """Test 17: Verificar caché de respuestas de la API con ETag/304"""
+    print("="*60)
+    print("TEST 17: Caché de Respuestas API")
+    print("="*60)
+
+    import asyncio
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+    import api.response_cache as api_cache
+
+    calls = {"count": 0}
+
+    async def leagues(request):
+        calls["count"] += 1
+        return JSONResponse({"total": calls["count"]})
+
+    app = Starlette(routes=[Route("/api/leagues", leagues)])
+    app.add_middleware(api_cache.ResponseCacheMiddleware)
+
+    def request(path, query="", headers=None):
+        scope = {
+            "type": "http", "method": "GET", "path": path, "raw_path": path.encode(),
+            "query_string": query.encode(), "root_path": "", "scheme": "http",
+            "server": ("test", 80), "client": ("test", 1234), "http_version": "1.1",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        }
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(app(scope, receive, send))
+        start = messages[0]
+        body = b"".join(m.get("body", b"") for m in messages[1:])
+        return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}, body
+
+    class FixedVersion(api_cache.DatasetVersion):
+        def refresh(self):
+            self._update(self.version)
+            return self.version
+
+        def bump(self, source=""):
+            self.version += 1
+            return self.version
+
+    original = (api_cache.dataset_version, api_cache.response_cache)
+    api_cache.dataset_version = FixedVersion(check_interval=3600)
+    api_cache.response_cache = api_cache.APIResponseCache(ttl=60, max_entries=2)
+    try:
+        status, headers, body = request("/api/leagues", "page=1&limit=5")
+        assert status == 200 and headers["x-cache"] == "MISS" and body == b'{"total":1}'
+        etag = headers["etag"]
+
+        # Mismos parámetros en otro orden: servido desde caché
+        status, headers, body = request("/api/leagues", "limit=5&page=1")
+        assert headers["x-cache"] == "HIT" and body == b'{"total":1}' and calls["count"] == 1
+
+        # ETag vigente: 304 sin cuerpo
+        status, headers, body = request("/api/leagues", "page=1&limit=5", {"If-None-Match": etag})
+        assert status == 304 and body == b""
+
+        # Nueva versión del dataset: se regenera y cambia el ETag
+        api_cache.invalidate_api_cache("test")
+        status, headers, body = request("/api/leagues", "page=1&limit=5", {"If-None-Match": etag})
+        assert status == 200 and headers["etag"] != etag and calls["count"] == 2
+
+        # LRU: con 2 entradas máximo se expulsa la menos usada
+        request("/api/leagues", "page=2")
+        request("/api/leagues", "page=3")
+        assert api_cache.response_cache.stats()["entries"] == 2
+    finally:
+        api_cache.dataset_version, api_cache.response_cache = original
+
+    print("✓ HIT/MISS, 304 con ETag e invalidación por versión")
+    print("✅ TEST 17 PASADO\n")
+
+
+def test_fast_serialization():
+    """Test 18: Verificar serialización rápida de respuestas paginadas"""
+    print("="*60)
+    print("TEST 18: Serialización Rápida")
+    print("="*60)
+
+    import json
+    import api.serialization as serialization
+    from api.models.schemas import FixtureResponse, PaginatedFixturesResponse
+    from src.database.repositories import _projection, FIXTURES_SORT
+
+    fields = serialization.response_fields(FixtureResponse)
+    projection = _projection(fields, FIXTURES_SORT)
+    assert projection["_id"] == 0 and "created_at" not in projection
+    assert all(projection[f] == 1 for f in fields)
+
+    doc = {
+        "id_partido": 1, "equipo_local": "A", "equipo_visitante": "B",
+        "id_equipo_local": 10, "id_equipo_visitante": 20,
+        "estado_del_partido": "Partido Finalizado", "fecha": "2023-08-12", "hora": None,
+        "goles_local_1MT": "1", "goles_local_TR": "2",
+        "goles_visitante_1MT": "0", "goles_visitante_TR": "0",
+        "liga_id": 39, "liga_nombre": "Premier League", "ronda": "1",
+    }
+
+    response = serialization.paginated_response(FixtureResponse, [doc], 1, 1, 50, "abc")
+    payload = json.loads(response.body)
+
+    # Mismo contenido que con response_model (campos ausentes como null)
+    expected = PaginatedFixturesResponse(
+        total=1, page=1, limit=50, data=[FixtureResponse(**doc)], next_cursor="abc"
+    ).model_dump(mode="json")
+    assert payload == expected, "❌ La respuesta difiere del schema"
+    assert payload["data"][0]["hora"] is None
+
+    # Con validación activada se valida la página completa de una vez
+    original = serialization.API_VALIDATE_RESPONSES
+    serialization.API_VALIDATE_RESPONSES = True
+    try:
+        assert json.loads(serialization.paginated_response(FixtureResponse, [doc], 1, 1, 50).body)["data"] == expected["data"]
+        try:
+            serialization.paginated_response(FixtureResponse, [{**doc, "liga_id": "x"}], 1, 1, 50)
+            assert False, "❌ Página inválida aceptada"
+        except Exception:
+            pass
+    finally:
+        serialization.API_VALIDATE_RESPONSES = original
+
+    print(f"✓ JSON con {'orjson' if serialization.orjson else 'json'}, idéntico al schema")
+    print("✅ TEST 18 PASADO\n")
+
+
+def test_materialized_stats():
+    """Test 19: Verificar estadísticas materializadas"""
+    print("="*60)
+    print("TEST 19: Estadísticas Materializadas")
+    print("="*60)
+
+    from src.database.repositories import FixturesRepository
+
+    class FakeFixtures:
+        def __init__(self):
+            self.aggregations = 0
+
+        def aggregate(self, pipeline):
+            self.aggregations += 1
+            return iter([{
+                "total": [{"count": 5}],
+                "ligas": [{"_id": 39, "count": 3}, {"_id": 140, "count": 2}],
+                "estados": [{"_id": "Partido Finalizado"}, {"_id": "No Iniciado"}, {"_id": None}],
+            }])
+
+    class FakeStats:
+        def __init__(self):
+            self.docs = {}
+
+        def replace_one(self, query, doc, upsert=False):
+            self.docs[query["_id"]] = doc
+
+        def find_one(self, query, projection=None):
+            doc = self.docs.get(query["_id"])
+            if doc is None:
+                return None
+            return {k: v for k, v in doc.items() if projection.get(k, 1) != 0}
+
+    repo = FixturesRepository.__new__(FixturesRepository)
+    repo.db = object()
+    repo.collection = FakeFixtures()
+    repo.stats_collection = FakeStats()
+
+    # Sin documento materializado: se calcula y se guarda una vez
+    stats = repo.get_fixtures_stats()
+    assert stats["total_fixtures"] == 5 and stats["ligas"] == [39, 140]
+    assert stats["fixtures_por_liga"] == {"39": 3, "140": 2}
+    assert stats["estados"] == ["No Iniciado", "Partido Finalizado"]
+
+    # Lecturas siguientes: un solo documento, sin recorrer la colección
+    for _ in range(3):
+        assert repo.get_fixtures_stats() == stats
+    assert repo.collection.aggregations == 1, "❌ Stats recalculadas en cada lectura"
+
+    print(f"✓ Stats: {stats['total_fixtures']} fixtures en {stats['total_ligas']} ligas, 1 agregación")
+    print("✅ TEST 19 PASADO\n")
+
+
+def test_fixtures_bulk_upsert():
+    """Test 20: Verificar upsert masivo de fixtures con detección de cambios"""
+    print("="*60)
+    print("TEST 20: Upsert Masivo de Fixtures")
+    print("="*60)
+
+    import pandas as pd
+    from types import SimpleNamespace
+    from src.database.repositories import FixturesRepository
+
+    class FakeFixtures:
+        name = "fake_bulk_fixtures"
+
+        def __init__(self):
+            self.docs = {}
+            self.bulk_calls = 0
+
+        def find(self, query, projection=None):
+            ids = query["id_partido"]["$in"]
+            return [dict(self.docs[i]) for i in ids if i in self.docs]
+
+        def bulk_write(self, operations, ordered=True):
+            self.bulk_calls += 1
+            inserted = modified = 0
+            for op in operations:
+                key = op._filter["id_partido"]
+                update = op._doc
+                if key in self.docs:
+                    self.docs[key].update(update["$set"])
+                    modified += 1
+                else:
+                    self.docs[key] = {**update["$set"], **update["$setOnInsert"]}
+                    inserted += 1
+            return SimpleNamespace(upserted_count=inserted, modified_count=modified, matched_count=modified)
+
+    def row(i, goles="0"):
+        return {
+            "id_partido": i, "equipo_local": "A", "equipo_visitante": "B",
+            "id_equipo_local": 1, "id_equipo_visitante": 2,
+            "estado_del_partido": "Partido Finalizado", "fecha": "2023-08-12", "hora": "15:00",
+            "goles_local_1MT": "0", "goles_local_TR": goles,
+            "goles_visitante_1MT": "0", "goles_visitante_TR": "0",
+            "liga_id": 39, "liga_nombre": "Premier League", "ronda": "1",
+        }
+
+    repo = FixturesRepository.__new__(FixturesRepository)
+    repo.db = object()
+    repo.collection = FakeFixtures()
+
+    counts = repo.save_fixtures_batch(pd.DataFrame([row(i) for i in range(250)]), batch_size=100)
+    assert counts == {"inserted": 250, "updated": 0, "unchanged": 0, "errors": 0}, counts
+    assert repo.collection.bulk_calls == 3, "❌ Se esperaba un bulk_write por lote"
+    created_at = repo.collection.docs[5]["created_at"]
+
+    # Segunda carga: 1 cambio, 1 nuevo, resto sin tocar
+    rows = [row(i, goles="3" if i == 5 else "0") for i in range(250)] + [row(999)]
+    counts = repo.save_fixtures_batch(pd.DataFrame(rows), batch_size=100)
+    assert counts == {"inserted": 1, "updated": 1, "unchanged": 249, "errors": 0}, counts
+    assert repo.collection.docs[5]["goles_local_TR"] == "3"
+    assert repo.collection.docs[5]["created_at"] == created_at, "❌ created_at sobrescrito"
+
+    print(f"✓ Segunda carga: {counts}")
+    print("✅ TEST 20 PASADO\n")
+
+
+def test_league_upserts_and_compaction():
+    """Test 21: Verificar upserts de ligas y compactación de duplicados"""
+    print("="*60)
+    print("TEST 21: Upserts y Compactación de Ligas")
+    print("="*60)
+
+    import pandas as pd
+    from types import SimpleNamespace
+    import src.database.repositories as repositories
+    from src.database.repositories import LeagueRepository
+
+    class FakeLeagues:
+        name = "fake_clean_leagues"
+
+        def __init__(self, docs=None):
+            self.docs = docs or []
+            self.operations = []
+
+        def bulk_write(self, operations, ordered=True):
+            self.operations.extend(operations)
+            keys = {(d["league_id"], d["season"]) for d in self.docs}
+            inserted = 0
+            for op in operations:
+                key = (op._filter["league_id"], op._filter["season"])
+                if key not in keys:
+                    self.docs.append({**op._doc["$set"], **op._doc["$setOnInsert"]})
+                    keys.add(key)
+                    inserted += 1
+            matched = len(operations) - inserted
+            return SimpleNamespace(upserted_count=inserted, modified_count=0, matched_count=matched)
+
+        def aggregate(self, pipeline, allowDiskUse=False):
+            groups = {}
+            for doc in sorted(self.docs, key=lambda d: (d["created_at"], d["_id"]), reverse=True):
+                groups.setdefault((doc["league_id"], doc["season"]), []).append(doc["_id"])
+            return iter([{"_id": k, "ids": ids, "count": len(ids)} for k, ids in groups.items() if len(ids) > 1])
+
+        def delete_many(self, query):
+            ids = set(query["_id"]["$in"])
+            before = len(self.docs)
+            self.docs = [d for d in self.docs if d["_id"] not in ids]
+            return SimpleNamespace(deleted_count=before - len(self.docs))
+
+        def count_documents(self, query):
+            return len(self.docs)
+
+    df = pd.DataFrame([
+        {"league_id": 39, "league_name": "Premier League", "type": "League", "country": "England",
+         "season": season, "start": None, "end": None, "current": False}
+        for season in (2022, 2023, 2023)
+    ])
+
+    repo = LeagueRepository.__new__(LeagueRepository)
+    repo.db = object()
+    repo.clean_collection = FakeLeagues()
+
+    assert repo.save_clean_batch(df)["inserted"] == 2
+    counts = repo.save_clean_batch(df)
+    assert counts == {"inserted": 0, "updated": 0, "unchanged": 2, "errors": 0}, "❌ Recargar duplicó ligas"
+    assert len(repo.clean_collection.docs) == 2
+
+    # Colección heredada con 30 copias por liga
+    from datetime import datetime, timedelta
+    base = datetime(2024, 1, 1)
+    legacy = [
+        {"_id": n * 2 + s, "league_id": 39, "season": 2022 + s, "created_at": base + timedelta(days=n)}
+        for n in range(30) for s in range(2)
+    ]
+    repo.clean_collection = FakeLeagues(legacy)
+
+    original = repositories.ensure_clean_leagues_unique_index
+    repositories.ensure_clean_leagues_unique_index = lambda db: None
+    try:
+        assert repo.compact_duplicates(dry_run=True)["remaining"] == 60
+        summary = repo.compact_duplicates()
+    finally:
+        repositories.ensure_clean_leagues_unique_index = original
+
+    assert summary == {"duplicated_keys": 2, "removed": 58, "remaining": 2}, summary
+    assert {d["created_at"] for d in repo.clean_collection.docs} == {base + timedelta(days=29)}, \
+        "❌ No se conservó la copia más reciente"
+
+    print(f"✓ Compactación: {summary}")
+    print("✅ TEST 21 PASADO\n")
+
+
+def test_columnar_documents():
+    """Test 22: Verificar conversión columnar DataFrame -> documentos"""
+    print("="*60)
+    print("TEST 22: Conversión Columnar a Documentos")
+    print("="*60)
+
+    import numpy as np
+    import pandas as pd
+    from datetime import datetime
+    from src.database.models import FixturesModel, CleanLeagueModel, iter_dataframe_batches
+
+    fixtures = pd.DataFrame([
+        {
+            "id_partido": 100 + i, "equipo_local": "Arsenal", "equipo_visitante": "Chelsea",
+            "id_equipo_local": 42, "id_equipo_visitante": 49,
+            "estado_del_partido": "Partido Finalizado",
+            "fecha": ["2023-08-12", "", None][i % 3], "hora": ["15:00", None, "20:00"][i % 3],
+            "goles_local_1MT": i % 2, "goles_local_TR": "2",
+            "goles_visitante_1MT": None, "goles_visitante_TR": np.nan,
+            "liga_id": 39, "liga_nombre": "Premier League", "ronda": "Regular Season - 1",
+        }
+        for i in range(9)
+    ])
+    leagues = pd.DataFrame([
+        {"league_id": 39, "league_name": "Premier League", "type": "League", "country": "England",
+         "season": 2023, "start": "2023-08-11", "end": None, "current": True},
+        {"league_id": 140, "league_name": "La Liga", "type": "League", "country": None,
+         "season": 2022, "start": "", "end": np.nan, "current": 0},
+    ])
+
+    def strip(docs):
+        return [{k: v for k, v in d.items() if k not in ("created_at", "updated_at")} for d in docs]
+
+    # Mismo resultado que la conversión fila a fila
+    for model, df in ((FixturesModel, fixtures), (CleanLeagueModel, leagues)):
+        expected = [model.from_dataframe_row(r) for r in df.to_dict("records")]
+        docs = model.bulk_from_dataframe(df)
+        assert strip(docs) == strip(expected), f"❌ {model.__name__} difiere de from_dataframe_row"
+        assert all(type(a) is type(b) for d, e in zip(docs, expected) for a, b in zip(d.values(), e.values()))
+
+    # Una sola marca de tiempo por lote
+    timestamp = datetime(2024, 1, 1)
+    docs = FixturesModel.bulk_from_dataframe(fixtures, timestamp)
+    assert {d["created_at"] for d in docs} == {d["updated_at"] for d in docs} == {timestamp}
+
+    assert [len(chunk) for chunk in iter_dataframe_batches(fixtures, 4)] == [4, 4, 1]
+    assert CleanLeagueModel.bulk_from_dataframe(leagues.iloc[:0]) == []
+
+    print(f"✓ {len(docs)} fixtures y {len(leagues)} ligas idénticos a la conversión por fila")
+    print("✅ TEST 22 PASADO\n")
+
+
+def _normalize_fixtures_por_fila(raw_data):
+    """Normalizador fila a fila original (referencia para el test de paridad)"""
+    import pandas as pd
+    from datetime import datetime
+    from src.cleaner.fixtures_normalizer import ESTADO_MAP
+
+    records = []
+    for fixture_data in raw_data.get("response", []):
+        try:
+            fixture = fixture_data.get('fixture', {})
+            league = fixture_data.get('league', {})
+            teams = fixture_data.get('teams', {})
+            goals = fixture_data.get('goals', {})
+            score = fixture_data.get('score', {})
+
+            fixture_date = fixture.get('date', '')
+            if fixture_date:
+                dt = datetime.fromisoformat(fixture_date.replace('Z', '+00:00'))
+                fecha = dt.strftime('%Y-%m-%d')
+                hora = dt.strftime('%H:%M:%S.%f')
+            else:
+                fecha = None
+                hora = None
+
+            status_long = fixture.get('status', {}).get('long', 'Desconocido')
+            home_team = teams.get('home', {})
+            away_team = teams.get('away', {})
+            halftime = score.get('halftime', {})
+
+            records.append({
+                "equipo_local": home_team.get('name', 'Desconocido'),
+                "equipo_visitante": away_team.get('name', 'Desconocido'),
+                "estado_del_partido": ESTADO_MAP.get(status_long, status_long),
+                "fecha": fecha,
+                "goles_local_1MT": str(halftime.get('home', 0) or 0),
+                "goles_local_TR": str(goals.get('home', 0) or 0),
+                "goles_visitante_1MT": str(halftime.get('away', 0) or 0),
+                "goles_visitante_TR": str(goals.get('away', 0) or 0),
+                "hora": hora,
+                "id_equipo_local": home_team.get('id', 0),
+                "id_equipo_visitante": away_team.get('id', 0),
+                "id_partido": fixture.get('id', 0),
+                "liga_id": league.get('id', 0),
+                "liga_nombre": league.get('name', 'Desconocida'),
+                "ronda": league.get('round', 'N/A')
+            })
+        except Exception:
+            continue
+
+    return pd.DataFrame(records)
+
+
+def test_vectorized_fixtures_normalizer():
+    """Test 23: Verificar paridad del normalizador de fixtures por columnas"""
+    print("="*60)
+    print("TEST 23: Normalizador de Fixtures Vectorizado")
+    print("="*60)
+
+    import pandas as pd
+    from src.cleaner.fixtures_normalizer import normalize_fixtures
+
+    statuses = ["Match Finished", "Not Started", "Halftime", "Match Postponed", "Time to be defined"]
+    dates = [
+        "2023-08-12T14:00:00+00:00", "2023-08-12T21:30:00-03:00", "2023-08-13T11:00:00Z",
+        "2023-08-14T19:45:00.250000+01:00", "2023-08-15", "", None,
+    ]
+
+    def fixture(i):
+        return {
+            "fixture": {"id": 1000 + i, "date": dates[i % len(dates)],
+                        "status": {"long": statuses[i % len(statuses)]}},
+            "league": {"id": 39 + i % 3, "name": f"Liga {i % 3}", "round": f"Regular Season - {i % 38}"},
+            "teams": {"home": {"id": i, "name": f"Local {i}"}, "away": {"id": i + 1, "name": f"Visitante {i}"}},
+            "goals": {"home": [None, 0, 2][i % 3], "away": i % 4},
+            "score": {"halftime": {"home": [1, None][i % 2], "away": 0}},
+        }
+
+    response = [fixture(i) for i in range(500)]
+    # Campos ausentes, estado sin 'long' y objetos nulos (se descartan)
+    response += [
+        {"fixture": {"id": 1}},
+        {"fixture": {"id": 2, "date": "2023-09-01T10:00:00+00:00", "status": {}}, "teams": {"home": {}}},
+        {"fixture": None, "league": {"id": 1}},
+        {"fixture": {"id": 3, "date": "no-es-fecha"}},
+    ]
+    raw = {"response": response}
+
+    expected = _normalize_fixtures_por_fila(raw)
+    df = normalize_fixtures(raw)
+    pd.testing.assert_frame_equal(df, expected)
+
+    assert normalize_fixtures({"response": []}).empty
+    assert normalize_fixtures({"response": [{"fixture": None}]}).empty
+
+    print(f"✓ {len(df)} fixtures idénticos al normalizador fila a fila")
+    print("✅ TEST 23 PASADO\n")
+
+
+def test_polars_engine():
+    """Test 24: Verificar motor polars (lazy) contra el motor pandas"""
+    print("="*60)
+    print("TEST 24: Motor de Limpieza Polars")
+    print("="*60)
+
+    import json
+    import os
+    import tempfile
+    import pandas as pd
+    from src.cleaner import polars_engine
+    from src.cleaner.fixtures_normalizer import normalize_fixtures
+    from src.cleaner.validator import validate_dataframe
+    from src.cleaner.normalizer import normalize_leagues
+    from src.cleaner.manifest import merge_clean
+    from src.cleaner.save_clean import read_clean_csv
+
+    tmp = tempfile.mkdtemp()
+    original_dirs = (polars_engine.STAGING_DIR, polars_engine.CLEAN_DIR)
+    polars_engine.STAGING_DIR = os.path.join(tmp, "staging")
+    polars_engine.CLEAN_DIR = os.path.join(tmp, "clean")
+
+    dates = ["2023-08-12T14:00:00+00:00", "2023-08-12T21:30:00-03:00", "2023-08-13T11:00:00Z",
+             "2023-08-14T19:45:00.250000+01:00", "2023-08-15", "", None, "no-es-fecha"]
+
+    def fixture(i, file_idx):
+        return {
+            "fixture": {"id": 1000 + i % 300, "date": dates[i % len(dates)],
+                        "status": {"long": ["Match Finished", "Not Started", "Time to be defined"][i % 3]}},
+            "league": {"id": 39 + i % 2, "name": "Premier League", "round": "Regular Season - 1"},
+            "teams": {"home": {"id": i, "name": f"Local {i}"}, "away": {"id": i + 1, "name": "Visitante"}},
+            "goals": {"home": [None, 0, file_idx][i % 3], "away": i % 4},
+            "score": {"halftime": {"home": None, "away": 1}},
+        }
+
+    def league(i, file_idx=0):
+        return {
+            "league": {"id": i % 5, "name": f"Liga {i % 5}", "type": "League"},
+            "country": {"name": ["England", None][i % 2]},
+            "seasons": [{"year": 2022 + s, "start": "2022-08-01", "end": None, "current": s == (1 - file_idx)} for s in range(2)],
+        }
+
+    def write(name, payload):
+        path = os.path.join(tmp, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        return path
+
+    def read_back(df, kind):
+        path = os.path.join(tmp, f"pandas_{kind}.csv")
+        df.to_csv(path, index=False, encoding="utf-8")
+        return pd.concat(read_clean_csv(path, kind), ignore_index=True)
+
+    try:
+        # Fixtures: varios archivos con ids repetidos entre ellos
+        paths = [
+            write(f"fixtures_{f}.json", {"response": [fixture(i, f) for i in range(f * 100, f * 100 + 250)] + [{"fixture": None}]})
+            for f in range(4)
+        ]
+        filename, stats = polars_engine.clean_with_polars(paths, "fixtures", "fixtures_clean")
+
+        expected = pd.concat([normalize_fixtures(json.load(open(p))) for p in paths], ignore_index=True)
+        expected = expected.drop_duplicates(subset=["id_partido"], keep="last")
+        result = pd.concat(read_clean_csv(filename, "fixtures"), ignore_index=True)
+        pd.testing.assert_frame_equal(result, read_back(expected, "fixtures"))
+        assert stats["total"] == len(expected) and stats["ligas"] == 2, stats
+        assert stats["estados"] == expected["estado_del_partido"].unique().tolist(), stats
+        assert os.listdir(polars_engine.STAGING_DIR) == [], "❌ Quedaron archivos intermedios"
+        print(f"✓ Fixtures: {stats['total']} iguales al motor pandas")
+
+        # Ligas: validación y duplicados por (league_id, season) con "current" distinto
+        paths = [write(f"leagues_{f}.json", {"response": [league(i, f) for i in range(10)]}) for f in range(2)]
+        filename, stats = polars_engine.clean_with_polars(paths, "leagues", "clean_leagues")
+
+        expected = pd.concat([validate_dataframe(normalize_leagues(json.load(open(p)))) for p in paths], ignore_index=True)
+        expected = merge_clean(None, expected, "leagues")
+        result = pd.concat(read_clean_csv(filename, "leagues"), ignore_index=True)
+        pd.testing.assert_frame_equal(result, read_back(expected, "leagues"))
+        assert stats["temporadas"] == [2022, 2023] and stats["ligas"] == 5, stats
+        print(f"✓ Ligas: {stats['total']} iguales al motor pandas")
+    finally:
+        polars_engine.STAGING_DIR, polars_engine.CLEAN_DIR = original_dirs
+
+    assert polars_engine.resolve_engine("POLARS") == "polars"
+    try:
+        polars_engine.resolve_engine("spark")
+        assert False, "❌ Motor desconocido aceptado"
+    except ValueError:
+        pass
+
+    print("✅ TEST 24 PASADO\n")
+
+
+def test_streaming_raw_loader():
+    """Test 25: Verificar carga raw en streaming con pool de procesos"""
+    print("="*60)
+    print("TEST 25: Carga Raw en Streaming")
+    print("="*60)
+
+    import gzip
+    import json
+    import os
+    import tempfile
+    from concurrent.futures import Future
+    from src.cleaner import loader
+
+    tmp = tempfile.mkdtemp()
+    paths = []
+    for i in range(12):
+        path = os.path.join(tmp, f"fixtures_{i:02d}.json" + (".gz" if i % 2 else ""))
+        opener = gzip.open if i % 2 else open
+        with opener(path, "wt", encoding="utf-8") as f:
+            f.write("{roto" if i == 5 else json.dumps({"response": [{"n": i}]}))
+        paths.append(path)
+
+    # Pool real: mismo orden que los archivos, el archivo corrupto se omite
+    loaded = [data["response"][0]["n"] for _, data in loader.iter_raw_files(paths, workers=2, prefetch=3)]
+    assert loaded == [i for i in range(12) if i != 5], loaded
+    assert [d["response"][0]["n"] for _, d in loader.iter_raw_files(paths, workers=1)] == loaded
+
+    # transform se ejecuta en el pool: solo vuelve su resultado
+    sizes = [size for _, size in loader.iter_raw_files(paths, workers=2, prefetch=3, transform=len)]
+    assert sizes == [1] * 11, sizes
+
+    # Backpressure: nunca más de `prefetch` archivos pedidos sin consumir
+    class RecordingPool:
+        submitted = []
+
+        def __init__(self, max_workers):
+            pass
+
+        def submit(self, fn, path, *args):
+            self.submitted.append(path)
+            future = Future()
+            try:
+                future.set_result(fn(path, *args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            pass
+
+    original_pool = loader.ProcessPoolExecutor
+    loader.ProcessPoolExecutor = RecordingPool
+    try:
+        stream = loader.iter_raw_files(paths, workers=2, prefetch=3)
+        for consumed in range(1, 4):
+            next(stream)
+            assert len(RecordingPool.submitted) - consumed <= 3, "❌ Sin backpressure"
+        stream.close()
+        assert len(RecordingPool.submitted) < len(paths), "❌ Se leyeron archivos que nadie pidió"
+    finally:
+        loader.ProcessPoolExecutor = original_pool
+
+    original_dir = loader.RAW_DIR
+    loader.RAW_DIR = tmp
+    try:
+        assert len(loader.load_raw_files(pattern="fixtures_")) == 11
+    finally:
+        loader.RAW_DIR = original_dir
+
+    print(f"✓ {len(loaded)} archivos en orden, prefetch acotado a 3")
+    print("✅ TEST 25 PASADO\n")
+
+
+def test_incremental_cleaner():
+    """Test 26: Verificar limpieza incremental con manifiesto"""
+    print("="*60)
+    print("TEST 26: Limpieza Incremental")
+    print("="*60)
+
+    import json
+    import os
+    import tempfile
+    import main_fixtures_cleaner
+    from src.cleaner import loader, manifest, save_clean as save_clean_module
+
+    tmp = tempfile.mkdtemp()
+    raw_dir = os.path.join(tmp, "raw")
+    os.makedirs(raw_dir)
+    mongo_batches = []
+    mongo_down = [False]
+
+    def fake_save_to_mongo(frames, name):
+        mongo_batches.append(sum(len(f) for f in frames))
+        return None if mongo_down[0] else {"inserted": mongo_batches[-1], "updated": 0, "unchanged": 0, "errors": 0}
+
+    def write_raw(name, ids, goles):
+        path = os.path.join(raw_dir, name)
+        response = [{
+            "fixture": {"id": i, "date": "2024-01-06T15:00:00+00:00", "status": {"long": "Match Finished"}},
+            "league": {"id": 39, "name": "Premier League", "round": "Regular Season - 20"},
+            "teams": {"home": {"id": 1, "name": "Arsenal"}, "away": {"id": 2, "name": "Chelsea"}},
+            "goals": {"home": goles, "away": 0},
+            "score": {"halftime": {"home": 0, "away": 0}},
+        } for i in ids]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"get": "fixtures", "response": response}, f)
+        return path
+
+    def clean_rows():
+        current = manifest.load_manifest("fixtures_clean")["clean_file"]
+        df = read_csv(current)
+        return dict(zip(df["id_partido"], df["goles_local_TR"]))
+
+    def read_csv(path):
+        return save_clean_module.read_clean_csv(path, "fixtures", chunksize=None)
+
+    originals = (loader.RAW_DIR, save_clean_module.CLEAN_DIR, manifest.MANIFEST_DIR, save_clean_module.save_to_mongo)
+    loader.RAW_DIR = raw_dir
+    save_clean_module.CLEAN_DIR = os.path.join(tmp, "clean")
+    manifest.MANIFEST_DIR = os.path.join(tmp, "clean", ".manifest")
+    save_clean_module.save_to_mongo = fake_save_to_mongo
+
+    try:
+        write_raw("fixtures_39_2023_20240101_100000.json", range(1, 11), 0)
+        write_raw("fixtures_140_2023_20240101_100500.json", range(100, 105), 1)
+        assert main_fixtures_cleaner.run_fixtures_cleaner(engine="pandas")
+        assert mongo_batches == [15] and len(clean_rows()) == 15, mongo_batches
+
+        # Sin archivos nuevos: no se normaliza ni se escribe nada
+        assert main_fixtures_cleaner.run_fixtures_cleaner(engine="pandas")
+        assert mongo_batches == [15]
+
+        # Archivo nuevo: solo se procesa ese y se fusiona por id_partido
+        write_raw("fixtures_39_2023_20240102_100000.json", range(5, 13), 3)
+        assert main_fixtures_cleaner.run_fixtures_cleaner(engine="pandas")
+        rows = clean_rows()
+        assert mongo_batches[-1] == 8 and len(rows) == 17, (mongo_batches, len(rows))
+        assert rows[5] == "3" and rows[1] == "0" and rows[100] == "1"
+
+        # Cambiar mtime sin cambiar contenido no reprocesa
+        os.utime(os.path.join(raw_dir, "fixtures_140_2023_20240101_100500.json"))
+        assert main_fixtures_cleaner.run_fixtures_cleaner(engine="pandas")
+        assert len(mongo_batches) == 2
+
+        # Descarga más antigua que llega tarde: reconstrucción completa en
+        # orden de descarga (la de 2024-01-02 sigue ganando)
+        write_raw("fixtures_99_2023_20231231_000000.json", [5, 200], 9)
+        plan = manifest.plan_run(loader.list_raw_files("fixtures_"), manifest.load_manifest("fixtures_clean"))
+        assert plan["full"] and len(plan["paths"]) == 4, plan
+        assert main_fixtures_cleaner.run_fixtures_cleaner(engine="pandas")
+        rows = clean_rows()
+        assert rows[5] == "3" and rows[200] == "9" and len(rows) == 18, rows
+
+        # MongoDB caído: el CSV avanza pero la carga queda pendiente y la
+        # siguiente ejecución recarga el dataset completo
+        write_raw("fixtures_39_2023_20240103_100000.json", [300, 301], 0)
+        mongo_down[0] = True
+        assert main_fixtures_cleaner.run_fixtures_cleaner(engine="pandas")
+        assert manifest.load_manifest("fixtures_clean")["mongo_pending"]
+        mongo_down[0] = False
+        assert main_fixtures_cleaner.run_fixtures_cleaner(engine="pandas")
+        assert mongo_batches[-1] == 20, mongo_batches
+        assert not manifest.load_manifest("fixtures_clean")["mongo_pending"]
+
+        # Archivo corrupto: no se marca como procesado ni se reintenta
+        # hasta que cambie
+        broken = os.path.join(raw_dir, "fixtures_39_2023_20240104_100000.json")
+        with open(broken, "w", encoding="utf-8") as f:
+            f.write("{sin json")
+        assert main_fixtures_cleaner.run_fixtures_cleaner(engine="pandas")
+        state = manifest.load_manifest("fixtures_clean")
+        assert broken in state["failed"] and broken not in state["files"], state
+        batches = len(mongo_batches)
+        assert main_fixtures_cleaner.run_fixtures_cleaner(engine="pandas")
+        assert len(mongo_batches) == batches
+
+        write_raw("fixtures_39_2023_20240104_100000.json", [400], 2)
+        assert main_fixtures_cleaner.run_fixtures_cleaner(engine="pandas")
+        state = manifest.load_manifest("fixtures_clean")
+        assert broken in state["files"] and not state["failed"], state
+        assert mongo_batches[-1] == 1 and clean_rows()[400] == "2", mongo_batches
+    finally:
+        (loader.RAW_DIR, save_clean_module.CLEAN_DIR,
+         manifest.MANIFEST_DIR, save_clean_module.save_to_mongo) = originals
+
+    print(f"✓ Cargas a MongoDB por ejecución: {mongo_batches}")
+    print("✅ TEST 26 PASADO\n")
+
+
+def run_all_tests():
+    """Ejecutar todos los tests"""
+    print("\n" + "█"*60)
+    print("█" + " "*18 + "FASE 4: TESTS" + " "*18 + "█")
+    print("█"*60)
+
+    tests = [
+        test_token_bucket,
+        test_league_season_args,
+        test_shared_http_client,
+        test_response_cache,
+        test_quota_scheduler,
+        test_fixtures_by_ids_batching,
+        test_delta_sync_window,
+        test_retry_jitter_and_circuit_breaker,
+        test_single_flight,
+        test_backfill_plan,
+        test_raw_storage_dedup,
+        test_raw_fixtures_documents,
+        test_mongo_connection_manager,
+        test_async_repository_offload,
+        test_paginated_counts,
+        test_keyset_cursor_pagination,
+        test_api_response_cache,
+        test_fast_serialization,
+        test_materialized_stats,
+        test_fixtures_bulk_upsert,
+        test_league_upserts_and_compaction,
+        test_columnar_documents,
+        test_vectorized_fixtures_normalizer,
+        test_polars_engine,
+        test_streaming_raw_loader,
+        test_incremental_cleaner,
+    ]
+
+    results = []
+    for test in tests:
+        try:
+            test()
+            results.append(True)
+        except Exception as e:
+            print(f"❌ {test.__name__} FALLADO: {str(e)}\n")
+            results.append(False)
+
+    # Resumen
+    print("="*60)
+    print("RESUMEN DE TESTS")
+    print("="*60)
+    passed = sum(results)
+    total = len(results)
+
+    print(f"Tests Pasados: {passed}/{total}")
+
+    if passed == total:
+        print("✅ TODOS LOS TESTS PASARON")
+        print("="*60)
+        return True
+    else:
+        failed = total - passed
+        print(f"❌ {failed} tests fallaron")
+        print("="*60)
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)